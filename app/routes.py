@@ -3,6 +3,9 @@ from app.services.binance_service import BinanceService
 from app.services.rsi_calculator import RSICalculator
 from app.services.data_updater import DataUpdater
 from app.services.enhanced_screener_service import EnhancedScreenerService
+from app.services.lazy_logging import logging_stats
+from app.services.rate_limiter import binance_rate_limiter
+from config import Config
 import os
 
 main_bp = Blueprint('main', __name__)
@@ -54,6 +57,7 @@ def debug():
             <p><strong>FLASK_ENV:</strong> <span class="{'success' if os.environ.get('FLASK_ENV') == 'production' else 'warning'}">{os.environ.get('FLASK_ENV', 'NOT SET')}</span></p>
             <p><strong>SECRET_KEY:</strong> <span class="{'success' if os.environ.get('SECRET_KEY') else 'error'}">{'SET' if os.environ.get('SECRET_KEY') else 'NOT SET'}</span></p>
             <p><strong>RSI_PERIOD:</strong> {os.environ.get('RSI_PERIOD', '14 (default)')}</p>
+            <p><strong>RSI_SMOOTHING:</strong> {os.environ.get('RSI_SMOOTHING', 'ema (default)')}</p>
             <p><strong>TOP_COINS_LIMIT:</strong> {os.environ.get('TOP_COINS_LIMIT', '10 (default)')}</p>
         </div>
         
@@ -177,7 +181,7 @@ def test_rsi():
     """Test route to verify RSI calculations"""
     try:
         binance_service = BinanceService()
-        rsi_calculator = RSICalculator(period=14)
+        rsi_calculator = RSICalculator(period=Config.RSI_PERIOD, smoothing=Config.RSI_SMOOTHING)
         
         # Get top 5 coins by volume for testing
         top_coins = binance_service.get_top_coins_by_volume(limit=5)
@@ -228,12 +232,12 @@ def test_rsi():
         for coin in top_coins:
             symbol = coin['symbol']
             
-            # Fetch OHLCV data for RSI calculation
-            ohlcv_data = binance_service.get_ohlcv(symbol, '1h', limit=100)
+            # Stored OHLCV, topped up with the candles newer than the last sync
+            ohlcv_data = binance_service.sync_ohlcv(symbol, '1h', limit=100)
             
             if ohlcv_data:
                 # Calculate RSI
-                analysis = rsi_calculator.analyze_market_data(ohlcv_data)
+                analysis = rsi_calculator.analyze_market_data(ohlcv_data, symbol=symbol, timeframe='1h')
                 
                 # Style RSI values
                 rsi_class = ""
@@ -767,6 +771,11 @@ def enhanced_screener():
                         <li><strong>Mansfield RS:</strong> Mansfield Relative Strength ratio</li>
                         <li><strong>ROC:</strong> Rate of Change - Price momentum</li>
                         <li><strong>VWAP:</strong> Volume Weighted Average Price</li>
+                        <li><strong>Price vs VWAP:</strong> Distance from the session VWAP in percent</li>
+                        <li><strong>Bollinger %B / Bandwidth:</strong> Position within and width of the 20-bar bands</li>
+                        <li><strong>ATR / NATR:</strong> Average True Range, absolute and as a percent of price</li>
+                        <li><strong>MACD:</strong> 12/26 EMA spread, signal line and histogram in percent of price</li>
+                        <li><strong>Stochastic:</strong> %K and %D of the 14-bar range</li>
                     </ul>
                     
                     <div class="indicator-buttons">
@@ -775,6 +784,11 @@ def enhanced_screener():
                         <a href="/enhanced-screener?indicator=mansfield_rs" class="btn">📈 Mansfield RS</a>
                         <a href="/enhanced-screener?indicator=roc" class="btn">⚡ ROC Analysis</a>
                         <a href="/enhanced-screener?indicator=vwap" class="btn">📊 VWAP Analysis</a>
+                        <a href="/enhanced-screener?indicator=vwap_distance" class="btn">📏 Price vs VWAP</a>
+                        <a href="/enhanced-screener?indicator=bollinger_pct_b" class="btn">🎯 Bollinger %B</a>
+                        <a href="/enhanced-screener?indicator=natr" class="btn">🌊 NATR</a>
+                        <a href="/enhanced-screener?indicator=macd_histogram" class="btn">📶 MACD Histogram</a>
+                        <a href="/enhanced-screener?indicator=stoch_k" class="btn">🔄 Stochastic %K</a>
                     </div>
                 </div>
                 
@@ -858,6 +872,114 @@ def api_heatmap_data():
             'message': f'Error: {str(e)}'
         }
 
+@main_bp.route('/api/correlation')
+def api_correlation():
+    """API endpoint for rolling correlation/beta to BTC and ETH and the pairwise matrix"""
+    try:
+        from flask import request
+        
+        # Get query parameters (the service clamps them to its limits)
+        try:
+            limit = int(request.args.get('limit', 50))
+            window = int(request.args.get('window', 168))
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'limit and window must be integers'
+            }, 400
+        
+        screener_service = EnhancedScreenerService()
+        return screener_service.get_correlation_results(limit=limit, window=window)
+            
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }
+
+@main_bp.route('/api/divergences')
+def api_divergences():
+    """API endpoint for bullish/bearish RSI divergences of the top coins on closed candles"""
+    try:
+        from flask import request
+        
+        # Get query parameters (the service clamps them to its limits)
+        try:
+            limit = int(request.args.get('limit', 100))
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'limit must be an integer'
+            }, 400
+        
+        screener_service = EnhancedScreenerService()
+        return screener_service.get_divergence_results(limit=limit)
+            
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }
+
+@main_bp.route('/api/multi-timeframe-rsi')
+def api_multi_timeframe_rsi():
+    """API endpoint for RSI analysis of one symbol on several timeframes from synced candles"""
+    try:
+        from flask import request
+        
+        # Get query parameters
+        symbol = request.args.get('symbol', 'BTC/USDT')
+        timeframes = [tf.strip() for tf in request.args.get('timeframes', '5m,15m,1h,4h').split(',') if tf.strip()]
+        base_timeframe = request.args.get('base', '1m')
+        
+        data_updater = DataUpdater()
+        try:
+            analysis = data_updater.analyze_multi_timeframe(symbol, timeframes, base_timeframe=base_timeframe)
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': f'Invalid timeframes: {str(e)}'
+            }, 400
+        
+        return {
+            'success': bool(analysis),
+            'symbol': symbol,
+            'base_timeframe': base_timeframe,
+            'timeframes': analysis
+        }
+            
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }
+
+@main_bp.route('/api/logging-stats')
+def api_logging_stats():
+    """API endpoint for per-call-site logging counters and time spent, most expensive first"""
+    try:
+        from flask import request
+        
+        limit = int(request.args.get('limit', 50))
+        return {
+            'success': True,
+            'sites': logging_stats(limit)
+        }
+            
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }
+
+@main_bp.route('/api/rate-limit')
+def api_rate_limit():
+    """API endpoint for the shared Binance request-weight limiter"""
+    return {
+        'success': True,
+        'limiter': binance_rate_limiter.stats()
+    }
+
 def _render_coins_table(coins):
     """Helper method to render coins table"""
     if not coins:
@@ -0,0 +1,121 @@
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
+
+from app.services.exchange_registry import exchange_registry
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+
+logger = get_logger(__name__)
+
+# Binance returns at most 1000 klines per request
+MAX_OHLCV_PER_REQUEST = 1000
+
+
+class AsyncOHLCVFetcher:
+    """
+    Concurrent OHLCV downloads over ccxt's asyncio client
+
+    Requests run at most `concurrency` at a time and each one is abandoned
+    after `timeout` seconds, so one slow symbol cannot stall a screen.
+    Results are handed out in completion order. Request weight is drawn from
+    the process-wide limiter shared with the synchronous clients.
+
+    Downloads go through the registry's pooled asyncio client, so the
+    coroutines must run on the registry loop; fetch() takes care of that.
+    """
+
+    def __init__(self, concurrency: int = 10, timeout: float = 10.0, exchange_id: str = 'binance',
+                 market_type: str = 'spot'):
+        """
+        Initialize the fetcher
+
+        Args:
+            concurrency (int): Requests in flight at once
+            timeout (float): Seconds allowed per symbol, including any wait for request weight
+            exchange_id (str): Registry exchange
+            market_type (str): Registry market type
+        """
+        self.exchange_id = exchange_id
+        self.market_type = market_type
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+
+    async def _fetch_one(self, exchange, semaphore: asyncio.Semaphore, symbol: str, timeframe: str,
+                         limit: int, since: Optional[int]) -> Tuple[str, Optional[OHLCV]]:
+        async with semaphore:
+            try:
+                rows = await asyncio.wait_for(self._download(exchange, symbol, timeframe, limit, since),
+                                              self.timeout)
+                return symbol, OHLCV.from_ccxt(rows)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out fetching OHLCV for %s after %ss", symbol, self.timeout)
+            except Exception as e:
+                logger.error("Failed to get OHLCV for %s: %s", symbol, e)
+            return symbol, None
+
+    @staticmethod
+    async def _download(exchange, symbol: str, timeframe: str, limit: int, since: Optional[int]) -> list:
+        """Up to `limit` candles, paged forward when more than one request's maximum is asked for"""
+        if limit <= MAX_OHLCV_PER_REQUEST:
+            return await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+        
+        timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
+        start = since if since is not None else exchange.milliseconds() - limit * timeframe_ms
+        rows = []
+        while len(rows) < limit:
+            batch = await exchange.fetch_ohlcv(symbol, timeframe, since=start, limit=MAX_OHLCV_PER_REQUEST)
+            if not batch:
+                break
+            rows.extend(candle for candle in batch if not rows or candle[0] > rows[-1][0])
+            if len(batch) < MAX_OHLCV_PER_REQUEST:
+                break
+            start = batch[-1][0] + timeframe_ms
+        
+        # From `since` keep the oldest candles, otherwise the latest ones
+        return rows[:limit] if since is not None else rows[-limit:]
+
+    async def iter_ohlcv(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100,
+                         since: Optional[Dict[str, int]] = None) -> AsyncIterator[Tuple[str, Optional[OHLCV]]]:
+        """
+        Yield (symbol, candles) as each download finishes; candles are None on failure or timeout
+
+        Symbols with an entry in `since` get up to `limit` candles opening at or
+        after that time instead of the latest `limit`. Requests still pending
+        when the consumer stops iterating are cancelled.
+        """
+        exchange = exchange_registry.get_async(self.exchange_id, self.market_type)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        since = since or {}
+        tasks = [asyncio.ensure_future(self._fetch_one(exchange, semaphore, symbol, timeframe, limit, since.get(symbol)))
+                 for symbol in symbols]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_async(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100,
+                          on_result: Optional[Callable[[str, Optional[OHLCV]], None]] = None,
+                          since: Optional[Dict[str, int]] = None) -> Dict[str, OHLCV]:
+        """Download every symbol; on_result sees each result as it arrives"""
+        results = {}
+        async for symbol, ohlcv in self.iter_ohlcv(symbols, timeframe, limit, since):
+            if on_result is not None:
+                on_result(symbol, ohlcv)
+            if ohlcv:
+                results[symbol] = ohlcv
+        logger.info("Fetched %s OHLCV for %s of %s symbols", timeframe, len(results), len(symbols))
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+    def fetch(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100,
+              on_result: Optional[Callable[[str, Optional[OHLCV]], None]] = None,
+              since: Optional[Dict[str, int]] = None) -> Dict[str, OHLCV]:
+        """
+        Blocking wrapper around fetch_async for synchronous callers
+
+        Returns:
+            Dict[str, OHLCV]: Candles per symbol that succeeded, in the order of `symbols`
+        """
+        return exchange_registry.run(self.fetch_async(symbols, timeframe, limit, on_result, since))
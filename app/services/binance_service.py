@@ -1,43 +1,56 @@
-import ccxt
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional, Sequence
+
+from config import Config
+from app.services.async_ohlcv_fetcher import MAX_OHLCV_PER_REQUEST, AsyncOHLCVFetcher
+from app.services.exchange_registry import exchange_registry
+from app.services.lazy_logging import get_logger
+from app.services.market_cache import market_cache
+from app.services.ohlcv import OHLCV
+from app.services.ohlcv_resampler import OHLCVResampler
+from app.services.ohlcv_sync import ohlcv_sync
+from app.services.ticker_snapshot import usdt_tickers
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 class BinanceService:
     def __init__(self):
         """Initialize Binance exchange connection"""
         try:
-            self.exchange = ccxt.binance({
-                'enableRateLimit': True, 
-                'options': {'defaultType': 'spot'},
-                'timeout': 30000  # 30 second timeout
-            })
+            # Long-lived pooled client shared with every other service, with
+            # warm connections and markets hydrated from the shared snapshot
+            self.exchange = exchange_registry.get('binance', 'spot')
+            self.ohlcv_fetcher = AsyncOHLCVFetcher(concurrency=Config.OHLCV_FETCH_CONCURRENCY,
+                                                   timeout=Config.OHLCV_FETCH_TIMEOUT)
             logger.info("Binance service initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Binance service: {e}")
+            logger.error("Failed to initialize Binance service: %s", e)
             raise
 
+    @staticmethod
+    def _create_exchange():
+        """Standalone client for the market snapshot's background refresh"""
+        return exchange_registry.create('binance', 'spot')
+
     def test_connection(self) -> Dict:
         """Test connection to Binance API with detailed error reporting"""
         try:
-            # Test basic connectivity
-            markets = self.exchange.load_markets()
-            logger.info(f"Successfully loaded {len(markets)} markets")
+            # Test basic connectivity (markets come from the shared snapshot when available)
+            markets = market_cache.load(self.exchange, self._create_exchange)
+            logger.info("Successfully loaded %s markets", len(markets))
             
-            # Filter USDT pairs
-            usdt_pairs = [symbol for symbol in markets.keys() if symbol.endswith('/USDT')]
-            logger.info(f"Found {len(usdt_pairs)} USDT pairs")
+            # USDT pairs from the symbol index built over the same snapshot
+            usdt_pairs = usdt_tickers.symbol_index().symbols('USDT')
+            logger.info("Found %s USDT pairs", len(usdt_pairs))
             
             # Test ticker endpoint
             try:
                 btc_ticker = self.exchange.fetch_ticker('BTC/USDT')
-                logger.info(f"BTC ticker test successful: {btc_ticker['last']}")
+                logger.info("BTC ticker test successful: %s", btc_ticker['last'])
             except Exception as e:
-                logger.warning(f"BTC ticker test failed: {e}")
+                logger.warning("BTC ticker test failed: %s", e)
             
             return {
                 'success': True,
@@ -48,7 +61,7 @@ class BinanceService:
             }
             
         except Exception as e:
-            logger.error(f"Binance connection test failed: {e}")
+            logger.error("Binance connection test failed: %s", e)
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
@@ -61,10 +74,10 @@ class BinanceService:
     def get_markets(self) -> Dict:
         """Get all available markets"""
         try:
-            markets = self.exchange.load_markets()
+            markets = market_cache.load(self.exchange, self._create_exchange)
             return {'success': True, 'markets': markets}
         except Exception as e:
-            logger.error(f"Failed to get markets: {e}")
+            logger.error("Failed to get markets: %s", e)
             return {'success': False, 'error': str(e)}
 
     def get_ticker(self, symbol: str) -> Optional[Dict]:
@@ -72,43 +85,127 @@ class BinanceService:
         try:
             return self.exchange.fetch_ticker(symbol)
         except Exception as e:
-            logger.error(f"Failed to get ticker for {symbol}: {e}")
+            logger.error("Failed to get ticker for %s: %s", symbol, e)
             return None
 
-    def get_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[List[List]]:
-        """Get OHLCV data for RSI calculation"""
+    def get_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[OHLCV]:
+        """Get OHLCV data for RSI calculation as a columnar series"""
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            logger.info(f"Successfully fetched {len(ohlcv)} OHLCV data points for {symbol}")
+            ohlcv = OHLCV.from_ccxt(self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit))
+            logger.info("Successfully fetched %s OHLCV data points for %s", len(ohlcv), symbol)
             return ohlcv
         except Exception as e:
-            logger.error(f"Failed to get OHLCV for {symbol}: {e}")
+            logger.error("Failed to get OHLCV for %s: %s", symbol, e)
             return None
 
-    def get_top_coins_by_volume(self, limit: int = 50) -> List[Dict]:
-        """Get top coins by 24h volume"""
+    def get_ohlcv_batch(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100,
+                        on_result: Optional[Callable[[str, Optional[OHLCV]], None]] = None) -> Dict[str, OHLCV]:
+        """
+        Get OHLCV for many symbols concurrently
+        
+        Downloads overlap (up to OHLCV_FETCH_CONCURRENCY at once) and each symbol
+        gives up after OHLCV_FETCH_TIMEOUT seconds, so the batch takes about as
+        long as its slowest requests. on_result(symbol, candles) is called as each
+        download finishes, with None for failures.
+        
+        Returns:
+            Dict[str, OHLCV]: Candles of the symbols that succeeded, in request order
+        """
         try:
-            tickers = self.exchange.fetch_tickers()
-            logger.info(f"Successfully fetched {len(tickers)} tickers")
-            
-            # Filter USDT pairs and sort by volume
-            usdt_tickers = []
-            for symbol, ticker in tickers.items():
-                if symbol.endswith('/USDT') and ticker.get('quoteVolume'):
-                    usdt_tickers.append({
-                        'symbol': symbol,
-                        'volume': ticker['quoteVolume'],
-                        'price': ticker['last'],
-                        'change': ticker.get('percentage', 0)
-                    })
+            return self.ohlcv_fetcher.fetch(symbols, timeframe, limit, on_result)
+        except Exception as e:
+            logger.error("Failed to get OHLCV batch: %s", e)
+            return {}
+
+    def sync_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[OHLCV]:
+        """
+        Get the latest `limit` candles from local storage after downloading only the newer ones
+        
+        See OHLCVSync: in steady state each call fetches one or two candles.
+        """
+        return ohlcv_sync.sync(self, symbol, timeframe, limit)
+    
+    def sync_ohlcv_batch(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100) -> Dict[str, OHLCV]:
+        """sync_ohlcv for many symbols, with the downloads running concurrently"""
+        try:
+            return ohlcv_sync.sync_many(self, symbols, timeframe, limit)
+        except Exception as e:
+            logger.error("Failed to sync OHLCV batch: %s", e)
+            return {}
+
+    def get_ohlcv_history(self, symbol: str, timeframe: str = '1m', limit: int = 1000,
+                          since: Optional[int] = None) -> Optional[OHLCV]:
+        """Get the last `limit` OHLCV candles, or the first `limit` from `since`, paging past the per-request maximum"""
+        if limit <= MAX_OHLCV_PER_REQUEST and since is None:
+            return self.get_ohlcv(symbol, timeframe, limit=limit)
+        
+        try:
+            timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            start = since if since is not None else self.exchange.milliseconds() - limit * timeframe_ms
+            rows = []
             
-            # Sort by volume and return top coins
-            usdt_tickers.sort(key=lambda x: x['volume'], reverse=True)
-            top_coins = usdt_tickers[:limit]
+            while len(rows) < limit:
+                batch = self.exchange.fetch_ohlcv(symbol, timeframe, since=start,
+                                                  limit=min(limit, MAX_OHLCV_PER_REQUEST))
+                if not batch:
+                    break
+                rows.extend(candle for candle in batch if not rows or candle[0] > rows[-1][0])
+                if len(batch) < MAX_OHLCV_PER_REQUEST:
+                    break
+                start = batch[-1][0] + timeframe_ms
             
-            logger.info(f"Successfully processed {len(top_coins)} top coins by volume")
+            # From `since` keep the oldest candles, otherwise the latest ones
+            rows = rows[:limit] if since is not None else rows[-limit:]
+            ohlcv = OHLCV.from_ccxt(rows)
+            logger.info("Successfully fetched %s %s OHLCV data points for %s", len(ohlcv), timeframe, symbol)
+            return ohlcv
+        except Exception as e:
+            logger.error("Failed to get OHLCV history for %s: %s", symbol, e)
+            return None
+    
+    def get_ohlcv_multi_timeframe(self, symbol: str, timeframes: List[str], limit: int = 100,
+                                  base_timeframe: str = '1m', max_base_candles: int = 5000) -> Dict[str, OHLCV]:
+        """
+        Get the last `limit` OHLCV candles on several timeframes from stored base candles
+        
+        Timeframes reachable within max_base_candles base candles are resampled
+        locally on exchange (UTC) boundaries from one base series, so adding one
+        costs no extra REST calls; coarser ones are fetched natively. Both go
+        through the shared OHLCV sync, so repeat calls only download the candles
+        opened since the previous one.
+        
+        Raises:
+            ValueError: A timeframe is unknown or not a multiple of base_timeframe
+        """
+        resampler = OHLCVResampler(base_timeframe)
+        resampler.validate(timeframes)
+        
+        resampled = [timeframe for timeframe in timeframes
+                     if resampler.base_candles_needed([timeframe], limit) <= max_base_candles]
+        native = [timeframe for timeframe in timeframes if timeframe not in resampled]
+        if native:
+            logger.info("Fetching %s natively for %s; resampling them needs more than %s %s candles",
+                        native, symbol, max_base_candles, base_timeframe)
+        
+        candles = {}
+        if resampled:
+            base = ohlcv_sync.sync(self, symbol, base_timeframe, limit=resampler.base_candles_needed(resampled, limit))
+            if base:
+                candles.update(resampler.resample_many(base, resampled))
+        for timeframe in native:
+            ohlcv = ohlcv_sync.sync(self, symbol, timeframe, limit=limit)
+            if ohlcv:
+                candles[timeframe] = ohlcv
+        
+        return {timeframe: candles[timeframe].tail(limit) for timeframe in timeframes if timeframe in candles}
+    
+    def get_top_coins_by_volume(self, limit: int = 50) -> List[Dict]:
+        """Get top USDT coins by 24h volume from the shared ticker snapshot"""
+        try:
+            top_coins = usdt_tickers.top(limit)
+            logger.info("Successfully processed %s top coins by volume", len(top_coins))
             return top_coins
             
         except Exception as e:
-            logger.error(f"Failed to get top coins by volume: {e}")
+            logger.error("Failed to get top coins by volume: %s", e)
             return []
@@ -1,28 +1,34 @@
-import logging
 from typing import List, Dict, Optional
 from app.services.binance_service import BinanceService
+from app.services.lazy_logging import get_logger
 from app.services.rsi_calculator import RSICalculator
+from app.services.parallel_indicators import ParallelIndicatorEngine
+from config import Config
 from datetime import datetime, timedelta
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 class DataUpdater:
-    def __init__(self, rsi_period: int = 14, top_coins_limit: int = 10):
+    def __init__(self, rsi_period: int = Config.RSI_PERIOD, top_coins_limit: int = 10):
         """
         Initialize Data Updater for RSI screening
         
         Args:
-            rsi_period (int): RSI calculation period (default: 14)
+            rsi_period (int): RSI calculation period (default: Config.RSI_PERIOD)
             top_coins_limit (int): Number of top coins to return (default: 10)
         """
         self.rsi_period = rsi_period
         self.top_coins_limit = top_coins_limit
         self.binance_service = BinanceService()
-        self.rsi_calculator = RSICalculator(period=rsi_period)
+        self.rsi_calculator = RSICalculator(period=rsi_period, smoothing=Config.RSI_SMOOTHING)
+        self.indicator_engine = ParallelIndicatorEngine(workers=Config.INDICATOR_WORKERS,
+                                                        min_symbols=Config.INDICATOR_PARALLEL_MIN_SYMBOLS,
+                                                        rsi_calculator=self.rsi_calculator,
+                                                        timeout=Config.INDICATOR_POOL_TIMEOUT)
         self.last_update = None
         self.cached_results = []
         
-        logger.info(f"Data Updater initialized with RSI period {rsi_period} and top {top_coins_limit} coins")
+        logger.info("Data Updater initialized with RSI period %s and top %s coins", rsi_period, top_coins_limit)
     
     def get_top_performing_coins(self, force_refresh: bool = False) -> List[Dict]:
         """
@@ -51,42 +57,38 @@ class DataUpdater:
                 logger.warning("No coins found for screening")
                 return []
             
-            # Analyze each coin and calculate RSI
+            # Bring stored OHLCV up to date for every coin concurrently, then analyze them in one batch
+            candles = self.binance_service.sync_ohlcv_batch([coin['symbol'] for coin in volume_coins], '1h', limit=100)
+            fetched_coins = [coin for coin in volume_coins if coin['symbol'] in candles]
+            ohlcv_batch = [candles[coin['symbol']] for coin in fetched_coins]
+            
+            batch = self.indicator_engine.analyze_market_data_batch(ohlcv_batch)
+            
             analyzed_coins = []
             
-            for coin in volume_coins:
+            for index, coin in enumerate(fetched_coins):
                 symbol = coin['symbol']
+                analysis = self.rsi_calculator.batch_row_to_analysis(batch, index)
                 
-                # Fetch OHLCV data for RSI calculation
-                ohlcv_data = self.binance_service.get_ohlcv(symbol, '1h', limit=100)
-                
-                if ohlcv_data:
-                    # Calculate RSI and analyze market data
-                    analysis = self.rsi_calculator.analyze_market_data(ohlcv_data)
+                if analysis['rsi'] is not None:
+                    # Create comprehensive coin data
+                    coin_data = {
+                        'symbol': symbol,
+                        'base': symbol.split('/')[0],
+                        'price': analysis['last_price'] or coin['price'],
+                        'rsi': analysis['rsi'],
+                        'signal': analysis['signal'],
+                        'price_change_24h': coin.get('change') or 0,
+                        'volume_24h': coin['volume'],
+                        'price_change_period': analysis['price_change'],
+                        'data_points': analysis['data_points'],
+                        'binance_link': f"https://www.binance.com/en/trade/{symbol.replace('/', '_')}",
+                        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    }
                     
-                    if analysis['rsi'] is not None:
-                        # Create comprehensive coin data
-                        coin_data = {
-                            'symbol': symbol,
-                            'base': coin['base'],
-                            'price': analysis['last_price'] or coin['price'],
-                            'rsi': analysis['rsi'],
-                            'signal': analysis['signal'],
-                            'price_change_24h': coin['change_24h'],
-                            'volume_24h': coin['volume_24h'],
-                            'price_change_period': analysis['price_change'],
-                            'data_points': analysis['data_points'],
-                            'binance_link': f"https://www.binance.com/en/trade/{symbol.replace('/', '_')}",
-                            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        
-                        analyzed_coins.append(coin_data)
-                        
-                        logger.debug(f"Analyzed {symbol}: RSI={analysis['rsi']:.2f}, Signal={analysis['signal']}")
-                
-                # Add small delay to respect rate limits
-                import time
-                time.sleep(0.1)
+                    analyzed_coins.append(coin_data)
+                    
+                    logger.debug("Analyzed %s: RSI=%.2f, Signal=%s", symbol, analysis['rsi'], analysis['signal'])
             
             # Rank coins by RSI performance (higher RSI = better performance)
             # We want coins that are showing strength (RSI > 50) but not overbought (RSI < 70)
@@ -99,14 +101,37 @@ class DataUpdater:
             self.cached_results = top_coins
             self.last_update = datetime.now()
             
-            logger.info(f"Successfully analyzed {len(analyzed_coins)} coins, returning top {len(top_coins)}")
+            logger.info("Successfully analyzed %s coins, returning top %s", len(analyzed_coins), len(top_coins))
             return top_coins
             
         except Exception as e:
-            logger.error(f"Error in get_top_performing_coins: {e}")
+            logger.error("Error in get_top_performing_coins: %s", e)
             # Return cached results if available, otherwise empty list
             return self.cached_results if self.cached_results else []
     
+    def analyze_multi_timeframe(self, symbol: str, timeframes: List[str] = ('5m', '15m', '1h', '4h'),
+                                base_timeframe: str = '1m') -> Dict[str, Dict]:
+        """
+        RSI analysis of one symbol on several timeframes from synced OHLCV
+        
+        Args:
+            symbol (str): Trading pair, e.g. 'BTC/USDT'
+            timeframes (List[str]): Timeframes to analyze
+            base_timeframe (str): Timeframe synced from the exchange and resampled into the finer timeframes
+            
+        Returns:
+            Dict[str, Dict]: analyze_market_data results keyed by timeframe
+        """
+        candles = self.binance_service.get_ohlcv_multi_timeframe(
+            symbol, list(timeframes), limit=100, base_timeframe=base_timeframe
+        )
+        
+        if not candles:
+            logger.warning("No OHLCV data for multi-timeframe analysis of %s", symbol)
+            return {}
+        
+        return {timeframe: self.rsi_calculator.analyze_market_data(ohlcv) for timeframe, ohlcv in candles.items()}
+    
     def _rank_coins_by_performance(self, coins: List[Dict]) -> List[Dict]:
         """
         Rank coins by RSI performance using a scoring system
@@ -0,0 +1,165 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import Config
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+from app.services.rsi_calculator import RSICalculator
+
+logger = get_logger(__name__)
+
+
+class DivergenceScanner:
+    """Vectorized RSI/price divergence screener over a symbols x bars matrix"""
+
+    def __init__(self, rsi_calculator: Optional[RSICalculator] = None, pivot_window: int = 5,
+                 lookback: int = 60, min_pivot_distance: int = 5):
+        """
+        Initialize the divergence scanner
+
+        Args:
+            rsi_calculator (RSICalculator): Calculator used for the RSI series
+                (default: Config.RSI_PERIOD with Config.RSI_SMOOTHING)
+            pivot_window (int): Bars on each side a pivot must be the extreme of; a pivot
+                is confirmed pivot_window bars after it forms
+            lookback (int): Both compared pivots must lie within this many bars of the end
+            min_pivot_distance (int): Minimum bars between the two compared pivots
+        """
+        self.rsi_calculator = rsi_calculator or RSICalculator(period=Config.RSI_PERIOD, smoothing=Config.RSI_SMOOTHING)
+        self.pivot_window = pivot_window
+        self.lookback = lookback
+        self.min_pivot_distance = min_pivot_distance
+        logger.info("Divergence scanner initialized (pivot window %s, lookback %s)", pivot_window, lookback)
+
+    def find_pivots(self, values: np.ndarray, lows: bool = True) -> np.ndarray:
+        """
+        Mark pivot lows (or highs) with a rolling argmin (argmax) over centered windows
+
+        Args:
+            values (np.ndarray): (n_symbols, n_bars) series, NaN where missing
+            lows (bool): Find pivot lows if True, pivot highs otherwise
+
+        Returns:
+            np.ndarray: Boolean (n_symbols, n_bars) pivot mask
+        """
+        values = np.asarray(values, dtype=np.float64)
+        w = self.pivot_window
+        pivots = np.zeros(values.shape, dtype=bool)
+
+        if values.shape[-1] < 2 * w + 1:
+            return pivots
+
+        # Missing bars can never be the extreme of a window
+        filled = np.where(np.isnan(values), np.inf if lows else -np.inf, values)
+        windows = sliding_window_view(filled, 2 * w + 1, axis=-1)
+        extreme = windows.argmin(axis=-1) if lows else windows.argmax(axis=-1)
+
+        centers = values[:, w:values.shape[-1] - w]
+        pivots[:, w:values.shape[-1] - w] = (extreme == w) & ~np.isnan(centers)
+        return pivots
+
+    def _last_two(self, pivots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Indexes of the last and previous pivot per row (-1 when missing)"""
+        index = np.where(pivots, np.arange(pivots.shape[-1]), -1)
+        last = index.max(axis=-1)
+        previous = np.where(index == last[:, None], -1, index).max(axis=-1)
+        return last, previous
+
+    def _compare(self, pivots: np.ndarray, price: np.ndarray, rsi: np.ndarray, bullish: bool) -> Dict[str, np.ndarray]:
+        """Compare price and RSI at the last two pivots of every row"""
+        n_bars = price.shape[-1]
+        last, previous = self._last_two(pivots)
+
+        valid = ((previous >= 0)
+                 & (previous >= n_bars - self.lookback)
+                 & (last - previous >= self.min_pivot_distance))
+
+        def _at(matrix, index):
+            return np.take_along_axis(matrix, np.maximum(index, 0)[:, None], axis=-1)[:, 0]
+
+        price_last, price_previous = _at(price, last), _at(price, previous)
+        rsi_last, rsi_previous = _at(rsi, last), _at(rsi, previous)
+
+        with np.errstate(invalid='ignore'):
+            if bullish:
+                # Price lower low while RSI makes a higher low
+                found = (price_last < price_previous) & (rsi_last > rsi_previous)
+            else:
+                # Price higher high while RSI makes a lower high
+                found = (price_last > price_previous) & (rsi_last < rsi_previous)
+
+        found &= valid & ~np.isnan(rsi_last) & ~np.isnan(rsi_previous)
+
+        return {
+            'found': found,
+            'pivots': np.stack([previous, last], axis=-1),
+            'price': np.stack([price_previous, price_last], axis=-1),
+            'rsi': np.stack([rsi_previous, rsi_last], axis=-1)
+        }
+
+    def scan_matrix(self, lows: np.ndarray, highs: np.ndarray, rsi: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Detect divergences for every row of the matrices in one pass
+
+        Args:
+            lows (np.ndarray): (n_symbols, n_bars) candle lows, used for bullish divergences
+            highs (np.ndarray): (n_symbols, n_bars) candle highs, used for bearish divergences
+            rsi (np.ndarray): (n_symbols, n_bars) RSI series aligned with the candles
+
+        Returns:
+            Dict[str, Dict[str, np.ndarray]]: 'bullish' and 'bearish' results, each with a
+                boolean 'found' vector and the compared 'pivots', 'price' and 'rsi' (n_symbols, 2)
+        """
+        # Only the lookback (plus the window before it) can hold the compared pivots
+        tail = self.lookback + self.pivot_window
+        offset = max(np.shape(rsi)[-1] - tail, 0)
+        lows, highs, rsi = (np.asarray(m, dtype=np.float64)[:, offset:] for m in (lows, highs, rsi))
+
+        results = {
+            'bullish': self._compare(self.find_pivots(lows, lows=True), lows, rsi, bullish=True),
+            'bearish': self._compare(self.find_pivots(highs, lows=False), highs, rsi, bullish=False)
+        }
+
+        for result in results.values():
+            result['pivots'] = np.where(result['pivots'] >= 0, result['pivots'] + offset, -1)
+        return results
+
+    def scan(self, symbols: Sequence[str], ohlcv_batch: Sequence[OHLCV]) -> List[Dict]:
+        """
+        Scan a universe and list the symbols with a bullish or bearish divergence
+
+        Args:
+            symbols (Sequence[str]): Symbol per series
+            ohlcv_batch (Sequence[OHLCV]): Candle history per symbol
+
+        Returns:
+            List[Dict]: One entry per divergence found
+        """
+        try:
+            closes = OHLCV.stack(ohlcv_batch, 'close')
+            rsi = self.rsi_calculator.calculate_rsi_series_batch(closes)
+            n_bars = closes.shape[-1]
+            results = self.scan_matrix(OHLCV.stack(ohlcv_batch, 'low', n_bars),
+                                       OHLCV.stack(ohlcv_batch, 'high', n_bars), rsi)
+
+            divergences = []
+            for kind, result in results.items():
+                for row in np.flatnonzero(result['found']):
+                    ohlcv = ohlcv_batch[row]
+                    # Matrix columns are right-aligned to each series
+                    shift = n_bars - len(ohlcv)
+                    divergences.append({
+                        'symbol': symbols[row],
+                        'type': kind,
+                        'pivot_times': [int(ohlcv.timestamp[i - shift]) for i in result['pivots'][row]],
+                        'prices': [float(p) for p in result['price'][row]],
+                        'rsi': [round(float(r), 2) for r in result['rsi'][row]]
+                    })
+
+            logger.info("Divergence scan found %s divergences in %s symbols", len(divergences), len(symbols))
+            return divergences
+
+        except Exception as e:
+            logger.error("Error scanning for divergences: %s", e)
+            return []
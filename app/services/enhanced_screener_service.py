@@ -1,15 +1,69 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-import logging
 from datetime import datetime, timedelta
 import json
 
-from app.services.technical_indicators import TechnicalIndicators
+from app.services.binance_service import BinanceService
+from app.services.divergence_scanner import DivergenceScanner
+from app.services.indicator_cache import correlation_cache, indicator_cache, last_closed_open_time
+from app.services.indicator_engine import ROC_LOOKBACKS
+from app.services.lazy_logging import get_logger
+from app.services.technical_indicators import OSCILLATOR_INDICATORS, TechnicalIndicators
 from app.services.historical_data_service import HistoricalDataService
+from app.services.ohlcv import OHLCV
+from app.services.ohlcv_resampler import OHLCVResampler
+from app.services.streaming_rsi import streaming_rsi
+from app.services.ticker_snapshot import usdt_tickers
 from app.services.websocket_service import BinanceWebSocketService
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# Kline indicator values are memoized until the next candle of this timeframe closes
+INDICATOR_TIMEFRAME = '1h'
+
+# Stored candles loaded per coin for kline-based indicators; covers the 30d
+# ROC lookback, which also spans the session VWAP and the Mansfield RS average
+KLINE_HISTORY_BARS = 30 * 24 + 1
+
+# Bars in the moving average of the coin/BTC ratio
+MANSFIELD_PERIOD = 52
+
+BTC_SYMBOL = 'BTCUSDT'
+
+# Screener indicators computed from candles -> indicator engine node behind them
+KLINE_INDICATORS = {
+    'vwap': 'vwap_session',
+    'vwap_distance': 'vwap_session',
+    'mansfield_rs': 'mansfield_rs',
+    'roc': 'roc_24h',
+    **{f'roc_{lookback}': f'roc_{lookback}' for lookback in ROC_LOOKBACKS},
+    **{name: name for name in OSCILLATOR_INDICATORS}
+}
+
+# Returns per rolling correlation window (one week of 1h candles) and the
+# benchmarks every coin is compared against
+CORRELATION_WINDOW = 168
+CORRELATION_BENCHMARKS = ('BTCUSDT', 'ETHUSDT')
+
+# Newest stored candles loaded per symbol to extend a cached correlation state
+CORRELATION_UPDATE_BARS = 3
+
+# Largest coin set and window a correlation request may ask for; states stay in the shared cache
+CORRELATION_MAX_SYMBOLS = 500
+CORRELATION_MAX_WINDOW = KLINE_HISTORY_BARS
+
+# Largest coin set a divergence scan may ask for
+DIVERGENCE_MAX_SYMBOLS = 500
+
+# Engine node -> coin dict key read by TechnicalIndicators.calculate_all_indicators
+# and build_indicator_matrix
+KLINE_COIN_KEYS = {
+    'vwap_session': 'vwap',
+    'mansfield_rs': 'mansfield_rs',
+    **{f'roc_{lookback}': f'roc_{lookback}' for lookback in ROC_LOOKBACKS},
+    **{name: name for name in OSCILLATOR_INDICATORS}
+}
 
 class EnhancedScreenerService:
     """Enhanced screener service with multiple indicators and historical analysis"""
@@ -17,10 +71,12 @@ class EnhancedScreenerService:
     def __init__(self):
         self.technical_indicators = TechnicalIndicators()
         self.historical_data = HistoricalDataService()
+        self.binance_service = BinanceService()
         self.websocket_service = BinanceWebSocketService()
+        self.divergence_scanner = DivergenceScanner()
         self.available_indicators = [
-            'rsi', 'returns_vs_btc', 'mansfield_rs', 'roc', 'vwap'
-        ]
+            'rsi', 'returns_vs_btc', 'mansfield_rs', 'roc', 'vwap', 'vwap_distance'
+        ] + [f'roc_{lookback}' for lookback in ROC_LOOKBACKS] + list(OSCILLATOR_INDICATORS)
         
         # Initialize with some mock data for testing
         self._initialize_mock_data()
@@ -44,10 +100,10 @@ class EnhancedScreenerService:
                 {'symbol': 'AVAXUSDT', 'name': 'Avalanche'}
             ]
             
-            logger.info(f"Adding {len(mock_coins)} mock coins to database")
+            logger.info("Adding %s mock coins to database", len(mock_coins))
             
             for coin in mock_coins:
-                logger.debug(f"Adding coin: {coin['symbol']}")
+                logger.debug("Adding coin: %s", coin['symbol'])
                 self.historical_data.add_coin(coin['symbol'], coin['name'])
                 
                 # Add some mock price data
@@ -58,13 +114,13 @@ class EnhancedScreenerService:
                     'rsi': 30 + (hash(coin['symbol']) % 40)  # Random RSI 30-70
                 }
                 
-                logger.debug(f"Adding mock price data for {coin['symbol']}: {mock_price_data}")
+                logger.debug("Adding mock price data for %s: %s", coin['symbol'], mock_price_data)
                 self.historical_data.update_price_data(coin['symbol'], mock_price_data)
                 
             logger.info("Mock data initialized successfully")
             
         except Exception as e:
-            logger.error(f"Error initializing mock data: {e}")
+            logger.error("Error initializing mock data: %s", e)
     
     def get_screening_results(self, 
                             selected_indicator: str = 'rsi',
@@ -72,47 +128,23 @@ class EnhancedScreenerService:
                             limit: int = 100) -> Dict:
         """Get comprehensive screening results"""
         try:
-            logger.info(f"Starting screening for indicator: {selected_indicator}")
-            
-            # Get top coins by volume
-            top_coins = self._get_top_coins_by_volume(limit)
-            logger.info(f"Retrieved {len(top_coins)} top coins by volume")
-            
-            if not top_coins:
-                logger.warning("No coins data available")
-                return {
-                    'success': False,
-                    'message': 'No coins data available',
-                    'data': []
-                }
-            
-            # Get BTC data for relative calculations
-            btc_data = self._get_btc_data()
-            logger.info(f"BTC data: {btc_data}")
-            
-            # Calculate indicators for all coins
-            coins_with_indicators = self._calculate_indicators_for_coins(top_coins, btc_data)
-            logger.info(f"Calculated indicators for {len(coins_with_indicators)} coins")
+            logger.info("Starting screening for indicator: %s", selected_indicator)
             
-            if not coins_with_indicators:
-                logger.warning("No coins with indicators available")
+            # Current tickers plus the per-candle kline values, every indicator ranked in one pass
+            snapshot = self._build_screening_snapshot(limit)
+            if 'matrix' not in snapshot:
+                logger.warning(snapshot['message'])
                 return {
                     'success': False,
-                    'message': 'No coins with indicators available',
+                    'message': snapshot['message'],
                     'data': []
                 }
             
-            # Rank coins by selected indicator
-            ranked_coins = self.technical_indicators.rank_coins_by_indicator(
-                coins_with_indicators, selected_indicator, btc_data
-            )
-            logger.info(f"Ranked {len(ranked_coins)} coins by {selected_indicator}")
-            
-            # Get top percentile coins
-            top_percentile_coins = self.technical_indicators.get_top_percentile_coins(
-                ranked_coins, percentile
+            # Rank coins by selected indicator and keep the top percentile
+            top_percentile_coins, total_ranked = self.technical_indicators.select_top_percentile(
+                snapshot['matrix'], snapshot['coins'], selected_indicator, percentile
             )
-            logger.info(f"Selected {len(top_percentile_coins)} top percentile coins")
+            logger.info("Selected %s top percentile coins of %s ranked", len(top_percentile_coins), total_ranked)
             
             # Prepare results
             results = {
@@ -120,35 +152,199 @@ class EnhancedScreenerService:
                 'selected_indicator': selected_indicator,
                 'indicator_description': self.technical_indicators.get_indicator_description(selected_indicator),
                 'percentile': percentile,
-                'total_coins_analyzed': len(ranked_coins),
+                'total_coins_analyzed': total_ranked,
                 'top_percentile_count': len(top_percentile_coins),
                 'timestamp': datetime.now().isoformat(),
                 'coins': top_percentile_coins,
                 'available_indicators': self.available_indicators
             }
             
-            logger.info(f"Screening completed successfully: {results}")
+            logger.debug("Screening completed successfully: %s", results)
             return results
             
         except Exception as e:
-            logger.error(f"Error getting screening results: {e}")
+            logger.error("Error getting screening results: %s", e)
             return {
                 'success': False,
                 'message': f'Error: {str(e)}',
                 'data': []
             }
     
+    def _build_screening_snapshot(self, limit: int) -> Dict:
+        """Fetch the top coins, evaluate every indicator and build the indicator matrix
+        
+        Runs on every request so prices, 24h volume and change (and the ranking)
+        follow the ticker snapshot; only the kline values behind it are cached
+        per closed candle (see _get_kline_values).
+        """
+        # Get top coins by volume
+        top_coins = self._get_top_coins_by_volume(limit)
+        logger.info("Retrieved %s top coins by volume", len(top_coins))
+        
+        if not top_coins:
+            return {'message': 'No coins data available'}
+        
+        # Get BTC data for relative calculations
+        btc_data = self._get_btc_data()
+        logger.debug("BTC data: %s", btc_data)
+        
+        # Current ticker data per coin, then every indicator as whole columns
+        coins_data = self._get_coins_data(top_coins)
+        if not coins_data:
+            return {'message': 'No coins with indicators available'}
+        
+        kline_values = self._get_kline_columns(coins_data)
+        self._attach_provisional_rsi(coins_data)
+        
+        matrix = self.technical_indicators.build_indicator_matrix(
+            coins_data, btc_data, selected=self.available_indicators, kline_values=kline_values
+        )
+        logger.info("Calculated indicators for %s coins", len(coins_data))
+        return {'coins': coins_data, 'matrix': matrix}
+    
+    def get_correlation_results(self, limit: int = 50, window: int = CORRELATION_WINDOW) -> Dict:
+        """Rolling correlation and beta to BTC/ETH per coin, and the pairwise matrix of the top coins
+        
+        The correlation state is kept in the process-wide correlation cache per
+        coin set (in any order); later calls only append the candles stored
+        since, instead of recomputing the window. limit and window are clamped to
+        CORRELATION_MAX_SYMBOLS and CORRELATION_MAX_WINDOW.
+        """
+        try:
+            limit = min(max(limit, 1), CORRELATION_MAX_SYMBOLS)
+            window = min(max(window, 2), CORRELATION_MAX_WINDOW)
+            
+            top_coins = self._get_top_coins_by_volume(limit)
+            if not top_coins:
+                return {'success': False, 'message': 'No coins data available', 'data': []}
+            
+            symbols = list(dict.fromkeys(list(top_coins) + list(CORRELATION_BENCHMARKS)))
+            # Seed and updates read storage, so bring it up to date first
+            self._sync_candles(symbols, window + 1)
+            state = self._get_correlation_state(symbols, window)
+            
+            benchmarks = state.benchmark_stats(CORRELATION_BENCHMARKS)
+            coins = []
+            for symbol in top_coins:
+                i = state.index[symbol]
+                coin = {'symbol': symbol}
+                for benchmark, stats in benchmarks.items():
+                    name = benchmark.replace('USDT', '').lower()
+                    coin[f'correlation_{name}'] = self._finite_or_none(stats['correlation'][i])
+                    coin[f'beta_{name}'] = self._finite_or_none(stats['beta'][i])
+                coins.append(coin)
+            
+            matrix = state.submatrix(top_coins)
+            logger.info("Correlation results for %s coins over %s returns", len(top_coins), state.filled)
+            return {
+                'success': True,
+                'timeframe': INDICATOR_TIMEFRAME,
+                'window': window,
+                'observations': state.filled,
+                'symbols': list(top_coins),
+                'coins': coins,
+                'correlation_matrix': [[self._finite_or_none(v) for v in row] for row in matrix],
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error("Error getting correlation results: %s", e)
+            return {'success': False, 'message': f'Error: {str(e)}', 'data': []}
+    
+    def get_divergence_results(self, limit: int = 100) -> Dict:
+        """Bullish and bearish RSI/price divergences of the top coins on closed candles
+        
+        The scan runs once per candle close and coin set, on the stored candles
+        synced for the kline indicators; later calls in the same candle read the
+        process-wide indicator cache. limit is clamped to DIVERGENCE_MAX_SYMBOLS.
+        """
+        try:
+            limit = min(max(limit, 1), DIVERGENCE_MAX_SYMBOLS)
+            
+            top_coins = self._get_top_coins_by_volume(limit)
+            if not top_coins:
+                return {'success': False, 'message': 'No coins data available', 'data': []}
+            
+            universe = sorted(set(top_coins))
+            last_closed = last_closed_open_time(INDICATOR_TIMEFRAME)
+            key = ('divergences', tuple(universe), INDICATOR_TIMEFRAME, last_closed)
+            scan = indicator_cache.get_or_compute(
+                key, lambda: self._scan_divergences(universe, last_closed),
+                should_cache=lambda scan: scan['symbols_scanned'] > 0
+            )
+            
+            # Most traded coins first
+            rank = {symbol: i for i, symbol in enumerate(top_coins)}
+            divergences = sorted(scan['divergences'], key=lambda d: rank[d['symbol']])
+            logger.info("Found %s divergences in %s coins", len(divergences), scan['symbols_scanned'])
+            return {
+                'success': True,
+                'timeframe': INDICATOR_TIMEFRAME,
+                'symbols_scanned': scan['symbols_scanned'],
+                'candle_open_time': last_closed,
+                'divergences': divergences,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error("Error getting divergence results: %s", e)
+            return {'success': False, 'message': f'Error: {str(e)}', 'data': []}
+    
+    def _scan_divergences(self, symbols: List[str], last_closed: int) -> Dict:
+        """Sync symbols' candles and scan the ones closed by last_closed"""
+        synced = self._sync_candles(symbols)
+        closed = {symbol: ohlcv[:int(np.searchsorted(ohlcv.timestamp, last_closed, side='right'))]
+                  for symbol, ohlcv in synced.items()}
+        scanned = [symbol for symbol in symbols if symbol in closed and len(closed[symbol])]
+        
+        return {
+            'symbols_scanned': len(scanned),
+            'divergences': self.divergence_scanner.scan(scanned, [closed[s] for s in scanned]) if scanned else []
+        }
+    
+    def _get_correlation_state(self, symbols: List[str], window: int):
+        """Cached correlation state for symbols, extended with newly stored candles or reseeded
+        
+        The state is keyed on the sorted symbol set, so a reshuffled volume
+        ranking keeps streaming into the same state; callers look rows up by
+        symbol through state.index.
+        """
+        symbols = sorted(symbols)
+        key = ('rolling_correlation', tuple(symbols), INDICATOR_TIMEFRAME, window, None)
+        seed = lambda: self.technical_indicators.build_rolling_correlation(
+            symbols, [self.historical_data.get_ohlcv(s, INDICATOR_TIMEFRAME, limit=window + 1) for s in symbols], window
+        )
+        state = correlation_cache.get_or_compute(key, seed)
+        
+        latest = [self.historical_data.get_ohlcv(s, INDICATOR_TIMEFRAME, limit=CORRELATION_UPDATE_BARS) for s in symbols]
+        newest = max((int(o.timestamp[-1]) for o in latest if len(o)), default=None)
+        timeframe_ms = OHLCVResampler.timeframe_to_ms(INDICATOR_TIMEFRAME)
+        
+        # More new bars than the loaded tail cannot be streamed; rebuild from the window
+        if state.last_timestamp is None or (
+                newest is not None and newest > state.last_timestamp + CORRELATION_UPDATE_BARS * timeframe_ms):
+            state = seed()
+            correlation_cache.put(key, state)
+        else:
+            self.technical_indicators.update_rolling_correlation(state, latest)
+        return state
+    
+    @staticmethod
+    def _finite_or_none(value) -> Optional[float]:
+        """JSON-safe rounded float, None for NaN"""
+        return round(float(value), 4) if np.isfinite(value) else None
+    
     def get_heatmap_data(self, 
                          selected_indicator: str = 'rsi',
                          days: int = 30,
                          top_coins_limit: int = 50) -> Dict:
         """Get data for heatmap visualization"""
         try:
-            logger.info(f"Getting heatmap data for indicator: {selected_indicator}, days: {days}")
+            logger.info("Getting heatmap data for indicator: %s, days: %s", selected_indicator, days)
             
             # Get top coins by volume
             top_coins = self._get_top_coins_by_volume(top_coins_limit)
-            logger.info(f"Retrieved {len(top_coins)} top coins for heatmap")
+            logger.info("Retrieved %s top coins for heatmap", len(top_coins))
             
             if not top_coins:
                 logger.warning("No coins data available for heatmap")
@@ -160,7 +356,7 @@ class EnhancedScreenerService:
             
             # Get BTC data for relative calculations
             btc_data = self._get_btc_data()
-            logger.info(f"BTC data for heatmap: {btc_data}")
+            logger.debug("BTC data for heatmap: %s", btc_data)
             
             # Prepare heatmap data structure
             heatmap_data = {
@@ -178,11 +374,11 @@ class EnhancedScreenerService:
             start_date = end_date - timedelta(days=days)
             timestamps = pd.date_range(start=start_date, end=end_date, freq='D')
             
-            logger.info(f"Generated {len(timestamps)} timestamps for heatmap")
+            logger.info("Generated %s timestamps for heatmap", len(timestamps))
             
             # Process each coin
             for coin_symbol in top_coins[:10]:  # Limit to top 10 for preview
-                logger.debug(f"Processing coin {coin_symbol} for heatmap")
+                logger.debug("Processing coin %s for heatmap", coin_symbol)
                 
                 # Get historical data for this coin
                 historical_data = self.historical_data.get_historical_data(coin_symbol, days)
@@ -208,11 +404,11 @@ class EnhancedScreenerService:
                     }
                     
                     heatmap_data['coins'].append(coin_heatmap_data)
-                    logger.debug(f"Added heatmap data for {coin_symbol}")
+                    logger.debug("Added heatmap data for %s", coin_symbol)
                 else:
-                    logger.warning(f"No historical data for {coin_symbol}")
+                    logger.warning("No historical data for %s", coin_symbol)
             
-            logger.info(f"Generated heatmap data for {len(heatmap_data['coins'])} coins")
+            logger.info("Generated heatmap data for %s coins", len(heatmap_data['coins']))
             
             return {
                 'success': True,
@@ -220,7 +416,7 @@ class EnhancedScreenerService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting heatmap data: {e}")
+            logger.error("Error getting heatmap data: %s", e)
             return {
                 'success': False,
                 'message': f'Error: {str(e)}',
@@ -228,9 +424,16 @@ class EnhancedScreenerService:
             }
     
     def _get_top_coins_by_volume(self, limit: int) -> List[str]:
-        """Get top coins by volume from WebSocket service"""
+        """Get top coins by volume from the shared ticker snapshot, else the WebSocket service"""
         try:
-            logger.info(f"Getting top {limit} coins by volume")
+            logger.info("Getting top %s coins by volume", limit)
+            
+            # Ticker snapshot shared by every request, at most TICKER_SNAPSHOT_MAX_AGE seconds old
+            snapshot_coins = self.binance_service.get_top_coins_by_volume(limit)
+            if snapshot_coins:
+                symbols = [self.binance_service.exchange.market_id(coin['symbol']) for coin in snapshot_coins]
+                logger.info("Ticker snapshot returned %s coins", len(symbols))
+                return symbols
             
             # Ensure WebSocket is connected and has data
             if not self.websocket_service.is_connected:
@@ -240,29 +443,29 @@ class EnhancedScreenerService:
                 if not connection_result['success']:
                     logger.warning("WebSocket not connected, falling back to historical data")
                     historical_coins = self.historical_data.get_top_coins_by_volume(limit)
-                    logger.info(f"Historical data returned {len(historical_coins)} coins")
+                    logger.info("Historical data returned %s coins", len(historical_coins))
                     return historical_coins
             
             # Try to get from WebSocket service first
             websocket_coins = self.websocket_service.get_top_coins_by_volume(limit)
-            logger.info(f"WebSocket returned {len(websocket_coins)} coins")
+            logger.info("WebSocket returned %s coins", len(websocket_coins))
             
             if websocket_coins:
                 # Convert the WebSocket format to the expected format
                 # WebSocket returns: [{'symbol': 'BTCUSDT', 'volume': 123, 'price': 456, 'change': 789}]
                 # We need: ['BTCUSDT', 'ETHUSDT', ...]
                 symbols = [coin['symbol'] for coin in websocket_coins if 'symbol' in coin]
-                logger.info(f"Converted WebSocket data to {len(symbols)} symbols: {symbols[:5]}")
+                logger.info("Converted WebSocket data to %s symbols: %s", len(symbols), symbols[:5])
                 return symbols
             
             # Fallback to historical data service
             logger.info("Falling back to historical data service")
             historical_coins = self.historical_data.get_top_coins_by_volume(limit)
-            logger.info(f"Historical data returned {len(historical_coins)} coins")
+            logger.info("Historical data returned %s coins", len(historical_coins))
             return historical_coins
             
         except Exception as e:
-            logger.error(f"Error getting top coins by volume: {e}")
+            logger.error("Error getting top coins by volume: %s", e)
             return []
     
     def _get_btc_data(self) -> Dict:
@@ -272,15 +475,24 @@ class EnhancedScreenerService:
             
             btc_data = self.websocket_service.get_ticker_data('BTCUSDT')
             if btc_data:
-                logger.debug(f"WebSocket BTC data: {btc_data}")
+                logger.debug("WebSocket BTC data: %s", btc_data)
                 converted_btc_data = {
                     'price': btc_data.get('price', 0),
                     'price_change_24h': btc_data.get('price_change', 0),
                     'volume_24h': btc_data.get('volume_quote', 0)
                 }
-                logger.debug(f"Converted WebSocket BTC data: {converted_btc_data}")
+                logger.debug("Converted WebSocket BTC data: %s", converted_btc_data)
                 return converted_btc_data
             
+            # Then the shared REST ticker snapshot
+            snapshot_data = self._get_snapshot_ticker(BTC_SYMBOL)
+            if snapshot_data:
+                return {
+                    'price': snapshot_data['price'],
+                    'price_change_24h': snapshot_data['change'] or 0,
+                    'volume_24h': snapshot_data['volume']
+                }
+            
             # Fallback to historical data
             logger.debug("Falling back to historical BTC data")
             btc_historical = self.historical_data.get_historical_data('BTCUSDT', 1)
@@ -291,25 +503,30 @@ class EnhancedScreenerService:
                     'price_change_24h': latest.get('price_change_24h', 0),
                     'volume_24h': latest.get('volume_24h', 0)
                 }
-                logger.debug(f"Historical BTC data: {historical_btc_data}")
+                logger.debug("Historical BTC data: %s", historical_btc_data)
                 return historical_btc_data
             
             logger.warning("No BTC data available, using defaults")
             return {'price': 0, 'price_change_24h': 0, 'volume_24h': 0}
             
         except Exception as e:
-            logger.error(f"Error getting BTC data: {e}")
+            logger.error("Error getting BTC data: %s", e)
             return {'price': 0, 'price_change_24h': 0, 'volume_24h': 0}
     
+    def _get_snapshot_ticker(self, symbol: str) -> Optional[Dict]:
+        """Ticker of a market id ('BTCUSDT') from the shared USDT ticker snapshot"""
+        unified = self._unified_symbols([symbol]).get(symbol)
+        return usdt_tickers.get(unified) if unified else None
+    
     def _get_coin_data(self, symbol: str) -> Dict:
         """Get current data for a specific coin"""
         try:
-            logger.debug(f"Getting data for coin: {symbol}")
+            logger.debug("Getting data for coin: %s", symbol)
             
             # Try WebSocket first
             websocket_data = self.websocket_service.get_ticker_data(symbol)
             if websocket_data:
-                logger.debug(f"WebSocket data for {symbol}: {websocket_data}")
+                logger.debug("WebSocket data for %s: %s", symbol, websocket_data)
                 # Convert WebSocket format to expected format
                 converted_data = {
                     'symbol': symbol,
@@ -318,11 +535,22 @@ class EnhancedScreenerService:
                     'price_change_24h': websocket_data.get('price_change', 0),
                     'rsi': 0  # WebSocket doesn't provide RSI, will be calculated
                 }
-                logger.debug(f"Converted WebSocket data for {symbol}: {converted_data}")
+                logger.debug("Converted WebSocket data for %s: %s", symbol, converted_data)
                 return converted_data
             
+            # Then the shared REST ticker snapshot
+            snapshot_data = self._get_snapshot_ticker(symbol)
+            if snapshot_data:
+                return {
+                    'symbol': symbol,
+                    'price': snapshot_data['price'],
+                    'volume_24h': snapshot_data['volume'],
+                    'price_change_24h': snapshot_data['change'] or 0,
+                    'rsi': 0
+                }
+            
             # Fallback to historical data
-            logger.debug(f"Falling back to historical data for {symbol}")
+            logger.debug("Falling back to historical data for %s", symbol)
             historical_data = self.historical_data.get_historical_data(symbol, 1)
             if not historical_data.empty:
                 latest = historical_data.iloc[-1]
@@ -333,51 +561,162 @@ class EnhancedScreenerService:
                     'price_change_24h': latest.get('price_change_24h', 0),
                     'rsi': latest.get('rsi', 0)
                 }
-                logger.debug(f"Historical data for {symbol}: {historical_coins_data}")
+                logger.debug("Historical data for %s: %s", symbol, historical_coins_data)
                 return historical_coins_data
             
-            logger.warning(f"No data available for {symbol}")
+            logger.warning("No data available for %s", symbol)
             return {}
             
         except Exception as e:
-            logger.error(f"Error getting coin data for {symbol}: {e}")
+            logger.error("Error getting coin data for %s: %s", symbol, e)
             return {}
     
-    def _calculate_indicators_for_coins(self, coins: List[str], btc_data: Dict) -> List[Dict]:
-        """Calculate indicators for a list of coins"""
+    def _get_coins_data(self, coins: List[str]) -> List[Dict]:
+        """Current ticker data for a list of coins, skipping coins without any"""
         try:
             if not coins:
                 logger.warning("No coins provided for indicator calculation")
                 return []
                 
-            coins_with_indicators = []
+            coins_data = []
             
             for coin_symbol in coins:
                 coin_data = self._get_coin_data(coin_symbol)
                 if coin_data:
-                    # Calculate all indicators
-                    indicators = self.technical_indicators.calculate_all_indicators(coin_data, btc_data)
-                    
-                    # Add indicators to coin data
-                    coin_data.update(indicators)
-                    coins_with_indicators.append(coin_data)
+                    coins_data.append(coin_data)
                 else:
-                    logger.warning(f"No data available for coin: {coin_symbol}")
+                    logger.warning("No data available for coin: %s", coin_symbol)
             
-            logger.info(f"Calculated indicators for {len(coins_with_indicators)} out of {len(coins)} coins")
-            return coins_with_indicators
+            return coins_data
             
         except Exception as e:
-            logger.error(f"Error calculating indicators for coins: {e}")
+            logger.error("Error getting coins data: %s", e)
             return []
     
+    def _unified_symbols(self, market_ids: List[str]) -> Dict[str, str]:
+        """Exchange symbol of every market id the exchange lists ('BTCUSDT' -> 'BTC/USDT')"""
+        exchange = self.binance_service.exchange
+        if not exchange.markets:
+            self.binance_service.get_markets()
+        by_id = exchange.markets_by_id or {}
+        return {market_id: by_id[market_id][0]['symbol'] for market_id in market_ids if market_id in by_id}
+    
+    def _sync_candles(self, symbols: List[str], limit: int = KLINE_HISTORY_BARS) -> Dict[str, OHLCV]:
+        """Latest `limit` stored candles per symbol, after downloading the candles newer than storage
+        
+        Only candles newer than the stored ones are fetched (see OHLCVSync), so
+        after the first screen this is one or two candles per symbol. Symbols the
+        exchange does not list are read from storage as they are.
+        """
+        unified = self._unified_symbols(symbols)
+        windows = self.binance_service.sync_ohlcv_batch(list(unified.values()), INDICATOR_TIMEFRAME, limit) \
+            if unified else {}
+        
+        candles = {}
+        for symbol in symbols:
+            ohlcv = windows.get(unified.get(symbol))
+            if ohlcv is None:
+                ohlcv = self.historical_data.get_ohlcv(symbol, INDICATOR_TIMEFRAME, limit=limit)
+            if len(ohlcv):
+                candles[symbol] = ohlcv
+        logger.debug("Synced candles for %s of %s symbols (%s from the exchange)", len(candles), len(symbols),
+                     len(windows))
+        return candles
+    
+    def _get_kline_values(self, symbols: List[str], nodes: List[str]) -> Dict[str, np.ndarray]:
+        """Kline indicator values per engine node for symbols, computed once per closed candle
+        
+        Only closed candles go into the values, so they stay exact until the
+        next close; nothing taken from live tickers is part of the cached result.
+        The cache is keyed on the symbol set, so a reshuffled volume ranking
+        still hits it. Values are not cached while no symbol has candles.
+        """
+        universe = sorted(set(symbols))
+        last_closed = last_closed_open_time(INDICATOR_TIMEFRAME)
+        key = ('kline_indicators', tuple(universe), INDICATOR_TIMEFRAME, tuple(nodes), last_closed)
+        values = indicator_cache.get_or_compute(
+            key, lambda: self._compute_kline_values(universe, list(nodes), last_closed),
+            should_cache=lambda values: any(np.isfinite(column).any() for column in values.values())
+        )
+        
+        rows = {symbol: row for row, symbol in enumerate(universe)}
+        order = np.array([rows[symbol] for symbol in symbols], dtype=np.intp)
+        return {node: column[order] for node, column in values.items()}
+    
+    def _compute_kline_values(self, symbols: List[str], nodes: List[str], last_closed: int) -> Dict[str, np.ndarray]:
+        """Sync the universe's candles and evaluate nodes on the candles closed by last_closed"""
+        # BTC is synced with the universe; Mansfield RS needs a full average of the ratio
+        needs_btc = 'mansfield_rs' in nodes
+        synced = self._sync_candles(symbols + [BTC_SYMBOL] if needs_btc and BTC_SYMBOL not in symbols else symbols)
+        closed = {symbol: ohlcv[:int(np.searchsorted(ohlcv.timestamp, last_closed, side='right'))]
+                  for symbol, ohlcv in synced.items()}
+        
+        btc_ohlcv = closed.get(BTC_SYMBOL) if needs_btc else None
+        if needs_btc and (btc_ohlcv is None or len(btc_ohlcv) < MANSFIELD_PERIOD + 1):
+            # Without enough BTC candles only the BTC-relative node is skipped
+            logger.warning("Only %s BTC candles, Mansfield RS needs %s; skipping it",
+                           0 if btc_ohlcv is None else len(btc_ohlcv), MANSFIELD_PERIOD + 1)
+            nodes.remove('mansfield_rs')
+            btc_ohlcv = None
+        if not nodes:
+            return {}
+        
+        return self.technical_indicators.calculate_indicators_batch(
+            [closed.get(symbol) for symbol in symbols], nodes, btc_ohlcv=btc_ohlcv,
+            mansfield_period=MANSFIELD_PERIOD, timeframe=INDICATOR_TIMEFRAME
+        )
+    
+    def _get_kline_columns(self, coins_data: List[Dict], selected: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Kline-based indicator arrays aligned with coins_data, by coin dict key, from the per-candle cache"""
+        try:
+            wanted = set(selected) if selected is not None else set(KLINE_INDICATORS)
+            nodes = sorted({KLINE_INDICATORS[name] for name in wanted if name in KLINE_INDICATORS})
+            if not nodes or not coins_data:
+                return {}
+            
+            values = self._get_kline_values([coin['symbol'] for coin in coins_data], nodes)
+            return {KLINE_COIN_KEYS[node]: column for node, column in values.items()}
+            
+        except Exception as e:
+            logger.error("Error getting kline indicators: %s", e)
+            return {}
+    
+    def _attach_provisional_rsi(self, coins_data: List[Dict]):
+        """Set each coin's RSI to a provisional value: stored closed candles plus the ticker price as the open one
+        
+        The shared RSI states are advanced with the closed candles stored since
+        their last one (O(1) each) whenever a new candle has closed. The
+        in-progress candle is not streamed, so its close is taken to be the
+        coin's last ticker price.
+        """
+        try:
+            last_closed = last_closed_open_time(INDICATOR_TIMEFRAME)
+            stale = [coin['symbol'] for coin in coins_data
+                     if (streaming_rsi.last_open_time(coin['symbol'], INDICATOR_TIMEFRAME) or 0) < last_closed]
+            
+            if stale:
+                for symbol, ohlcv in self._sync_candles(stale).items():
+                    streaming_rsi.advance_from_ohlcv(symbol, INDICATOR_TIMEFRAME, ohlcv)
+            
+            provisional = 0
+            for coin_data in coins_data:
+                rsi = streaming_rsi.get_rsi(coin_data['symbol'], INDICATOR_TIMEFRAME,
+                                            provisional_close=coin_data.get('price') or None)
+                if rsi is not None:
+                    coin_data['rsi'] = rsi
+                    provisional += 1
+            logger.debug("Provisional RSI for %s of %s coins (%s advanced)", provisional, len(coins_data), len(stale))
+            
+        except Exception as e:
+            logger.error("Error attaching provisional RSI: %s", e)
+    
     def _prepare_historical_values(self, 
                                  historical_data: pd.DataFrame, 
                                  indicator: str, 
                                  timestamps: pd.DatetimeIndex) -> List[float]:
         """Prepare historical values for heatmap visualization"""
         try:
-            logger.debug(f"Preparing historical values for indicator: {indicator}, timestamps: {len(timestamps)}")
+            logger.debug("Preparing historical values for indicator: %s, timestamps: %s", indicator, len(timestamps))
             
             values = []
             
@@ -398,19 +737,19 @@ class EnhancedScreenerService:
                             value = 0  # Default for other indicators
                         
                         values.append(value)
-                        logger.debug(f"Added value {value} for {ts_str}")
+                        logger.debug("Added value %s for %s", value, ts_str)
                     else:
                         values.append(0)  # No data for this day
-                        logger.debug(f"No data for {ts_str}, using 0")
+                        logger.debug("No data for %s, using 0", ts_str)
                 else:
                     values.append(0)
-                    logger.debug(f"Historical data empty, using 0 for {ts}")
+                    logger.debug("Historical data empty, using 0 for %s", ts)
             
-            logger.debug(f"Prepared {len(values)} historical values")
+            logger.debug("Prepared %s historical values", len(values))
             return values
             
         except Exception as e:
-            logger.error(f"Error preparing historical values: {e}")
+            logger.error("Error preparing historical values: %s", e)
             return [0] * len(timestamps)
     
     def get_screening_stats(self) -> Dict:
@@ -419,21 +758,23 @@ class EnhancedScreenerService:
             logger.info("Getting screening service statistics")
             
             db_stats = self.historical_data.get_database_stats()
-            logger.info(f"Database stats: {db_stats}")
+            logger.debug("Database stats: %s", db_stats)
             
             websocket_status = 'Connected' if self.websocket_service.is_connected else 'Disconnected'
-            logger.info(f"WebSocket status: {websocket_status}")
+            logger.info("WebSocket status: %s", websocket_status)
             
             stats = {
                 'database_stats': db_stats,
                 'websocket_status': websocket_status,
                 'available_indicators': len(self.available_indicators),
+                'indicator_cache': indicator_cache.stats(),
+                'correlation_cache': correlation_cache.stats(),
                 'last_updated': datetime.now().isoformat()
             }
             
-            logger.info(f"Screening stats: {stats}")
+            logger.debug("Screening stats: %s", stats)
             return stats
             
         except Exception as e:
-            logger.error(f"Error getting screening stats: {e}")
+            logger.error("Error getting screening stats: %s", e)
             return {}
@@ -0,0 +1,156 @@
+import asyncio
+import ssl
+import threading
+from typing import Dict, Tuple
+
+import aiohttp
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from app.services.lazy_logging import get_logger
+from app.services.market_cache import market_cache
+from app.services.rate_limiter import AsyncRateLimitedBinance, RateLimitedBinance
+
+logger = get_logger(__name__)
+
+# exchange id -> (synchronous client class, asyncio client class)
+EXCHANGE_CLASSES = {
+    'binance': (RateLimitedBinance, AsyncRateLimitedBinance)
+}
+
+# Clients hydrated from the on-disk market snapshot, which holds Binance spot markets
+MARKET_CACHES = {
+    ('binance', 'spot'): market_cache
+}
+
+
+class ExchangeRegistry:
+    """
+    One long-lived ccxt client per (exchange, market type), shared by every service
+
+    Synchronous clients share a requests session whose connection pool keeps
+    up to `pool_size` connections alive, so requests reuse TCP/TLS connections
+    instead of each service opening its own. Asyncio clients live on one
+    event loop running in a daemon thread, with an aiohttp connector limited
+    to `pool_size`; synchronous code runs coroutines on it with run().
+
+    The sync clients are safe to call from several threads: requests' pool is
+    thread-safe, markets are hydrated before the client is handed out, and the
+    rate limiter they share is locked.
+    """
+
+    def __init__(self, pool_size: int = 20, timeout_ms: int = 30000):
+        """
+        Initialize an empty registry
+
+        Args:
+            pool_size (int): Keep-alive connections per client
+            timeout_ms (int): ccxt request timeout
+        """
+        self.pool_size = pool_size
+        self.timeout_ms = timeout_ms
+        self.clients: Dict[Tuple[str, str], object] = {}
+        self.async_clients: Dict[Tuple[str, str], object] = {}
+        self.lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+
+    def _config(self, market_type: str) -> Dict:
+        return {
+            'enableRateLimit': True,
+            'options': {'defaultType': market_type},
+            'timeout': self.timeout_ms
+        }
+
+    def _session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def create(self, exchange_id: str = 'binance', market_type: str = 'spot'):
+        """Standalone synchronous client, not pooled (e.g. for a background thread)"""
+        sync_class, _ = EXCHANGE_CLASSES[exchange_id]
+        return sync_class(self._config(market_type))
+
+    def get(self, exchange_id: str = 'binance', market_type: str = 'spot'):
+        """Shared synchronous client, created and hydrated on first use"""
+        key = (exchange_id, market_type)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                sync_class, _ = EXCHANGE_CLASSES[exchange_id]
+                client = sync_class({**self._config(market_type), 'session': self._session()})
+                cache = MARKET_CACHES.get(key)
+                if cache is not None:
+                    cache.hydrate(client, lambda: self.create(exchange_id, market_type))
+                self.clients[key] = client
+                logger.info("Created pooled %s %s client (%s connections)", exchange_id, market_type, self.pool_size)
+            return client
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop of the asyncio clients, started on first use"""
+        with self.lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name='exchange-registry',
+                                                     daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    def run(self, coroutine, timeout: float = None):
+        """Run a coroutine on the registry loop from synchronous code and return its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def get_async(self, exchange_id: str = 'binance', market_type: str = 'spot'):
+        """Shared asyncio client; only use it from coroutines running on the registry loop"""
+        key = (exchange_id, market_type)
+        with self.lock:
+            client = self.async_clients.get(key)
+            if client is None:
+                _, async_class = EXCHANGE_CLASSES[exchange_id]
+                connector = aiohttp.TCPConnector(ssl=ssl.create_default_context(cafile=certifi.where()),
+                                                 limit=self.pool_size, enable_cleanup_closed=True)
+                client = async_class({**self._config(market_type), 'asyncio_loop': self._loop,
+                                      'session': aiohttp.ClientSession(connector=connector)})
+                cache = MARKET_CACHES.get(key)
+                if cache is not None:
+                    cache.hydrate(client)
+                self.async_clients[key] = client
+                logger.info("Created pooled async %s %s client (%s connections)", exchange_id, market_type, self.pool_size)
+            return client
+
+    async def _close_async(self):
+        for client in self.async_clients.values():
+            await client.session.close()
+            await client.close()
+        self.async_clients.clear()
+
+    def close(self):
+        """Close every client and stop the event loop"""
+        if self._loop is not None:
+            self.run(self._close_async())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop = self._loop_thread = None
+        with self.lock:
+            for client in self.clients.values():
+                client.session.close()
+            self.clients.clear()
+
+    def stats(self) -> Dict:
+        """Clients in the registry"""
+        with self.lock:
+            return {
+                'pool_size': self.pool_size,
+                'clients': [f"{exchange_id}:{market_type}" for exchange_id, market_type in self.clients],
+                'async_clients': [f"{exchange_id}:{market_type}" for exchange_id, market_type in self.async_clients]
+            }
+
+
+# Process-wide registry; routes and services create new service objects per request
+exchange_registry = ExchangeRegistry(pool_size=Config.EXCHANGE_POOL_SIZE)
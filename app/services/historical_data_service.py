@@ -1,19 +1,21 @@
 import sqlite3
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
-import logging
 from datetime import datetime, timedelta
 import json
 import threading
 import time
 
-logger = logging.getLogger(__name__)
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+
+logger = get_logger(__name__)
 
 class HistoricalDataService:
     """Service for managing historical price data"""
     
     def __init__(self, db_path: str = "historical_data.db"):
-        logger.info(f"Initializing Historical Data Service with database: {db_path}")
+        logger.info("Initializing Historical Data Service with database: %s", db_path)
         self.db_path = db_path
         self.lock = threading.Lock()
         self.init_database()
@@ -68,6 +70,22 @@ class HistoricalDataService:
                     """)
                     logger.debug("Indicators table created/verified")
                     
+                    # Create candles table (one row per closed or in-progress kline)
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS ohlcv (
+                            symbol TEXT,
+                            timeframe TEXT,
+                            timestamp INTEGER,
+                            open REAL,
+                            high REAL,
+                            low REAL,
+                            close REAL,
+                            volume REAL,
+                            PRIMARY KEY (symbol, timeframe, timestamp)
+                        )
+                    """)
+                    logger.debug("OHLCV table created/verified")
+                    
                     # Create indexes for better performance
                     cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_symbol_timestamp ON price_history(symbol, timestamp)")
                     cursor.execute("CREATE INDEX IF NOT EXISTS idx_indicators_symbol_timestamp ON indicators(symbol, timestamp)")
@@ -77,13 +95,13 @@ class HistoricalDataService:
                     logger.info("Database initialization completed successfully")
                     
         except Exception as e:
-            logger.error(f"Error initializing database: {e}")
+            logger.error("Error initializing database: %s", e)
             raise
     
     def add_coin(self, symbol: str, name: str = None):
         """Add or update a coin in the database"""
         try:
-            logger.debug(f"Adding/updating coin: {symbol} ({name})")
+            logger.debug("Adding/updating coin: %s (%s)", symbol, name)
             
             with self.lock:
                 with sqlite3.connect(self.db_path) as conn:
@@ -94,28 +112,28 @@ class HistoricalDataService:
                     existing = cursor.fetchone()
                     
                     if existing:
-                        logger.debug(f"Coin {symbol} already exists, updating...")
+                        logger.debug("Coin %s already exists, updating...", symbol)
                         cursor.execute("""
                             UPDATE coins SET name = ?, last_updated = ?
                             WHERE symbol = ?
                         """, (name or symbol, datetime.now(), symbol))
                     else:
-                        logger.debug(f"Adding new coin: {symbol}")
+                        logger.debug("Adding new coin: %s", symbol)
                         cursor.execute("""
                             INSERT OR REPLACE INTO coins (symbol, name, first_seen, last_updated)
                             VALUES (?, ?, ?, ?)
                         """, (symbol, name, datetime.now(), datetime.now()))
                     
                     conn.commit()
-                    logger.info(f"Added/updated coin: {symbol}")
+                    logger.info("Added/updated coin: %s", symbol)
                     
         except Exception as e:
-            logger.error(f"Error adding coin {symbol}: {e}")
+            logger.error("Error adding coin %s: %s", symbol, e)
     
     def update_price_data(self, symbol: str, price_data: Dict):
         """Update price data for a specific coin"""
         try:
-            logger.debug(f"Updating price data for {symbol}: {price_data}")
+            logger.debug("Updating price data for %s: %s", symbol, price_data)
             
             with self.lock:
                 with sqlite3.connect(self.db_path) as conn:
@@ -141,10 +159,10 @@ class HistoricalDataService:
                     """, (datetime.now(), symbol))
                     
                     conn.commit()
-                    logger.debug(f"Price data updated for {symbol}")
+                    logger.debug("Price data updated for %s", symbol)
                     
         except Exception as e:
-            logger.error(f"Error updating price data for {symbol}: {e}")
+            logger.error("Error updating price data for %s: %s", symbol, e)
     
     def update_indicators(self, symbol: str, indicators: Dict):
         """Update technical indicators for a specific coin"""
@@ -172,12 +190,101 @@ class HistoricalDataService:
                     conn.commit()
                     
         except Exception as e:
-            logger.error(f"Error updating indicators for {symbol}: {e}")
+            logger.error("Error updating indicators for %s: %s", symbol, e)
+    
+    def store_ohlcv(self, symbol: str, timeframe: str, ohlcv: OHLCV):
+        """Insert or replace candles for a symbol/timeframe"""
+        try:
+            if not len(ohlcv):
+                return
+            
+            rows = zip(
+                [symbol] * len(ohlcv), [timeframe] * len(ohlcv),
+                ohlcv.timestamp.tolist(), ohlcv.open.tolist(), ohlcv.high.tolist(),
+                ohlcv.low.tolist(), ohlcv.close.tolist(), ohlcv.volume.tolist()
+            )
+            
+            with self.lock:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO ohlcv
+                        (symbol, timeframe, timestamp, open, high, low, close, volume)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+                    conn.commit()
+            
+            logger.debug("Stored %s %s candles for %s", len(ohlcv), timeframe, symbol)
+            
+        except Exception as e:
+            logger.error("Error storing OHLCV for %s: %s", symbol, e)
+    
+    def get_ohlcv(self, symbol: str, timeframe: str, limit: int = 100) -> OHLCV:
+        """Get the most recent stored candles for a symbol/timeframe, oldest first"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT timestamp, open, high, low, close, volume
+                    FROM ohlcv
+                    WHERE symbol = ? AND timeframe = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                """, (symbol, timeframe, limit))
+                
+                rows = cursor.fetchall()
+                rows.reverse()
+                return OHLCV.from_ccxt(rows)
+                
+        except Exception as e:
+            logger.error("Error getting OHLCV for %s: %s", symbol, e)
+            return OHLCV.empty()
+    
+    def get_last_ohlcv_timestamps(self, timeframe: str, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+        """Open time of the newest stored candle per symbol for a timeframe"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT symbol, MAX(timestamp)
+                    FROM ohlcv
+                    WHERE timeframe = ?
+                    GROUP BY symbol
+                """, (timeframe,))
+                
+                last = {symbol: int(timestamp) for symbol, timestamp in cursor.fetchall()}
+                if symbols is not None:
+                    last = {symbol: last[symbol] for symbol in symbols if symbol in last}
+                return last
+                
+        except Exception as e:
+            logger.error("Error getting last OHLCV timestamps for %s: %s", timeframe, e)
+            return {}
+    
+    def count_ohlcv(self, timeframe: str, since: int, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+        """Number of stored candles per symbol opening at or after `since` (ms)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT symbol, COUNT(*)
+                    FROM ohlcv
+                    WHERE timeframe = ? AND timestamp >= ?
+                    GROUP BY symbol
+                """, (timeframe, since))
+                
+                counts = {symbol: int(count) for symbol, count in cursor.fetchall()}
+                if symbols is not None:
+                    counts = {symbol: counts.get(symbol, 0) for symbol in symbols}
+                return counts
+                
+        except Exception as e:
+            logger.error("Error counting OHLCV for %s: %s", timeframe, e)
+            return {}
     
     def get_historical_data(self, symbol: str, days: int = 30, interval: str = '1d') -> pd.DataFrame:
         """Get historical data for a specific coin"""
         try:
-            logger.debug(f"Getting historical data for {symbol}, last {days} days")
+            logger.debug("Getting historical data for %s, last %s days", symbol, days)
             
             with sqlite3.connect(self.db_path) as conn:
                 # Calculate start date
@@ -195,20 +302,20 @@ class HistoricalDataService:
                 if not df.empty:
                     df['timestamp'] = pd.to_datetime(df['timestamp'])
                     df.set_index('timestamp', inplace=True)
-                    logger.debug(f"Retrieved {len(df)} historical records for {symbol}")
+                    logger.debug("Retrieved %s historical records for %s", len(df), symbol)
                 else:
-                    logger.warning(f"No historical data found for {symbol}")
+                    logger.warning("No historical data found for %s", symbol)
                 
                 return df
                 
         except Exception as e:
-            logger.error(f"Error getting historical data for {symbol}: {e}")
+            logger.error("Error getting historical data for %s: %s", symbol, e)
             return pd.DataFrame()
     
     def get_top_coins_by_volume(self, limit: int = 100) -> List[str]:
         """Get top coins by 24h volume"""
         try:
-            logger.debug(f"Getting top {limit} coins by volume from historical data")
+            logger.debug("Getting top %s coins by volume from historical data", limit)
             
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -221,11 +328,11 @@ class HistoricalDataService:
                 """, (limit,))
                 
                 coins = [row[0] for row in cursor.fetchall()]
-                logger.debug(f"Historical data returned {len(coins)} coins: {coins[:5]}")
+                logger.debug("Historical data returned %s coins: %s", len(coins), coins[:5])
                 return coins
                 
         except Exception as e:
-            logger.error(f"Error getting top coins by volume: {e}")
+            logger.error("Error getting top coins by volume: %s", e)
             return []
     
     def get_coins_with_data(self) -> List[str]:
@@ -241,7 +348,7 @@ class HistoricalDataService:
                 return [row[0] for row in cursor.fetchall()]
                 
         except Exception as e:
-            logger.error(f"Error getting coins with data: {e}")
+            logger.error("Error getting coins with data: %s", e)
             return []
     
     def get_latest_indicators(self, symbol: str) -> Dict:
@@ -268,7 +375,7 @@ class HistoricalDataService:
                 return {}
                 
         except Exception as e:
-            logger.error(f"Error getting latest indicators for {symbol}: {e}")
+            logger.error("Error getting latest indicators for %s: %s", symbol, e)
             return {}
     
     def cleanup_old_data(self, days_to_keep: int = 90):
@@ -291,10 +398,10 @@ class HistoricalDataService:
                 """, (cutoff_date,))
                 
                 conn.commit()
-                logger.info(f"Cleaned up data older than {days_to_keep} days")
+                logger.info("Cleaned up data older than %s days", days_to_keep)
                 
         except Exception as e:
-            logger.error(f"Error cleaning up old data: {e}")
+            logger.error("Error cleaning up old data: %s", e)
     
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
@@ -330,9 +437,9 @@ class HistoricalDataService:
                     'newest_data': newest_data
                 }
                 
-                logger.debug(f"Database stats: {stats}")
+                logger.debug("Database stats: %s", stats)
                 return stats
                 
         except Exception as e:
-            logger.error(f"Error getting database stats: {e}")
+            logger.error("Error getting database stats: %s", e)
             return {}
@@ -0,0 +1,116 @@
+import ccxt
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+import numpy as np
+
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def last_closed_open_time(timeframe: str, timestamps: Optional[np.ndarray] = None,
+                          now_ms: Optional[int] = None) -> Optional[int]:
+    """
+    Open time (ms) of the last closed candle
+
+    Args:
+        timeframe (str): Candle timeframe, e.g. '1h'
+        timestamps (np.ndarray): Candle open times; when omitted the exchange
+            (UTC) boundary before now is used
+        now_ms (int): Current time in ms (defaults to the wall clock)
+
+    Returns:
+        Optional[int]: Open time, or None if no candle in timestamps has closed
+    """
+    timeframe_ms = int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+
+    if timestamps is None:
+        return now_ms // timeframe_ms * timeframe_ms - timeframe_ms
+
+    closed = int(np.searchsorted(timestamps, now_ms - timeframe_ms, side='right'))
+    return int(timestamps[closed - 1]) if closed else None
+
+
+class IndicatorCache:
+    """Bounded LRU cache for indicator results with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize (int): Maximum number of entries before the least recently used is evicted
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        logger.info("Indicator cache initialized with maxsize %s", maxsize)
+
+    def get_or_compute(self, key: Hashable, compute: Callable, should_cache: Optional[Callable] = None):
+        """
+        Return the cached value for key, computing and storing it on a miss
+
+        The value is computed outside the lock, so two threads missing on the
+        same key may both compute it; the second result simply replaces the first.
+
+        Args:
+            key (Hashable): Cache key
+            compute (Callable): Produces the value on a miss
+            should_cache (Callable): Optional predicate; values it rejects (e.g. error
+                results) are returned but not stored
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        value = compute()
+        if should_cache is None or should_cache(value):
+            self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value):
+        """Store a value, evicting the least recently used entries above maxsize"""
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Cache statistics"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Process-wide cache shared by every RSICalculator and TechnicalIndicators instance,
+# since routes create new service objects per request
+indicator_cache = IndicatorCache()
+
+# Rolling correlation states hold n x n running sums (about 8 MB at 500 symbols),
+# so they are kept apart from indicator results, in a cache of a few entries
+correlation_cache = IndicatorCache(maxsize=8)
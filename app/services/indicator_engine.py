@@ -0,0 +1,451 @@
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import Config
+from app.services.kernels import ema, prefix_sum, rolling_max, rolling_mean, rolling_min, rolling_std, wilder
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+from app.services.ohlcv_resampler import OHLCVResampler
+from app.services.rsi_calculator import RSICalculator
+
+logger = get_logger(__name__)
+
+# Parameters every node may read; callers override them per request
+DEFAULT_PARAMS = {
+    'roc_period': 24,
+    'vwap_window': 24,
+    'vwap_anchor': '1d',
+    'mansfield_period': 52,
+    'volatility_window': 24,
+    'timeframe': '1h',
+    'panel_end': None,      # open time of the close panel's last column (default: newest candle)
+    'bollinger_period': 20,
+    'bollinger_k': 2.0,
+    'atr_period': 14,
+    'macd_fast': 12,
+    'macd_slow': 26,
+    'macd_signal': 9,
+    'stoch_period': 14,
+    'stoch_smooth': 3
+}
+
+# Rate-of-change lookbacks evaluated together from one close panel
+ROC_LOOKBACKS = ('1h', '4h', '24h', '7d', '30d')
+
+
+class IndicatorNode:
+    """One registered kernel: its name, the nodes it reads and how it is computed"""
+
+    __slots__ = ('name', 'inputs', 'compute', 'description')
+
+    def __init__(self, name: str, inputs: Tuple[str, ...], compute: Callable, description: Optional[str] = None):
+        self.name = name
+        self.inputs = inputs
+        self.compute = compute
+        self.description = description
+
+    @property
+    def is_indicator(self) -> bool:
+        """Nodes with a description are public indicators; the rest are intermediates"""
+        return self.description is not None
+
+
+class IndicatorRegistry:
+    """Named indicator and intermediate kernels with their declared inputs"""
+
+    def __init__(self):
+        self.nodes: Dict[str, IndicatorNode] = {}
+
+    def register(self, name: str, inputs: Sequence[str] = (), description: Optional[str] = None):
+        """
+        Decorator registering compute(context, *inputs) under name
+
+        Args:
+            name (str): Node name
+            inputs: Names of the nodes whose values are passed to compute, in order
+            description (str): Human-readable name; marks the node as a public indicator
+        """
+        def decorator(compute: Callable) -> Callable:
+            if name in self.nodes:
+                raise ValueError(f"Indicator node '{name}' is already registered")
+            self.nodes[name] = IndicatorNode(name, tuple(inputs), compute, description)
+            return compute
+        return decorator
+
+    def indicators(self) -> Dict[str, str]:
+        """Public indicators and their descriptions"""
+        return {name: node.description for name, node in self.nodes.items() if node.is_indicator}
+
+    def resolve(self, names: Iterable[str]) -> List[str]:
+        """
+        Topologically ordered list of every node needed for names
+
+        Raises:
+            KeyError: If a name or one of its inputs is not registered
+            ValueError: If the inputs form a cycle
+        """
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Indicator dependency cycle: {' -> '.join(path + (name,))}")
+            if name not in self.nodes:
+                raise KeyError(f"Unknown indicator node '{name}'")
+
+            state[name] = 'visiting'
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, path + (name,))
+            state[name] = 'done'
+            order.append(name)
+
+        for name in names:
+            visit(name, ())
+        return order
+
+
+class BatchContext:
+    """Inputs shared by every node evaluated for one symbol batch"""
+
+    def __init__(self, ohlcv_batch: Sequence[Optional[OHLCV]], btc_ohlcv: Optional[OHLCV],
+                 params: Dict, rsi_calculator: RSICalculator):
+        self.batch = list(ohlcv_batch)
+        self.btc_ohlcv = btc_ohlcv
+        self.params = params
+        self.rsi_calculator = rsi_calculator
+        self.n_symbols = len(self.batch)
+        self.n_bars = max((len(s) for s in self.batch if s is not None), default=0)
+
+
+def _latest(matrix: np.ndarray) -> np.ndarray:
+    """Last column of a right-aligned matrix, NaN when it has no columns"""
+    if matrix.shape[-1] == 0:
+        return np.full(matrix.shape[0], np.nan)
+    return matrix[:, -1].copy()
+
+
+registry = IndicatorRegistry()
+
+
+# Candle columns, right-aligned and NaN-padded to the longest series
+
+for _field in ('timestamp', 'high', 'low', 'close', 'volume'):
+    registry.register(_field)(lambda ctx, _field=_field: OHLCV.stack(ctx.batch, _field, ctx.n_bars))
+
+
+@registry.register('returns', ('close',))
+def _returns(ctx, close):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return close[:, 1:] / close[:, :-1] - 1
+
+
+@registry.register('typical_price', ('high', 'low', 'close'))
+def _typical_price(ctx, high, low, close):
+    return (high + low + close) / 3
+
+
+@registry.register('volume_prefix', ('volume',))
+def _volume_prefix(ctx, volume):
+    return prefix_sum(volume)
+
+
+@registry.register('pv_prefix', ('typical_price', 'volume'))
+def _pv_prefix(ctx, typical_price, volume):
+    return prefix_sum(typical_price * volume)
+
+
+@registry.register('session_start', ('timestamp',))
+def _session_start(ctx, timestamp):
+    """Column of the first bar of the current session per row"""
+    if ctx.n_bars == 0:
+        return np.zeros(ctx.n_symbols, dtype=np.int64)
+    sessions = OHLCVResampler.bucket_start(timestamp, ctx.params['vwap_anchor'])
+    new_session = np.r_['-1', np.ones((ctx.n_symbols, 1), dtype=bool), sessions[:, 1:] != sessions[:, :-1]]
+    return np.where(new_session, np.arange(ctx.n_bars), 0).max(axis=-1)
+
+
+@registry.register('close_panel', ('timestamp',))
+def _close_panel(ctx, timestamp):
+    """
+    Closes on a regular grid of the timeframe ending at the newest candle in the
+    batch (or at the panel_end parameter)
+
+    Column -1 - k holds the close k bars before the newest candle, so every
+    lookback is a fixed column. Series whose last candle is older get NaN there.
+    """
+    timeframe_ms = OHLCVResampler.timeframe_to_ms(ctx.params['timeframe'])
+    longest = max(OHLCVResampler.timeframe_to_ms(lookback) for lookback in ROC_LOOKBACKS) // timeframe_ms
+    if ctx.n_bars == 0:
+        return np.full((ctx.n_symbols, longest + 1), np.nan)
+    newest = ctx.params['panel_end']
+    if newest is None:
+        if np.isnan(timestamp[:, -1]).all():
+            return np.full((ctx.n_symbols, longest + 1), np.nan)
+        newest = int(np.nanmax(timestamp[:, -1]))
+    grid = newest - np.arange(longest, -1, -1, dtype=np.int64) * timeframe_ms
+    return OHLCV.align(ctx.batch, grid, 'close')
+
+
+@registry.register('roc_matrix', ('close_panel',))
+def _roc_matrix(ctx, close_panel):
+    """(n_symbols, len(ROC_LOOKBACKS)) percent change over each lookback, one gather for all"""
+    timeframe_ms = OHLCVResampler.timeframe_to_ms(ctx.params['timeframe'])
+    bars = np.array([OHLCVResampler.timeframe_to_ms(lookback) // timeframe_ms for lookback in ROC_LOOKBACKS])
+    past = close_panel[:, -1 - bars]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roc = (close_panel[:, -1:] / past - 1) * 100
+    # Lookbacks shorter than one candle cannot be measured on this timeframe
+    roc[:, bars < 1] = np.nan
+    return roc
+
+
+@registry.register('btc_close')
+def _btc_close(ctx):
+    if ctx.btc_ohlcv is None or not len(ctx.btc_ohlcv):
+        raise ValueError("BTC candles are required for BTC-relative indicators")
+    return ctx.btc_ohlcv.close.astype(np.float64)
+
+
+@registry.register('btc_aligned_close', ('btc_close',))
+def _btc_aligned_close(ctx, btc_close):
+    """Coin closes placed on BTC's time axis"""
+    return OHLCV.align(ctx.batch, ctx.btc_ohlcv.timestamp, 'close')
+
+
+@registry.register('btc_ratio', ('btc_aligned_close', 'btc_close'))
+def _btc_ratio(ctx, btc_aligned_close, btc_close):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return btc_aligned_close / btc_close
+
+
+# Indicators: one latest value per symbol unless noted
+
+@registry.register('rsi', ('close',), 'Relative Strength Index')
+def _rsi(ctx, close):
+    return _latest(ctx.rsi_calculator.calculate_rsi_series_batch(close))
+
+
+@registry.register('roc', ('close',), 'Rate of Change')
+def _roc(ctx, close):
+    period = ctx.params['roc_period']
+    if ctx.n_bars <= period:
+        return np.full(ctx.n_symbols, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close[:, -1] / close[:, -1 - period] - 1) * 100
+
+
+for _column, _lookback in enumerate(ROC_LOOKBACKS):
+    registry.register(f'roc_{_lookback}', ('roc_matrix',), f'{_lookback} Rate of Change (%)')(
+        lambda ctx, roc_matrix, _column=_column: roc_matrix[:, _column].copy()
+    )
+
+
+@registry.register('volatility', ('returns',), 'Volatility of Returns (%)')
+def _volatility(ctx, returns):
+    window = ctx.params['volatility_window']
+    if returns.shape[-1] < window:
+        return np.full(ctx.n_symbols, np.nan)
+    return np.std(returns[:, -window:], axis=-1, ddof=1) * 100
+
+
+@registry.register('vwap_session', ('pv_prefix', 'volume_prefix', 'session_start'), 'Session VWAP')
+def _vwap_session(ctx, pv_prefix, volume_prefix, session_start):
+    rows = np.arange(ctx.n_symbols)
+    volume = volume_prefix[:, -1] - volume_prefix[rows, session_start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = (pv_prefix[:, -1] - pv_prefix[rows, session_start]) / volume
+    return np.where(volume > 0, vwap, np.nan)
+
+
+@registry.register('vwap_rolling', ('pv_prefix', 'volume_prefix'), 'Rolling VWAP')
+def _vwap_rolling(ctx, pv_prefix, volume_prefix):
+    start = max(ctx.n_bars - ctx.params['vwap_window'], 0)
+    volume = volume_prefix[:, -1] - volume_prefix[:, start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = (pv_prefix[:, -1] - pv_prefix[:, start]) / volume
+    return np.where(volume > 0, vwap, np.nan)
+
+
+@registry.register('vwap_distance', ('close', 'vwap_session'), 'Price vs Session VWAP (%)')
+def _vwap_distance(ctx, close, vwap_session):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (_latest(close) / vwap_session - 1) * 100
+
+
+@registry.register('returns_vs_btc', ('btc_aligned_close', 'btc_close'), 'Returns vs Bitcoin (%)')
+def _returns_vs_btc(ctx, btc_aligned_close, btc_close):
+    period = ctx.params['roc_period']
+    if len(btc_close) <= period:
+        return np.full(ctx.n_symbols, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coin = btc_aligned_close[:, -1] / btc_aligned_close[:, -1 - period] - 1
+        btc = btc_close[-1] / btc_close[-1 - period] - 1
+    return (coin - btc) * 100
+
+
+@registry.register('mansfield_rs_series', ('btc_ratio',))
+def _mansfield_rs_series(ctx, btc_ratio):
+    """(n_symbols, n_btc_bars) RS = (ratio / SMA(ratio) - 1) * 100"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (btc_ratio / rolling_mean(btc_ratio, ctx.params['mansfield_period']) - 1) * 100
+
+
+@registry.register('mansfield_rs', ('mansfield_rs_series',), 'Mansfield Relative Strength')
+def _mansfield_rs(ctx, mansfield_rs_series):
+    return _latest(mansfield_rs_series)
+
+
+# Rolling-window series shared by the oscillators below
+
+@registry.register('bollinger_mid', ('close',))
+def _bollinger_mid(ctx, close):
+    return rolling_mean(close, ctx.params['bollinger_period'])
+
+
+@registry.register('bollinger_width', ('close',))
+def _bollinger_width(ctx, close):
+    """Distance from the middle band to either outer band: k standard deviations"""
+    return ctx.params['bollinger_k'] * rolling_std(close, ctx.params['bollinger_period'])
+
+
+@registry.register('true_range', ('high', 'low', 'close'))
+def _true_range(ctx, high, low, close):
+    previous = np.concatenate((np.full((ctx.n_symbols, 1), np.nan), close[:, :-1]), axis=-1)
+    # fmax skips the missing previous close, so the first candle of a row is high - low
+    return np.fmax(np.fmax(high - low, np.abs(high - previous)), np.abs(low - previous))
+
+
+@registry.register('atr_series', ('true_range',))
+def _atr_series(ctx, true_range):
+    """Wilder-smoothed true range, seeded with the mean of the first atr_period true ranges"""
+    return wilder(true_range, ctx.params['atr_period'])
+
+
+@registry.register('macd_series', ('close',))
+def _macd_series(ctx, close):
+    """Fast EMA - slow EMA of the close, as % of the close so coins are comparable"""
+    fast = ema(close, 2.0 / (ctx.params['macd_fast'] + 1))
+    slow = ema(close, 2.0 / (ctx.params['macd_slow'] + 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (fast - slow) / close * 100
+
+
+@registry.register('macd_signal_series', ('macd_series',))
+def _macd_signal_series(ctx, macd_series):
+    return ema(macd_series, 2.0 / (ctx.params['macd_signal'] + 1))
+
+
+@registry.register('stoch_k_series', ('high', 'low', 'close'))
+def _stoch_k_series(ctx, high, low, close):
+    period = ctx.params['stoch_period']
+    lowest = rolling_min(low, period)
+    highest = rolling_max(high, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = (close - lowest) / (highest - lowest) * 100
+    # A flat window has no range; place the close in the middle
+    return np.where(highest == lowest, 50.0, k)
+
+
+def _bars_needed(ctx, bars: int) -> np.ndarray:
+    """True for rows with at least `bars` candles"""
+    return np.array([s is not None and len(s) >= bars for s in ctx.batch], dtype=bool)
+
+
+@registry.register('bollinger_pct_b', ('close', 'bollinger_mid', 'bollinger_width'), 'Bollinger %B')
+def _bollinger_pct_b(ctx, close, bollinger_mid, bollinger_width):
+    lower = _latest(bollinger_mid) - _latest(bollinger_width)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_b = (_latest(close) - lower) / (2 * _latest(bollinger_width))
+    return np.where(_latest(bollinger_width) > 0, pct_b, np.nan)
+
+
+@registry.register('bollinger_bandwidth', ('bollinger_mid', 'bollinger_width'), 'Bollinger Bandwidth (%)')
+def _bollinger_bandwidth(ctx, bollinger_mid, bollinger_width):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 2 * _latest(bollinger_width) / _latest(bollinger_mid) * 100
+
+
+@registry.register('atr', ('atr_series',), 'Average True Range')
+def _atr(ctx, atr_series):
+    return np.where(_bars_needed(ctx, ctx.params['atr_period']), _latest(atr_series), np.nan)
+
+
+@registry.register('natr', ('atr', 'close'), 'Normalized ATR (%)')
+def _natr(ctx, atr, close):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return atr / _latest(close) * 100
+
+
+@registry.register('macd', ('macd_series',), 'MACD (% of price)')
+def _macd(ctx, macd_series):
+    return np.where(_bars_needed(ctx, ctx.params['macd_slow']), _latest(macd_series), np.nan)
+
+
+@registry.register('macd_signal', ('macd_signal_series',), 'MACD Signal (% of price)')
+def _macd_signal(ctx, macd_signal_series):
+    bars = ctx.params['macd_slow'] + ctx.params['macd_signal'] - 1
+    return np.where(_bars_needed(ctx, bars), _latest(macd_signal_series), np.nan)
+
+
+@registry.register('macd_histogram', ('macd', 'macd_signal'), 'MACD Histogram (% of price)')
+def _macd_histogram(ctx, macd, macd_signal):
+    return macd - macd_signal
+
+
+@registry.register('stoch_k', ('stoch_k_series',), 'Stochastic %K')
+def _stoch_k(ctx, stoch_k_series):
+    return _latest(stoch_k_series)
+
+
+@registry.register('stoch_d', ('stoch_k_series',), 'Stochastic %D')
+def _stoch_d(ctx, stoch_k_series):
+    return _latest(rolling_mean(stoch_k_series, ctx.params['stoch_smooth']))
+
+
+class IndicatorEngine:
+    """Evaluates only the requested indicators, computing each shared intermediate once per batch"""
+
+    def __init__(self, indicator_registry: Optional[IndicatorRegistry] = None,
+                 rsi_calculator: Optional[RSICalculator] = None):
+        """
+        Initialize the engine
+
+        Args:
+            indicator_registry (IndicatorRegistry): Nodes to evaluate (default: the module registry)
+            rsi_calculator (RSICalculator): Calculator used by the 'rsi' node
+                (default: Config.RSI_PERIOD with Config.RSI_SMOOTHING)
+        """
+        self.registry = indicator_registry or registry
+        self.rsi_calculator = rsi_calculator or RSICalculator(period=Config.RSI_PERIOD, smoothing=Config.RSI_SMOOTHING)
+
+    def compute(self, ohlcv_batch: Sequence[Optional[OHLCV]], indicators: Iterable[str],
+                btc_ohlcv: Optional[OHLCV] = None, **params) -> Dict[str, np.ndarray]:
+        """
+        Evaluate indicators for a batch of symbols
+
+        Args:
+            ohlcv_batch: Candle history per symbol (None for missing symbols)
+            indicators: Names of the nodes to return
+            btc_ohlcv (OHLCV): BTC candles, required by BTC-relative nodes
+            **params: Overrides for DEFAULT_PARAMS
+
+        Returns:
+            Dict[str, np.ndarray]: Value of every requested node
+        """
+        indicators = list(indicators)
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown indicator parameters: {sorted(unknown)}")
+
+        context = BatchContext(ohlcv_batch, btc_ohlcv, {**DEFAULT_PARAMS, **params}, self.rsi_calculator)
+        order = self.registry.resolve(indicators)
+
+        values = {}
+        for name in order:
+            node = self.registry.nodes[name]
+            values[name] = node.compute(context, *(values[dependency] for dependency in node.inputs))
+
+        logger.debug("Evaluated %s nodes for %s over %s symbols x %s bars",
+                     len(order), indicators, context.n_symbols, context.n_bars)
+        return {name: values[name] for name in indicators}
@@ -0,0 +1,152 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IndicatorMatrix:
+    """Symbols x indicators values with cross-sectional percentile ranks, built in one pass"""
+
+    __slots__ = ('symbols', 'indicators', 'values', 'ranks', 'descending', '_symbol_index', '_indicator_index')
+
+    def __init__(self, symbols: Sequence[str], indicators: Sequence[str], values: np.ndarray,
+                 descending: Sequence[str] = ()):
+        """
+        Wrap an indicator value matrix and rank every column
+
+        Args:
+            symbols: Row labels
+            indicators: Column labels
+            values (np.ndarray): (n_symbols, n_indicators) values, NaN where missing
+            descending: Indicators where a higher value ranks first
+        """
+        self.symbols = list(symbols)
+        self.indicators = tuple(indicators)
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.symbols), len(self.indicators))
+        self.descending = frozenset(descending)
+        self.ranks = self._percentile_ranks(self.values)
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._indicator_index = {name: j for j, name in enumerate(self.indicators)}
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict], indicators: Sequence[str], descending: Sequence[str] = (),
+                  symbol_key: str = 'symbol') -> 'IndicatorMatrix':
+        """
+        Build from per-coin dicts holding indicator values under the indicator names
+
+        Args:
+            rows: One dict per symbol
+            indicators: Keys to collect as columns; missing or None values become NaN
+            descending: Indicators where a higher value ranks first
+            symbol_key (str): Key holding the row label
+        """
+        values = np.full((len(rows), len(indicators)), np.nan)
+        for i, row in enumerate(rows):
+            for j, name in enumerate(indicators):
+                value = row.get(name)
+                if value is not None:
+                    values[i, j] = value
+        return cls([row.get(symbol_key) for row in rows], indicators, values, descending)
+
+    @staticmethod
+    def _percentile_ranks(values: np.ndarray) -> np.ndarray:
+        """
+        Mid-rank percentile (0-100) of each value within its column, NaN where missing
+
+        A value's rank counts the values below it plus half of its ties, so
+        the result does not depend on the order of the rows.
+        """
+        ranks = np.full(values.shape, np.nan)
+        for j in range(values.shape[1]):
+            column = values[:, j]
+            valid = ~np.isnan(column)
+            n_valid = int(valid.sum())
+            if not n_valid:
+                continue
+            ordered = np.sort(column[valid])
+            below = np.searchsorted(ordered, column[valid], side='left')
+            through = np.searchsorted(ordered, column[valid], side='right')
+            ranks[valid, j] = (below + through) / (2 * n_valid) * 100
+        return ranks
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the value and rank matrices"""
+        return self.values.nbytes + self.ranks.nbytes
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def column(self, indicator: str) -> np.ndarray:
+        """Values of one indicator for every symbol"""
+        return self.values[:, self._indicator_index[indicator]]
+
+    def value(self, symbol: str, indicator: str) -> Optional[float]:
+        """Value of one indicator for one symbol, None if missing"""
+        value = self.values[self._symbol_index[symbol], self._indicator_index[indicator]]
+        return None if np.isnan(value) else float(value)
+
+    def percentile(self, symbol: str, indicator: str) -> Optional[float]:
+        """
+        Cross-sectional percentile of a symbol for an indicator, None if missing
+
+        Oriented so that 100 is always the best rank: for descending indicators
+        the highest value scores highest, otherwise the lowest value does.
+        """
+        j = self._indicator_index[indicator]
+        rank = self.ranks[self._symbol_index[symbol], j]
+        if np.isnan(rank):
+            return None
+        return round(float(rank if indicator in self.descending else 100 - rank), 2)
+
+    def top(self, indicator: str, percentile: float = 95) -> np.ndarray:
+        """
+        Row indexes of the top (100 - percentile)% of symbols, best first
+
+        Matches TechnicalIndicators.get_top_percentile_coins: at least one symbol,
+        ties keep row order. argpartition selects the candidates, so only
+        they are sorted.
+        """
+        column = self.column(indicator)
+        ranked = np.flatnonzero(~np.isnan(column))
+        if not len(ranked):
+            return ranked
+
+        keys = -column[ranked] if indicator in self.descending else column[ranked]
+        top_count = max(1, int(len(ranked) * (100 - percentile) / 100))
+
+        if top_count < len(ranked):
+            candidates = np.argpartition(keys, top_count - 1)[:top_count]
+        else:
+            candidates = np.arange(len(ranked))
+        return ranked[candidates[np.argsort(keys[candidates], kind='stable')]]
+
+    def filter(self, min_percentiles: Dict[str, float]) -> np.ndarray:
+        """
+        Row indexes whose oriented percentile meets every threshold
+
+        Args:
+            min_percentiles: Indicator -> minimum percentile (0-100, 100 = best)
+        """
+        mask = np.ones(len(self.symbols), dtype=bool)
+        for indicator, minimum in min_percentiles.items():
+            j = self._indicator_index[indicator]
+            oriented = self.ranks[:, j] if indicator in self.descending else 100 - self.ranks[:, j]
+            with np.errstate(invalid='ignore'):
+                mask &= oriented >= minimum
+        return np.flatnonzero(mask)
+
+    def to_rows(self, indexes: Optional[Sequence[int]] = None) -> List[Dict]:
+        """Values and oriented percentiles per symbol as dicts, for JSON responses"""
+        indexes = range(len(self.symbols)) if indexes is None else indexes
+        rows = []
+        for i in indexes:
+            symbol = self.symbols[i]
+            rows.append({
+                'symbol': symbol,
+                'values': {name: self.value(symbol, name) for name in self.indicators},
+                'percentiles': {name: self.percentile(symbol, name) for name in self.indicators}
+            })
+        return rows
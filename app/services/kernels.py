@@ -0,0 +1,189 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Largest growth factor allowed inside one block of the recursive filter.
+# Keeps the rescaled cumulative sums well inside float64 precision.
+_MAX_BLOCK_GROWTH = 1e12
+
+
+def recursive_filter(data: np.ndarray, alpha: float, initial=None) -> np.ndarray:
+    """
+    Apply the first-order recursive filter y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+    along the last axis without a Python loop per element.
+
+    The recursion is unrolled into a rescaled cumulative sum. To keep the
+    rescaling factors bounded the series is processed in blocks, so the
+    Python-level loop runs once per block (a few dozen times for 10k bars)
+    and every block is vectorized across all leading axes.
+
+    Args:
+        data (np.ndarray): Input series, 1-D or (n_rows, n_bars)
+        alpha (float): Smoothing factor in (0, 1]
+        initial: Value of y[-1] (scalar or one value per row). Defaults to
+            the first element of each row, which makes y[0] == x[0].
+
+    Returns:
+        np.ndarray: Filtered series with the same shape as data
+    """
+    x = np.asarray(data, dtype=np.float64)
+    if x.shape[-1] == 0:
+        return x.copy()
+
+    if initial is None:
+        y_prev = x[..., 0].copy()
+    else:
+        y_prev = np.broadcast_to(np.asarray(initial, dtype=np.float64), x.shape[:-1]).copy()
+
+    if alpha >= 1.0:
+        return x.copy()
+
+    decay = 1.0 - alpha
+    if decay >= 1.0:
+        return np.broadcast_to(y_prev[..., None], x.shape).copy()
+
+    block = max(1, int(np.log(_MAX_BLOCK_GROWTH) / -np.log(decay)))
+    block = min(block, x.shape[-1])
+
+    # growth[k] = decay ** -(k + 1)
+    growth = decay ** -np.arange(1, block + 1, dtype=np.float64)
+
+    out = np.empty_like(x)
+    for start in range(0, x.shape[-1], block):
+        stop = min(start + block, x.shape[-1])
+        g = growth[:stop - start]
+        acc = np.cumsum(x[..., start:stop] * g, axis=-1)
+        out[..., start:stop] = (y_prev[..., None] + alpha * acc) / g
+        y_prev = out[..., stop - 1]
+
+    return out
+
+
+def prefix_sum(data: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum along the last axis with a leading zero column; NaN counts as 0
+
+    The sum over bars [i, j) is prefix[..., j] - prefix[..., i], so any window
+    is an O(1) difference.
+    """
+    x = np.nan_to_num(np.asarray(data, dtype=np.float64), nan=0.0)
+    out = np.zeros(x.shape[:-1] + (x.shape[-1] + 1,))
+    np.cumsum(x, axis=-1, out=out[..., 1:])
+    return out
+
+
+def rolling_sum(data: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of the last `window` values at every bar along the last axis
+
+    Bars with fewer than `window` values before them sum what is available;
+    NaN counts as 0.
+    """
+    prefix = prefix_sum(data)
+    n = prefix.shape[-1] - 1
+    ends = np.arange(1, n + 1)
+    starts = np.maximum(ends - window, 0)
+    return prefix[..., ends] - prefix[..., starts]
+
+
+def rolling_mean(data: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple moving average of the last `window` values along the last axis
+
+    NaN until a bar has `window` valid values behind it, and wherever the
+    window contains a NaN.
+    """
+    x = np.asarray(data, dtype=np.float64)
+    missing = rolling_sum(np.isnan(x), window)
+    out = rolling_sum(x, window) / window
+    out[..., :window - 1] = np.nan
+    out[missing > 0] = np.nan
+    return out
+
+
+def _rolling_reduce(data: np.ndarray, window: int, reduce, **kwargs) -> np.ndarray:
+    """Apply reduce over strided windows of the last axis; the first window - 1 bars are NaN"""
+    x = np.asarray(data, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if window < 1 or x.shape[-1] < window:
+        return out
+    out[..., window - 1:] = reduce(sliding_window_view(x, window, axis=-1), axis=-1, **kwargs)
+    return out
+
+
+def rolling_max(data: np.ndarray, window: int) -> np.ndarray:
+    """Highest of the last `window` values at every bar; NaN if the window contains a NaN"""
+    return _rolling_reduce(data, window, np.max)
+
+
+def rolling_min(data: np.ndarray, window: int) -> np.ndarray:
+    """Lowest of the last `window` values at every bar; NaN if the window contains a NaN"""
+    return _rolling_reduce(data, window, np.min)
+
+
+def rolling_std(data: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """Standard deviation of the last `window` values at every bar; NaN if the window contains a NaN"""
+    return _rolling_reduce(data, window, np.std, ddof=ddof)
+
+
+def left_align(data: np.ndarray):
+    """
+    Shift every row of a NaN-padded (right-aligned) matrix to start at column 0
+
+    The tail of short rows repeats the last value, so all rows can share one
+    recursion and the padding is never read. Only leading NaN is padding; a
+    NaN after a row's first value stays in place, and recursions carry it on.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Left-aligned rows and the leading NaN count per row
+    """
+    x = np.asarray(data, dtype=np.float64)
+    n_bars = x.shape[-1]
+    valid = ~np.isnan(x)
+    lead = np.where(valid.any(axis=-1), valid.argmax(axis=-1), n_bars)
+    index = np.minimum(np.arange(n_bars) + lead[..., None], n_bars - 1)
+    return np.take_along_axis(x, index, axis=-1), lead
+
+
+def right_align(data: np.ndarray, lead: np.ndarray) -> np.ndarray:
+    """Undo left_align: shift rows back right by `lead` and refill the padding with NaN"""
+    source = np.arange(data.shape[-1]) - lead[..., None]
+    out = np.take_along_axis(data, np.maximum(source, 0), axis=-1)
+    out[source < 0] = np.nan
+    return out
+
+
+def ema(data: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    recursive_filter for NaN-padded, right-aligned rows
+
+    Each row's filter starts at its first value, so padding never leaks NaN
+    into the result; padded bars stay NaN.
+    """
+    x = np.asarray(data, dtype=np.float64)
+    if x.shape[-1] == 0:
+        return x.copy()
+    aligned, lead = left_align(x)
+    return right_align(recursive_filter(aligned, alpha), lead)
+
+
+def wilder(data: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's moving average for NaN-padded, right-aligned rows
+
+    Seeded with the simple mean of each row's first `period` values, then
+    avg = (avg * (period - 1) + x) / period, as in RSICalculator's 'wilder'
+    smoothing. Bars before a row's first `period` values are NaN.
+    """
+    x = np.asarray(data, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < period:
+        return out
+    aligned, lead = left_align(x)
+    seed = aligned[..., :period].mean(axis=-1)
+    out[..., period - 1] = seed
+    out[..., period:] = recursive_filter(aligned[..., period:], 1.0 / period, initial=seed)
+    return right_align(out, lead)
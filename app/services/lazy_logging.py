@@ -0,0 +1,202 @@
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+
+class Lazy:
+    """
+    Log argument computed only if the record is emitted
+
+    Wrap anything expensive to build (a dict dump, a join over all symbols)
+    so disabled or sampled-out calls never pay for it:
+
+        logger.debug("Ticker for %s: %s", symbol, Lazy(lambda: json.dumps(data)))
+    """
+
+    __slots__ = ('compute',)
+
+    def __init__(self, compute: Callable):
+        self.compute = compute
+
+
+class _CallSite:
+    """Counters and rate-cap state of one logging call site"""
+
+    __slots__ = ('calls', 'emitted', 'sampled_out', 'rate_limited', 'seconds',
+                 'tokens', 'refilled_at', 'pending_suppressed')
+
+    def __init__(self, burst: float):
+        self.calls = 0
+        self.emitted = 0
+        self.sampled_out = 0          # skipped by `every`
+        self.rate_limited = 0         # skipped by `per_second`
+        self.seconds = 0.0            # time spent formatting and handling emitted records
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+        self.pending_suppressed = 0   # rate-limited since the last emitted record
+
+    def take_token(self, per_second: float) -> bool:
+        """Token bucket holding up to one second of records"""
+        now = time.monotonic()
+        self.tokens = min(per_second, self.tokens + (now - self.refilled_at) * per_second)
+        self.refilled_at = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class LazyLogger:
+    """
+    logging.Logger facade for hot paths: lazy arguments, per-call-site sampling and rate caps
+
+    A call below the logger's level returns after one level check, before any
+    argument is formatted; pass %-style arguments (not f-strings) and wrap
+    expensive ones in `Lazy`. Enabled calls are counted per call site
+    (file, function and line of the caller), and the time spent formatting and
+    handling their records is accumulated, so logging_stats() shows which
+    lines cost the most.
+
+    Every level method accepts two keyword arguments:
+        every (int): Emit only one of every N calls from this site
+        per_second (float): At most this many records per second from this site;
+            defaults to Config.LOG_MAX_PER_SECOND for DEBUG and INFO and to no
+            cap for WARNING and above. The next emitted record notes how many
+            were suppressed.
+    """
+
+    def __init__(self, name: str, default_per_second: float = 0):
+        """
+        Initialize the facade
+
+        Args:
+            name (str): Name of the wrapped logging.Logger
+            default_per_second (float): Rate cap for DEBUG and INFO call sites, 0 for none
+        """
+        self.name = name
+        self.logger = logging.getLogger(name)
+        self.default_per_second = default_per_second
+        self.sites: Dict[tuple, _CallSite] = {}
+        self.lock = threading.Lock()
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def setLevel(self, level):
+        self.logger.setLevel(level)
+
+    def debug(self, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, every, per_second, kwargs)
+
+    def info(self, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, every, per_second, kwargs)
+
+    def warning(self, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, every, per_second, kwargs)
+
+    def error(self, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, every, per_second, kwargs)
+
+    def exception(self, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(logging.ERROR):
+            kwargs.setdefault('exc_info', True)
+            self._log(logging.ERROR, msg, args, every, per_second, kwargs)
+
+    def critical(self, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self._log(logging.CRITICAL, msg, args, every, per_second, kwargs)
+
+    def log(self, level: int, msg, *args, every: int = 1, per_second: Optional[float] = None, **kwargs):
+        if self.logger.isEnabledFor(level):
+            self._log(level, msg, args, every, per_second, kwargs)
+
+    def _log(self, level: int, msg, args: tuple, every: int, per_second: Optional[float], kwargs: Dict):
+        """Apply the call site's sampling and rate cap, then format and emit"""
+        # Two frames up: the caller of debug()/info()/...
+        frame = sys._getframe(2)
+        key = (frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno)
+        if per_second is None:
+            per_second = self.default_per_second if level < logging.WARNING else 0
+
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = _CallSite(per_second)
+            site.calls += 1
+            if every > 1 and (site.calls - 1) % every:
+                site.sampled_out += 1
+                return
+            if per_second > 0 and not site.take_token(per_second):
+                site.rate_limited += 1
+                site.pending_suppressed += 1
+                return
+            suppressed, site.pending_suppressed = site.pending_suppressed, 0
+
+        started = time.perf_counter()
+        if args:
+            args = tuple(arg.compute() if isinstance(arg, Lazy) else arg for arg in args)
+        if suppressed:
+            msg = f"{msg} [{suppressed} similar suppressed]"
+        kwargs.setdefault('stacklevel', 3)
+        self.logger.log(level, msg, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        with self.lock:
+            site.emitted += 1
+            site.seconds += elapsed
+
+    def stats(self) -> List[Dict]:
+        """Counters per call site of this logger"""
+        with self.lock:
+            return [
+                {
+                    'site': f"{self.name}:{function}:{line}",
+                    'calls': site.calls,
+                    'emitted': site.emitted,
+                    'sampled_out': site.sampled_out,
+                    'rate_limited': site.rate_limited,
+                    'seconds': round(site.seconds, 6)
+                }
+                for (_, function, line), site in self.sites.items()
+            ]
+
+    def reset_stats(self):
+        with self.lock:
+            self.sites.clear()
+
+
+_loggers: Dict[str, LazyLogger] = {}
+_loggers_lock = threading.Lock()
+
+
+def get_logger(name: str) -> LazyLogger:
+    """Process-wide LazyLogger for a module, drop-in for logging.getLogger(__name__)"""
+    with _loggers_lock:
+        if name not in _loggers:
+            _loggers[name] = LazyLogger(name, default_per_second=Config.LOG_MAX_PER_SECOND)
+        return _loggers[name]
+
+
+def logging_stats(limit: Optional[int] = None) -> List[Dict]:
+    """Call-site counters across every LazyLogger, most time spent first"""
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+    sites = [site for logger in loggers for site in logger.stats()]
+    sites.sort(key=lambda site: site['seconds'], reverse=True)
+    return sites[:limit] if limit is not None else sites
+
+
+def reset_logging_stats():
+    """Clear the call-site counters of every LazyLogger"""
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+    for logger in loggers:
+        logger.reset_stats()
@@ -0,0 +1,149 @@
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import Config
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MarketCache:
+    """
+    load_markets() result shared by every exchange instance and persisted to disk
+
+    New instances are hydrated with set_markets() from the in-memory copy, or
+    from the gzipped JSON snapshot on a cold start, so they never download
+    exchangeInfo themselves. A snapshot older than the TTL is still served
+    while one background thread downloads a fresh one. The raw exchange
+    payload ('info') of each market is dropped to keep the snapshot compact.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 3600):
+        """
+        Initialize an empty cache
+
+        Args:
+            path (str): Snapshot file (gzipped JSON)
+            ttl_seconds (float): Age after which the snapshot is refreshed in the background
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.markets = None
+        self.currencies = None
+        self.fetched_at = 0.0
+        self.disk_checked = False
+        self.refreshing = False
+        self.lock = threading.Lock()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was downloaded"""
+        return time.time() - self.fetched_at
+
+    def _read_disk(self):
+        """Load the snapshot file once, if it exists and parses"""
+        self.disk_checked = True
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.markets = snapshot['markets']
+            self.currencies = snapshot.get('currencies')
+            self.fetched_at = snapshot['fetched_at']
+            logger.info("Loaded %s markets from %s (%.0f min old)", len(self.markets), self.path, self.age / 60)
+        except FileNotFoundError:
+            logger.info("No market snapshot at %s", self.path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable market snapshot %s: %s", self.path, e)
+
+    def _write_disk(self):
+        """Write the snapshot atomically, so readers never see a partial file"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'fetched_at': self.fetched_at, 'markets': self.markets, 'currencies': self.currencies},
+                          f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to write market snapshot %s: %s", self.path, e)
+
+    def _store(self, markets: Dict, currencies: Optional[Dict]):
+        compact = {symbol: {key: value for key, value in market.items() if key != 'info'}
+                   for symbol, market in markets.items()}
+        with self.lock:
+            self.markets = compact
+            self.currencies = currencies
+            self.fetched_at = time.time()
+            self._write_disk()
+        logger.info("Cached %s markets to %s", len(compact), self.path)
+
+    def _download(self, exchange) -> Dict:
+        markets = exchange.load_markets(reload=True)
+        self._store(markets, exchange.currencies or None)
+        return markets
+
+    def _refresh_in_background(self, factory: Callable):
+        """Download a fresh snapshot on a daemon thread with its own exchange instance"""
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+
+        def refresh():
+            try:
+                self._download(factory())
+            except Exception as e:
+                logger.warning("Background market refresh failed: %s", e)
+            finally:
+                with self.lock:
+                    self.refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def hydrate(self, exchange, factory: Optional[Callable] = None) -> bool:
+        """
+        Give an exchange instance the cached markets without a download
+
+        Args:
+            exchange: ccxt exchange (sync or async) to hydrate
+            factory (Callable): Builds a synchronous exchange for the background
+                refresh when the snapshot is stale; without it no refresh starts
+
+        Returns:
+            bool: False if there is no snapshot yet
+        """
+        with self.lock:
+            if self.markets is None and not self.disk_checked:
+                self._read_disk()
+            markets, currencies = self.markets, self.currencies
+        if markets is None:
+            return False
+
+        exchange.set_markets(markets, currencies)
+        if factory is not None and self.age > self.ttl_seconds:
+            self._refresh_in_background(factory)
+        return True
+
+    def load(self, exchange, factory: Optional[Callable] = None) -> Dict:
+        """hydrate(), downloading with the exchange itself when there is no snapshot yet"""
+        if not self.hydrate(exchange, factory):
+            self._download(exchange)
+        return exchange.markets
+
+    def stats(self) -> Dict:
+        """Cache statistics"""
+        with self.lock:
+            return {
+                'path': self.path,
+                'markets': len(self.markets) if self.markets is not None else 0,
+                'age_seconds': round(self.age) if self.markets is not None else None,
+                'ttl_seconds': self.ttl_seconds,
+                'refreshing': self.refreshing
+            }
+
+
+# Process-wide snapshot shared by every BinanceService and OHLCV fetcher
+market_cache = MarketCache(Config.MARKET_CACHE_PATH, ttl_seconds=Config.MARKET_CACHE_TTL_MINUTES * 60)
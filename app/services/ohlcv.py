@@ -0,0 +1,153 @@
+import numpy as np
+from typing import List, Optional, Sequence
+
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+class OHLCV:
+    """Columnar OHLCV series backed by contiguous NumPy arrays"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, timestamp, open, high, low, close, volume, dtype=np.float64):
+        """
+        Wrap OHLCV columns without copying when they already have the right dtype
+
+        Args:
+            timestamp: Candle open times in milliseconds (int64)
+            open, high, low, close, volume: Price and volume columns
+            dtype: Float dtype of the price/volume columns (float64 or float32)
+        """
+        self.timestamp = np.ascontiguousarray(timestamp, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=dtype)
+        self.high = np.ascontiguousarray(high, dtype=dtype)
+        self.low = np.ascontiguousarray(low, dtype=dtype)
+        self.close = np.ascontiguousarray(close, dtype=dtype)
+        self.volume = np.ascontiguousarray(volume, dtype=dtype)
+
+    @classmethod
+    def from_ccxt(cls, rows: Sequence[Sequence], dtype=np.float64) -> 'OHLCV':
+        """
+        Build from ccxt's [[timestamp, open, high, low, close, volume], ...] in one conversion
+
+        Args:
+            rows: ccxt OHLCV rows
+            dtype: Float dtype of the price/volume columns
+
+        Returns:
+            OHLCV: Columnar series
+        """
+        if not len(rows):
+            return cls.empty(dtype)
+
+        data = np.asarray([row[:6] for row in rows], dtype=np.float64)
+        return cls(data[:, 0], data[:, 1], data[:, 2], data[:, 3], data[:, 4], data[:, 5], dtype=dtype)
+
+    @classmethod
+    def empty(cls, dtype=np.float64) -> 'OHLCV':
+        """Series with no candles"""
+        return cls(*(np.empty(0) for _ in FIELDS), dtype=dtype)
+
+    @classmethod
+    def coerce(cls, data, dtype=np.float64) -> 'OHLCV':
+        """Return data unchanged if it is an OHLCV, otherwise convert ccxt rows"""
+        if isinstance(data, cls):
+            return data
+        return cls.from_ccxt(data or [], dtype=dtype)
+
+    @classmethod
+    def concat(cls, series: Sequence['OHLCV']) -> 'OHLCV':
+        """Concatenate series in order"""
+        series = [s for s in series if len(s)]
+        if not series:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(s, field) for s in series]) for field in FIELDS),
+                   dtype=series[0].close.dtype)
+
+    @staticmethod
+    def stack(series: Sequence[Optional['OHLCV']], field: str = 'close', n_bars: Optional[int] = None) -> np.ndarray:
+        """
+        Stack one column of many series into a right-aligned, NaN-padded matrix
+
+        Args:
+            series: One OHLCV (or None) per symbol
+            field (str): Column name, e.g. 'close' or 'volume'
+            n_bars (int): Matrix width; defaults to the longest series
+
+        Returns:
+            np.ndarray: (n_symbols, n_bars) float64 matrix
+        """
+        if n_bars is None:
+            n_bars = max((len(s) for s in series if s is not None), default=0)
+
+        matrix = np.full((len(series), n_bars), np.nan)
+        for row, s in enumerate(series):
+            if s is None or not len(s) or n_bars == 0:
+                continue
+            values = getattr(s, field)[-n_bars:]
+            matrix[row, n_bars - len(values):] = values
+        return matrix
+
+    @staticmethod
+    def align(series: Sequence[Optional['OHLCV']], timestamps: np.ndarray, field: str = 'close') -> np.ndarray:
+        """
+        Place one column of many series on a shared time axis
+
+        Args:
+            series: One OHLCV (or None) per symbol
+            timestamps (np.ndarray): Sorted candle open times of the shared axis
+            field (str): Column name, e.g. 'close'
+
+        Returns:
+            np.ndarray: (n_symbols, len(timestamps)) float64 matrix, NaN where a
+                series has no candle at that time
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        matrix = np.full((len(series), len(timestamps)), np.nan)
+        if not len(timestamps):
+            return matrix
+
+        for row, s in enumerate(series):
+            if s is None or not len(s):
+                continue
+            index = np.searchsorted(s.timestamp, timestamps)
+            clipped = np.minimum(index, len(s) - 1)
+            found = s.timestamp[clipped] == timestamps
+            matrix[row, found] = getattr(s, field)[clipped[found]]
+        return matrix
+
+    @property
+    def dtype(self):
+        return self.close.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays"""
+        return sum(getattr(self, field).nbytes for field in FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index) -> 'OHLCV':
+        """Slice all columns; basic slices are views, so no data is copied"""
+        if not isinstance(index, slice):
+            raise TypeError("OHLCV supports slice indexing only; use the column arrays for single values")
+        return OHLCV(*(getattr(self, field)[index] for field in FIELDS), dtype=self.dtype)
+
+    def __repr__(self) -> str:
+        return f"OHLCV({len(self)} candles, dtype={self.dtype})"
+
+    def tail(self, n: int) -> 'OHLCV':
+        """Last n candles (view)"""
+        return self[-n:] if n > 0 else self[0:0]
+
+    def to_list(self) -> List[List]:
+        """Convert back to ccxt's list-of-lists format"""
+        return [
+            [int(ts), float(o), float(h), float(l), float(c), float(v)]
+            for ts, o, h, l, c, v in zip(self.timestamp, self.open, self.high, self.low, self.close, self.volume)
+        ]
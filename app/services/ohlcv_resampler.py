@@ -0,0 +1,106 @@
+import ccxt
+import numpy as np
+from typing import Dict, Iterable
+
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+
+logger = get_logger(__name__)
+
+# Binance weekly candles open on Monday 00:00 UTC; the epoch was a Thursday
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+class OHLCVResampler:
+    """Build higher-timeframe OHLCV from one base-timeframe series"""
+
+    def __init__(self, base_timeframe: str = '1m'):
+        """
+        Initialize the resampler
+
+        Args:
+            base_timeframe (str): Timeframe of the source candles (default: '1m')
+        """
+        self.base_timeframe = base_timeframe
+        self.base_ms = self.timeframe_to_ms(base_timeframe)
+        logger.info("OHLCV resampler initialized with base timeframe %s", base_timeframe)
+
+    @staticmethod
+    def timeframe_to_ms(timeframe: str) -> int:
+        """Timeframe string ('5m', '4h', '1d', ...) to milliseconds"""
+        if timeframe.endswith('M'):
+            raise ValueError("Monthly candles have no fixed length and cannot be resampled")
+        try:
+            timeframe_ms = int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+        except (ValueError, ccxt.NotSupported):
+            raise ValueError(f"Unknown timeframe {timeframe!r}")
+        if timeframe_ms <= 0:
+            raise ValueError(f"Unknown timeframe {timeframe!r}")
+        return timeframe_ms
+
+    @staticmethod
+    def bucket_start(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+        """Open time of the exchange candle each timestamp falls into (UTC aligned)"""
+        timeframe_ms = OHLCVResampler.timeframe_to_ms(timeframe)
+        offset = WEEK_OFFSET_MS if timeframe.endswith('w') else 0
+        return (timestamps - offset) // timeframe_ms * timeframe_ms + offset
+
+    def resample(self, ohlcv, timeframe: str, drop_incomplete_first: bool = True) -> OHLCV:
+        """
+        Aggregate base candles into `timeframe` candles
+
+        Args:
+            ohlcv: Base-timeframe OHLCV series (or ccxt rows) sorted by open time
+            timeframe (str): Target timeframe, a multiple of the base timeframe
+            drop_incomplete_first (bool): Drop the first bucket when the base series
+                starts in the middle of it (its open/high/low would be wrong)
+
+        Returns:
+            OHLCV: Resampled series. The last candle is the in-progress one when
+                the base series ends inside a bucket, like fetch_ohlcv.
+        """
+        timeframe_ms = self.timeframe_to_ms(timeframe)
+        if timeframe_ms % self.base_ms != 0:
+            raise ValueError(f"Cannot resample {self.base_timeframe} candles into {timeframe}")
+
+        ohlcv = OHLCV.coerce(ohlcv)
+        if timeframe_ms == self.base_ms or not len(ohlcv):
+            return ohlcv
+
+        buckets = self.bucket_start(ohlcv.timestamp, timeframe)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(ohlcv)] - 1
+
+        resampled = OHLCV(
+            buckets[starts],
+            ohlcv.open[starts],
+            np.maximum.reduceat(ohlcv.high, starts),
+            np.minimum.reduceat(ohlcv.low, starts),
+            ohlcv.close[ends],
+            np.add.reduceat(ohlcv.volume, starts),
+            dtype=ohlcv.dtype
+        )
+
+        if drop_incomplete_first and ohlcv.timestamp[0] != buckets[0]:
+            return resampled[1:]
+        return resampled
+
+    def resample_many(self, ohlcv, timeframes: Iterable[str]) -> Dict[str, OHLCV]:
+        """Resample one base series into several timeframes"""
+        ohlcv = OHLCV.coerce(ohlcv)
+        return {timeframe: self.resample(ohlcv, timeframe) for timeframe in timeframes}
+
+    def validate(self, timeframes: Iterable[str]):
+        """Raise ValueError unless every timeframe parses and is a multiple of the base timeframe"""
+        timeframes = list(timeframes)
+        if not timeframes:
+            raise ValueError("No timeframes given")
+        for timeframe in timeframes:
+            if self.timeframe_to_ms(timeframe) % self.base_ms != 0:
+                raise ValueError(f"Cannot resample {self.base_timeframe} candles into {timeframe}")
+
+    def base_candles_needed(self, timeframes: Iterable[str], limit: int) -> int:
+        """Number of base candles required to produce `limit` candles on every timeframe"""
+        longest = max(self.timeframe_to_ms(timeframe) for timeframe in timeframes)
+        # One extra bucket covers a partial first bucket that gets dropped
+        return (limit + 1) * longest // self.base_ms
@@ -0,0 +1,188 @@
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import ccxt
+
+from app.services.historical_data_service import HistoricalDataService
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+
+logger = get_logger(__name__)
+
+
+class OHLCVSync:
+    """
+    Local candle storage kept current by downloading only candles newer than what is stored
+
+    The open time of the newest stored candle is remembered per
+    (symbol, timeframe), seeded from the database on first use. A sync asks
+    the exchange for candles from that open time on (`since`), so the stored
+    candle that may have been in progress is refreshed along with the new
+    ones; in steady state that is one or two candles per symbol. Symbols never
+    stored, stored too long ago for `limit` candles to close the gap, or with
+    fewer stored candles than the `limit` window needs (e.g. synced before with
+    a smaller limit) get the latest `limit` candles instead. Callers get the
+    window from storage.
+    """
+
+    def __init__(self, db_path: str = "historical_data.db"):
+        """
+        Initialize the sync layer
+
+        Args:
+            db_path (str): Database holding the ohlcv table; opened on first use
+        """
+        self.db_path = db_path
+        self._storage = None
+        self.last_open: Dict[Tuple[str, str], int] = {}
+        # Oldest open time from which candles are known to be stored without gaps
+        # up to the last open time (0 when stored back to the listing)
+        self.covered_from: Dict[Tuple[str, str], int] = {}
+        self.lock = threading.Lock()
+        self.incremental_fetches = 0
+        self.full_fetches = 0
+        self.candles_fetched = 0
+
+    @property
+    def storage(self) -> HistoricalDataService:
+        with self.lock:
+            if self._storage is None:
+                self._storage = HistoricalDataService(self.db_path)
+            return self._storage
+
+    @staticmethod
+    def storage_symbol(symbol: str) -> str:
+        """Stored candles are keyed by exchange market id ('BTC/USDT' -> 'BTCUSDT')"""
+        return symbol.replace('/', '')
+
+    def _last_open(self, symbols: Sequence[str], timeframe: str) -> Dict[str, int]:
+        """Newest stored open time per symbol, from memory or else the database"""
+        with self.lock:
+            known = {symbol: self.last_open[(symbol, timeframe)] for symbol in symbols
+                     if (symbol, timeframe) in self.last_open}
+
+        missing = [symbol for symbol in symbols if symbol not in known]
+        if missing:
+            stored = self.storage.get_last_ohlcv_timestamps(timeframe, [self.storage_symbol(s) for s in missing])
+            found = {symbol: stored[self.storage_symbol(symbol)] for symbol in missing
+                     if self.storage_symbol(symbol) in stored}
+            with self.lock:
+                self.last_open.update({(symbol, timeframe): open_time for symbol, open_time in found.items()})
+            known.update(found)
+        return known
+
+    def _complete(self, last_open: Dict[str, int], timeframe: str, limit: int, now_ms: int) -> Dict[str, int]:
+        """The symbols of last_open whose stored candles fill the `limit` window up to their last open time"""
+        timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        start = (now_ms // timeframe_ms - (limit - 1)) * timeframe_ms
+        needed = {symbol: (open_time - start) // timeframe_ms + 1 for symbol, open_time in last_open.items()}
+
+        with self.lock:
+            unknown = [symbol for symbol in last_open if self.covered_from.get((symbol, timeframe), now_ms) > start]
+        if not unknown:
+            return last_open
+
+        stored = self.storage.count_ohlcv(timeframe, start, [self.storage_symbol(s) for s in unknown])
+        complete = set(last_open) - set(unknown)
+        with self.lock:
+            for symbol in unknown:
+                if stored.get(self.storage_symbol(symbol), 0) >= needed[symbol]:
+                    self.covered_from[(symbol, timeframe)] = start
+                    complete.add(symbol)
+        return {symbol: open_time for symbol, open_time in last_open.items() if symbol in complete}
+
+    def _plan(self, symbols: Sequence[str], timeframe: str, limit: int) -> Dict[str, int]:
+        """`since` for every symbol whose window only lacks the newest candles; the rest fetch a full window"""
+        timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        now_ms = int(time.time() * 1000)
+        recent = {symbol: open_time for symbol, open_time in self._last_open(symbols, timeframe).items()
+                  if now_ms - open_time < (limit - 1) * timeframe_ms}
+        since = self._complete(recent, timeframe, limit, now_ms)
+        with self.lock:
+            self.incremental_fetches += len(since)
+            self.full_fetches += len(symbols) - len(since)
+        return since
+
+    def _merge(self, symbol: str, timeframe: str, ohlcv: Optional[OHLCV], limit: Optional[int] = None):
+        """Store fetched candles and advance the symbol's last open time
+
+        A full fetch (`limit` given) is gap-free from its first candle, or from
+        the listing when the exchange had fewer than `limit`; an incremental one
+        starts at the last stored candle and so extends the gap-free run.
+        """
+        if not ohlcv:
+            return
+        self.storage.store_ohlcv(self.storage_symbol(symbol), timeframe, ohlcv)
+        timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        with self.lock:
+            key = (symbol, timeframe)
+            previous = self.last_open.get(key)
+            self.last_open[key] = max(previous or 0, int(ohlcv.timestamp[-1]))
+            if limit is not None:
+                first = 0 if len(ohlcv) < limit else int(ohlcv.timestamp[0])
+                # Older coverage only carries over when the new window reaches it
+                touches = key in self.covered_from and previous is not None and previous >= first - timeframe_ms
+                self.covered_from[key] = min(self.covered_from[key], first) if touches else first
+            self.candles_fetched += len(ohlcv)
+
+    def _window(self, symbol: str, timeframe: str, limit: int) -> Optional[OHLCV]:
+        ohlcv = self.storage.get_ohlcv(self.storage_symbol(symbol), timeframe, limit=limit)
+        return ohlcv if len(ohlcv) else None
+
+    def sync(self, service, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[OHLCV]:
+        """
+        Bring one symbol's stored candles up to date and return its latest `limit`
+
+        Args:
+            service (BinanceService): Service whose exchange client downloads the candles
+
+        Returns:
+            Optional[OHLCV]: Stored window (stale if the download failed), None if nothing is stored
+        """
+        since = self._plan([symbol], timeframe, limit).get(symbol)
+        try:
+            # get_ohlcv_history pages past the per-request maximum
+            ohlcv = service.get_ohlcv_history(symbol, timeframe, limit=limit, since=since)
+            self._merge(symbol, timeframe, ohlcv, limit if since is None else None)
+        except Exception as e:
+            logger.warning("Failed to sync OHLCV for %s, serving stored candles: %s", symbol, e)
+        return self._window(symbol, timeframe, limit)
+
+    def sync_many(self, service, symbols: Sequence[str], timeframe: str = '1h',
+                  limit: int = 100) -> Dict[str, OHLCV]:
+        """
+        sync() for many symbols, downloading concurrently through the service's async fetcher
+
+        Returns:
+            Dict[str, OHLCV]: Stored window per symbol that has candles, in the order of `symbols`
+        """
+        symbols = list(symbols)
+        since = self._plan(symbols, timeframe, limit)
+        fetched = service.ohlcv_fetcher.fetch(symbols, timeframe, limit, since=since)
+        for symbol, ohlcv in fetched.items():
+            self._merge(symbol, timeframe, ohlcv, None if symbol in since else limit)
+
+        failed = len(symbols) - len(fetched)
+        if failed:
+            logger.warning("OHLCV download failed for %s of %s symbols; their stored candles may be stale",
+                           failed, len(symbols))
+
+        logger.info("Synced %s OHLCV for %s of %s symbols (%s incremental, %s candles downloaded)",
+                    timeframe, len(fetched), len(symbols), len(since), sum(len(o) for o in fetched.values()))
+        windows = {symbol: self._window(symbol, timeframe, limit) for symbol in symbols}
+        return {symbol: ohlcv for symbol, ohlcv in windows.items() if ohlcv is not None}
+
+    def stats(self) -> Dict:
+        """Sync statistics"""
+        with self.lock:
+            return {
+                'tracked_series': len(self.last_open),
+                'incremental_fetches': self.incremental_fetches,
+                'full_fetches': self.full_fetches,
+                'candles_fetched': self.candles_fetched
+            }
+
+
+# Process-wide sync state; routes create new BinanceService objects per request
+ohlcv_sync = OHLCVSync()
@@ -0,0 +1,242 @@
+import multiprocessing
+import numpy as np
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.indicator_engine import IndicatorEngine
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import FIELDS, OHLCV
+from app.services.rsi_calculator import RSICalculator
+
+logger = get_logger(__name__)
+
+# Price/volume columns packed after the timestamps in a shared block
+_FLOAT_FIELDS = FIELDS[1:]
+
+
+class SharedCandleBatch:
+    """
+    Many OHLCV series packed into one shared memory block
+
+    Layout: int64 offsets (n_series + 1), int64 timestamps (total), then one
+    float64 row per price/volume column (total each). Workers attach by name
+    and get zero-copy OHLCV views, so candles are never pickled.
+    """
+
+    def __init__(self, series: Sequence[Optional[OHLCV]]):
+        lengths = [len(s) if s is not None else 0 for s in series]
+        self.n_series = len(series)
+        self.total = int(sum(lengths))
+        offsets = np.zeros(self.n_series + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        size = max(8 * (self.n_series + 1 + self.total * len(FIELDS)), 1)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+
+        view_offsets, timestamps, values = self.views(self.shm.buf, self.n_series, self.total)
+        view_offsets[:] = offsets
+        for s, start, stop in zip(series, offsets[:-1], offsets[1:]):
+            if stop > start:
+                timestamps[start:stop] = s.timestamp
+                for row, field in enumerate(_FLOAT_FIELDS):
+                    values[row, start:stop] = getattr(s, field)
+        del view_offsets, timestamps, values
+
+    @property
+    def spec(self) -> Tuple[str, int, int]:
+        """What a worker needs to attach: (name, n_series, total)"""
+        return self.shm.name, self.n_series, self.total
+
+    @staticmethod
+    def views(buffer, n_series: int, total: int):
+        """Offset, timestamp and value arrays over a shared buffer"""
+        offsets = np.ndarray((n_series + 1,), dtype=np.int64, buffer=buffer)
+        timestamps = np.ndarray((total,), dtype=np.int64, buffer=buffer, offset=8 * (n_series + 1))
+        values = np.ndarray((len(_FLOAT_FIELDS), total), dtype=np.float64, buffer=buffer,
+                            offset=8 * (n_series + 1 + total))
+        return offsets, timestamps, values
+
+    @staticmethod
+    def series(buffer, n_series: int, total: int, start: int, stop: int) -> List[OHLCV]:
+        """Zero-copy OHLCV views of series [start, stop)"""
+        offsets, timestamps, values = SharedCandleBatch.views(buffer, n_series, total)
+        return [OHLCV(timestamps[a:b], *values[:, a:b]) for a, b in zip(offsets[start:stop], offsets[start + 1:stop + 1])]
+
+    def close(self):
+        """Release and remove the block"""
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _run_shard(spec: Tuple[str, int, int], start: int, stop: int, task: Callable, args: Tuple) -> Dict[str, np.ndarray]:
+    """Worker entry point: attach to the shared block, run task on series [start, stop)"""
+    name, n_series, total = spec
+    # Pool workers share the parent's resource tracker, which unlinks the block
+    # only when the parent calls SharedCandleBatch.close()
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        result = task(SharedCandleBatch.series(shm.buf, n_series, total, start, stop), *args)
+        # Copy out before the views into the block go away
+        return {key: np.array(value, copy=True) for key, value in result.items()}
+    finally:
+        shm.close()
+
+
+def engine_task(shard: List[OHLCV], selected: Sequence[str], params: Dict, rsi_period: int,
+                smoothing: str, btc_index: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Evaluate indicator engine nodes for one shard; the BTC series, if any, is the last one"""
+    btc_ohlcv = shard.pop() if btc_index is not None else None
+    engine = IndicatorEngine(rsi_calculator=RSICalculator(period=rsi_period, smoothing=smoothing))
+    return engine.compute(shard, selected, btc_ohlcv=btc_ohlcv, **params)
+
+
+def rsi_analysis_task(shard: List[OHLCV], rsi_period: int, smoothing: str) -> Dict[str, np.ndarray]:
+    """RSICalculator.analyze_market_data_batch for one shard"""
+    calculator = RSICalculator(period=rsi_period, smoothing=smoothing)
+    return calculator.analyze_market_data_batch(OHLCV.stack(shard, 'close'), OHLCV.stack(shard, 'volume'))
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    """
+    Start method for pool workers
+
+    The pool is created from a request thread while WebSocket, event loop and
+    market refresh threads run; a forked child could inherit one of their locks
+    (e.g. a logging lock) held and deadlock, so workers start from a clean
+    forkserver (or spawn where forkserver is unavailable).
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # Workers fork from a server that has already imported the indicator code
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process-wide executor, recreated only when the worker count changes"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+            _pool_workers = workers
+            logger.info("Started indicator process pool with %s workers", workers)
+        return _pool
+
+
+def discard_process_pool(pool: ProcessPoolExecutor):
+    """Drop a hung or broken pool so the next batch starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ParallelIndicatorEngine(IndicatorEngine):
+    """IndicatorEngine that shards large symbol batches across a process pool"""
+
+    def __init__(self, workers: int = 1, min_symbols: int = 200, rsi_calculator: Optional[RSICalculator] = None,
+                 timeout: float = 30.0):
+        """
+        Initialize the engine
+
+        Args:
+            workers (int): Worker processes; 1 runs in-process, 0 uses every core
+            min_symbols (int): Smaller batches run in-process, where pool overhead would dominate
+            rsi_calculator (RSICalculator): Calculator whose period/smoothing the workers use
+            timeout (float): Seconds a sharded batch may take before it is rerun in-process
+        """
+        super().__init__(rsi_calculator=rsi_calculator)
+        self.workers = workers or os.cpu_count() or 1
+        self.min_symbols = min_symbols
+        self.timeout = timeout
+
+    def _parallel(self, n_symbols: int) -> bool:
+        return self.workers > 1 and n_symbols >= self.min_symbols
+
+    def run_sharded(self, ohlcv_batch: Sequence[Optional[OHLCV]], task: Callable, args: Tuple = (),
+                    extra: Optional[OHLCV] = None) -> Dict[str, np.ndarray]:
+        """
+        Run task over contiguous shards of the batch in the pool and merge the results
+
+        Args:
+            ohlcv_batch: Candle history per symbol
+            task: Picklable function task(shard, *args) returning per-symbol arrays
+            args: Extra task arguments
+            extra (OHLCV): Series appended to every shard (e.g. BTC candles)
+
+        Returns:
+            Dict[str, np.ndarray]: Task outputs concatenated along the symbol axis, in batch order.
+                If the pool does not answer within `timeout` seconds or breaks, the
+                shards are run in-process instead.
+        """
+        n_symbols = len(ohlcv_batch)
+        bounds = np.linspace(0, n_symbols, min(self.workers, n_symbols) + 1).astype(int)
+        shards = [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+        # Every shard reads its own copy of `extra`, placed after its last symbol
+        series, layout = [], []
+        for a, b in shards:
+            start = len(series)
+            series.extend(ohlcv_batch[a:b])
+            if extra is not None:
+                series.append(extra)
+            layout.append((start, len(series)))
+
+        block = SharedCandleBatch(series)
+        pool = get_process_pool(self.workers)
+        try:
+            deadline = time.monotonic() + self.timeout
+            futures = [pool.submit(_run_shard, block.spec, start, stop, task, args) for start, stop in layout]
+            results = [future.result(timeout=max(deadline - time.monotonic(), 0)) for future in futures]
+        except (FutureTimeoutError, BrokenProcessPool) as e:
+            logger.error("Indicator pool failed on %s (%s), running %s shards in-process",
+                         task.__name__, type(e).__name__, len(layout))
+            discard_process_pool(pool)
+            results = [task(list(series[start:stop]), *args) for start, stop in layout]
+        finally:
+            block.close()
+
+        logger.debug("Ran %s over %s symbols in %s shards", task.__name__, n_symbols, len(shards))
+        return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+    def compute(self, ohlcv_batch: Sequence[Optional[OHLCV]], indicators, btc_ohlcv: Optional[OHLCV] = None,
+                **params) -> Dict[str, np.ndarray]:
+        """Same as IndicatorEngine.compute; large batches are sharded across the pool"""
+        indicators = list(indicators)
+        if not self._parallel(len(ohlcv_batch)):
+            return super().compute(ohlcv_batch, indicators, btc_ohlcv=btc_ohlcv, **params)
+
+        # Pin the close panel to the newest candle of the whole batch so shards agree
+        if params.get('panel_end') is None:
+            ends = [int(o.timestamp[-1]) for o in ohlcv_batch if o is not None and len(o)]
+            params['panel_end'] = max(ends) if ends else None
+
+        btc_index = -1 if btc_ohlcv is not None else None
+        return self.run_sharded(
+            ohlcv_batch, engine_task,
+            (indicators, params, self.rsi_calculator.period, self.rsi_calculator.smoothing, btc_index),
+            extra=btc_ohlcv
+        )
+
+    def analyze_market_data_batch(self, ohlcv_batch: Sequence[Optional[OHLCV]]) -> Dict[str, np.ndarray]:
+        """RSICalculator.analyze_market_data_batch over the batch's closes and volumes, sharded when large"""
+        if not self._parallel(len(ohlcv_batch)):
+            return self.rsi_calculator.analyze_market_data_batch(
+                OHLCV.stack(ohlcv_batch, 'close'), OHLCV.stack(ohlcv_batch, 'volume')
+            )
+        return self.run_sharded(ohlcv_batch, rsi_analysis_task,
+                                (self.rsi_calculator.period, self.rsi_calculator.smoothing))
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+from config import Config
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+# ccxt expresses Binance endpoint costs in units of its 50 ms rateLimit;
+# one unit is 5 request weight (klines: cost 0.4 = weight 2)
+CCXT_COST_TO_WEIGHT = 5
+
+# Weight the exchange reports as used in the current minute, and the back-off after a 429/418
+USED_WEIGHT_HEADER = 'x-mbx-used-weight-1m'
+RETRY_AFTER_HEADER = 'retry-after'
+
+# ticker/24hr with a `symbols` list: (max symbols, weight) tiers
+TICKER_SYMBOLS_WEIGHT = ((20, 2), (100, 40))
+TICKER_ALL_WEIGHT = 80
+
+
+def _header(headers, name: str) -> Optional[str]:
+    """Case-insensitive header lookup over any mapping"""
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def ticker_weight(n_symbols: Optional[int]) -> int:
+    """Weight of one ticker/24hr request for n symbols, or for every symbol when None"""
+    if n_symbols is None:
+        return TICKER_ALL_WEIGHT
+    for max_symbols, weight in TICKER_SYMBOLS_WEIGHT:
+        if n_symbols <= max_symbols:
+            return weight
+    return TICKER_ALL_WEIGHT
+
+
+def request_weight(path: str, params: Dict, ccxt_cost: float) -> float:
+    """
+    Binance request weight of one REST call
+
+    ccxt's endpoint costs cover most endpoints; ticker/24hr with a `symbols`
+    list is tiered by list length, which ccxt prices as a full snapshot.
+    """
+    if path == 'ticker/24hr' and 'symbols' in params:
+        try:
+            return ticker_weight(len(json.loads(params['symbols'])))
+        except (TypeError, ValueError):
+            pass
+    return ccxt_cost * CCXT_COST_TO_WEIGHT
+
+
+class WeightRateLimiter:
+    """
+    Token bucket of exchange request weight, shared by every client in the process
+
+    Tokens refill at limit / window per second up to limit * headroom. Each
+    request takes its endpoint weight before it is sent, blocking (or awaiting)
+    until enough has refilled. The used weight the exchange reports on every
+    response caps the bucket, so weight spent by other instances of the
+    process's IP (or missed by the estimates) is accounted for; a Retry-After
+    blocks every caller until it expires.
+    """
+
+    def __init__(self, limit: int = 6000, window: float = 60.0, headroom: float = 0.9):
+        """
+        Initialize a full bucket
+
+        Args:
+            limit (int): Request weight allowed per window
+            window (float): Window length in seconds
+            headroom (float): Fraction of the limit the bucket may spend
+        """
+        self.limit = limit
+        self.capacity = limit * headroom
+        self.refill_rate = self.capacity / window
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.weight = 0.0
+        self.waited = 0.0
+        self.last_used_weight = None
+        self.retry_after_events = 0
+
+    def _reserve(self, weight: float) -> float:
+        """Take weight if available and return 0, else return seconds to wait before retrying"""
+        weight = min(weight, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+            self.updated_at = now
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.tokens >= weight:
+                self.tokens -= weight
+                self.requests += 1
+                self.weight += weight
+                return 0.0
+            return (weight - self.tokens) / self.refill_rate
+
+    def acquire(self, weight: float = 1):
+        """Block until weight is available and take it"""
+        while True:
+            wait = self._reserve(weight)
+            if not wait:
+                return
+            with self.lock:
+                self.waited += wait
+            time.sleep(wait)
+
+    async def acquire_async(self, weight: float = 1):
+        """acquire() for coroutines; waits without blocking the event loop"""
+        while True:
+            wait = self._reserve(weight)
+            if not wait:
+                return
+            with self.lock:
+                self.waited += wait
+            await asyncio.sleep(wait)
+
+    def observe(self, headers):
+        """Sync the bucket with a response's used-weight and Retry-After headers"""
+        used = _header(headers, USED_WEIGHT_HEADER)
+        retry_after = _header(headers, RETRY_AFTER_HEADER)
+        with self.lock:
+            if used is not None:
+                self.last_used_weight = int(used)
+                self.tokens = min(self.tokens, self.capacity - self.last_used_weight)
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + float(retry_after))
+                self.retry_after_events += 1
+        if retry_after is not None:
+            logger.warning("Rate limited by the exchange, pausing requests for %ss", retry_after)
+
+    def stats(self) -> Dict:
+        """Limiter statistics"""
+        with self.lock:
+            return {
+                'limit': self.limit,
+                'capacity': self.capacity,
+                'available': round(max(self.tokens, 0.0), 1),
+                'requests': self.requests,
+                'weight': round(self.weight, 1),
+                'waited_seconds': round(self.waited, 3),
+                'last_used_weight': self.last_used_weight,
+                'retry_after_events': self.retry_after_events
+            }
+
+
+# Process-wide limiter for the Binance REST API; routes create new services per request
+binance_rate_limiter = WeightRateLimiter(limit=Config.BINANCE_WEIGHT_LIMIT, headroom=Config.BINANCE_WEIGHT_HEADROOM)
+
+
+class RateLimitedBinance(ccxt.binance):
+    """ccxt.binance throttled by the process-wide weight limiter instead of its per-instance delay"""
+
+    rate_limiter = binance_rate_limiter
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        return request_weight(path, params, super().calculate_rate_limiter_cost(api, method, path, params, config))
+
+    def throttle(self, cost=None):
+        self.rate_limiter.acquire(1 if cost is None else cost)
+
+    def on_rest_response(self, code, reason, url, method, response_headers, response_body, request_headers, request_body):
+        self.rate_limiter.observe(response_headers)
+        return super().on_rest_response(code, reason, url, method, response_headers, response_body,
+                                        request_headers, request_body)
+
+
+class AsyncRateLimitedBinance(ccxt_async.binance):
+    """ccxt.async_support.binance throttled by the same process-wide weight limiter"""
+
+    rate_limiter = binance_rate_limiter
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        return request_weight(path, params, super().calculate_rate_limiter_cost(api, method, path, params, config))
+
+    async def throttle(self, cost=None):
+        await self.rate_limiter.acquire_async(1 if cost is None else cost)
+
+    def on_rest_response(self, code, reason, url, method, response_headers, response_body, request_headers, request_body):
+        self.rate_limiter.observe(response_headers)
+        return super().on_rest_response(code, reason, url, method, response_headers, response_body,
+                                        request_headers, request_body)
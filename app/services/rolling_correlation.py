@@ -0,0 +1,173 @@
+import numpy as np
+import threading
+from typing import Dict, Optional, Sequence
+
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RollingCorrelation:
+    """
+    Windowed pairwise covariance of log returns with O(n^2) streaming updates
+
+    The state keeps, for every pair (i, j), sums over the bars where both
+    returns exist: count, sum of x_i, sum of x_i^2 and sum of x_i * x_j.
+    Appending a bar adds its outer products and subtracts those of the bar
+    leaving the window, so no update rereads the window. The sums are rebuilt
+    exactly from the window buffer every `window` updates to stop
+    floating-point drift, which keeps the amortized cost per bar O(n^2).
+    """
+
+    def __init__(self, labels: Sequence[str], window: int = 168):
+        """
+        Initialize an empty state
+
+        Args:
+            labels: Series labels (symbols), one per row of the close matrices
+            window (int): Returns per correlation window
+        """
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.window = window
+        self.lock = threading.Lock()
+        n = len(self.labels)
+
+        self.buffer = np.full((window, n), np.nan)   # ring buffer of return rows
+        self.position = 0                              # next buffer row to overwrite
+        self.filled = 0
+        self.updates_since_rebuild = 0
+        self.last_close = np.full(n, np.nan)
+        self.last_timestamp = None
+        self._reset_sums()
+
+    def _reset_sums(self):
+        n = len(self.labels)
+        self.count = np.zeros((n, n))     # bars where both i and j have a return
+        self.sum_x = np.zeros((n, n))     # [i, j]: sum of x_i over those bars
+        self.sum_xx = np.zeros((n, n))    # [i, j]: sum of x_i^2 over those bars
+        self.sum_xy = np.zeros((n, n))    # [i, j]: sum of x_i * x_j
+
+    @staticmethod
+    def _log_returns(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(current / previous)
+        returns[~np.isfinite(returns)] = np.nan
+        return returns
+
+    def _accumulate(self, rows: np.ndarray, sign: float = 1.0):
+        """Add (or remove) return rows of shape (k, n) to the pairwise sums"""
+        valid = ~np.isnan(rows)
+        mask = valid.astype(np.float64)
+        x = np.where(valid, rows, 0.0)
+        self.count += sign * (mask.T @ mask)
+        self.sum_x += sign * (x.T @ mask)
+        self.sum_xx += sign * ((x * x).T @ mask)
+        self.sum_xy += sign * (x.T @ x)
+
+    def _rebuild(self):
+        """Recompute the sums exactly from the window buffer"""
+        self._reset_sums()
+        self._accumulate(self.buffer[:self.filled] if self.filled < self.window else self.buffer)
+        self.updates_since_rebuild = 0
+
+    def seed(self, timestamps: np.ndarray, closes: np.ndarray):
+        """
+        Seed from aligned close history in one pass
+
+        Args:
+            timestamps (np.ndarray): Candle open times of the columns
+            closes (np.ndarray): (n_series, n_bars) closes, NaN where missing
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        with self.lock:
+            self.buffer.fill(np.nan)
+            self.position = self.filled = 0
+            self.last_close = np.full(len(self.labels), np.nan)
+            self.last_timestamp = None
+
+            if closes.shape[-1] == 0:
+                self._rebuild()
+                return
+
+            returns = self._log_returns(closes[:, :-1], closes[:, 1:]).T[-self.window:]
+            self.filled = len(returns)
+            self.buffer[:self.filled] = returns
+            self.position = self.filled % self.window
+            self.last_close = closes[:, -1].copy()
+            self.last_timestamp = int(timestamps[-1])
+            self._rebuild()
+
+        logger.debug("Seeded rolling correlation for %s series from %s bars", len(self.labels), closes.shape[-1])
+
+    def update(self, timestamp: int, closes: np.ndarray) -> bool:
+        """
+        Append one bar of closes (one per series, NaN where missing)
+
+        Returns:
+            bool: False if the bar is not newer than the last one and was ignored
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        with self.lock:
+            if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                return False
+
+            row = self._log_returns(self.last_close, closes)
+            self.last_close = closes.copy()
+            self.last_timestamp = int(timestamp)
+
+            if self.filled == self.window:
+                self._accumulate(self.buffer[self.position][None, :], sign=-1.0)
+            else:
+                self.filled += 1
+            self.buffer[self.position] = row
+            self.position = (self.position + 1) % self.window
+            self._accumulate(row[None, :])
+
+            self.updates_since_rebuild += 1
+            if self.updates_since_rebuild >= self.window:
+                self._rebuild()
+            return True
+
+    def _moments(self, min_periods: int):
+        """Pairwise co-moments n * Sxy - Sx_i Sx_j and n * Sxx - Sx^2 for each side"""
+        count = self.count
+        cross = count * self.sum_xy - self.sum_x * self.sum_x.T
+        var_i = count * self.sum_xx - self.sum_x ** 2
+        var_j = var_i.T
+        enough = count >= min_periods
+        return cross, var_i, var_j, enough
+
+    def correlation(self, min_periods: int = 2) -> np.ndarray:
+        """(n, n) Pearson correlation of log returns, NaN with fewer than min_periods shared bars"""
+        with self.lock:
+            cross, var_i, var_j, enough = self._moments(min_periods)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = cross / np.sqrt(var_i * var_j)
+        corr = np.where(enough & (var_i > 0) & (var_j > 0), np.clip(corr, -1.0, 1.0), np.nan)
+        np.fill_diagonal(corr, np.where(np.diag(enough), 1.0, np.nan))
+        return corr
+
+    def beta(self, benchmark: str, min_periods: int = 2) -> np.ndarray:
+        """Beta of every series to the benchmark series: cov(x, b) / var(b)"""
+        j = self.index[benchmark]
+        with self.lock:
+            cross, _, var_j, enough = self._moments(min_periods)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                beta = cross[:, j] / var_j[:, j]
+        return np.where(enough[:, j] & (var_j[:, j] > 0), beta, np.nan)
+
+    def benchmark_stats(self, benchmarks: Sequence[str], min_periods: int = 2) -> Dict[str, Dict[str, np.ndarray]]:
+        """Correlation and beta of every series against each benchmark present in the labels"""
+        corr = self.correlation(min_periods)
+        return {
+            benchmark: {'correlation': corr[:, self.index[benchmark]], 'beta': self.beta(benchmark, min_periods)}
+            for benchmark in benchmarks if benchmark in self.index
+        }
+
+    def submatrix(self, labels: Sequence[str], min_periods: int = 2) -> Optional[np.ndarray]:
+        """Correlation matrix restricted to labels (in that order), None if any is unknown"""
+        if any(label not in self.index for label in labels):
+            return None
+        rows = [self.index[label] for label in labels]
+        return self.correlation(min_periods)[np.ix_(rows, rows)]
@@ -1,20 +1,52 @@
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional
-import logging
+from typing import List, Dict, Optional, Tuple
+
+from app.services.indicator_cache import indicator_cache, last_closed_open_time
+from app.services.kernels import left_align, recursive_filter, right_align
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+
+logger = get_logger(__name__)
+
+SMOOTHING_METHODS = ('ema', 'wilder')
+
+# Signal codes returned by the batch path; SIGNAL_LABELS[code] matches get_rsi_signal
+SIGNAL_UNKNOWN, SIGNAL_OVERBOUGHT, SIGNAL_OVERSOLD, SIGNAL_BULLISH, SIGNAL_BEARISH, SIGNAL_NEUTRAL = range(6)
+SIGNAL_LABELS = ('Unknown', 'Overbought', 'Oversold', 'Bullish', 'Bearish', 'Neutral')
+
+
+def rsi_from_averages(avg_gains, avg_losses):
+    """
+    Convert smoothed average gains/losses to RSI in [0, 100]
+    
+    A window with no losses is 100 (50 when there was no movement at all).
+    """
+    avg_gains = np.asarray(avg_gains, dtype=np.float64)
+    avg_losses = np.asarray(avg_losses, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gains / avg_losses)
+    
+    rsi = np.where(avg_losses == 0, np.where(avg_gains == 0, 50.0, 100.0), rsi)
+    return np.clip(rsi, 0.0, 100.0)
 
-logger = logging.getLogger(__name__)
 
 class RSICalculator:
-    def __init__(self, period: int = 14):
+    def __init__(self, period: int = 14, smoothing: str = 'ema'):
         """
         Initialize RSI Calculator
         
         Args:
             period (int): RSI calculation period (default: 14)
+            smoothing (str): 'ema' (alpha = 2 / (period + 1)) or 'wilder' (alpha = 1 / period)
         """
+        if smoothing not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown RSI smoothing '{smoothing}', expected one of {SMOOTHING_METHODS}")
+        
         self.period = period
-        logger.info(f"RSI Calculator initialized with period {period}")
+        self.smoothing = smoothing
+        logger.info("RSI Calculator initialized with period %s (%s smoothing)", period, smoothing)
     
     def calculate_rsi(self, prices: List[float]) -> Optional[float]:
         """
@@ -27,37 +59,140 @@ class RSICalculator:
             Optional[float]: RSI value or None if insufficient data
         """
         if len(prices) < self.period + 1:
-            logger.warning(f"Insufficient data for RSI calculation. Need {self.period + 1}, got {len(prices)}")
+            logger.warning("Insufficient data for RSI calculation. Need %s, got %s", self.period + 1, len(prices))
             return None
         
         try:
-            # Convert to numpy array for efficient calculation
-            prices_array = np.array(prices)
+            rsi = float(self.calculate_rsi_series(prices)[-1])
             
-            # Calculate price changes
-            deltas = np.diff(prices_array)
-            
-            # Separate gains and losses
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
+            logger.debug("RSI calculated: %.2f for %s price points", rsi, len(prices))
+            return round(rsi, 2)
             
-            # Calculate average gains and losses using exponential moving average
-            avg_gains = self._exponential_moving_average(gains, self.period)
-            avg_losses = self._exponential_moving_average(losses, self.period)
+        except Exception as e:
+            logger.error("Error calculating RSI: %s", e)
+            return None
+    
+    def calculate_rsi_series(self, prices, period: Optional[int] = None) -> np.ndarray:
+        """
+        Calculate the full RSI series for a list of prices
+        
+        Args:
+            prices: Closing prices (list, 1-D array, or 2-D array of equal-length rows)
+            period (int): RSI period (defaults to the calculator period)
             
-            # Calculate RS and RSI
-            rs = avg_gains / avg_losses if avg_losses != 0 else 0
-            rsi = 100 - (100 / (1 + rs))
+        Returns:
+            np.ndarray: RSI aligned with prices; the first `period` entries are NaN.
+                Entry i equals what calculate_rsi would return for prices[:i + 1].
+        """
+        prices_array = np.asarray(prices, dtype=np.float64)
+        gains, losses = self._gains_and_losses(prices_array)
+        return self._rsi_series_from_gains(gains, losses, period or self.period)
+    
+    def calculate_rsi_series_batch(self, closes: np.ndarray) -> np.ndarray:
+        """
+        Calculate RSI series for many symbols at once
+        
+        Args:
+            closes (np.ndarray): (n_symbols, n_bars) closing prices. Short histories
+                are right-aligned and padded with NaN at the start.
             
-            # Ensure RSI is within valid range [0, 100]
-            rsi = max(0, min(100, rsi))
+        Returns:
+            np.ndarray: (n_symbols, n_bars) RSI, NaN where fewer than period + 1 bars exist
+        """
+        aligned, lead = self._left_align(closes)
+        aligned_rsi = self.calculate_rsi_series(aligned)
+        
+        # Shift back to the original right-aligned layout
+        return right_align(aligned_rsi, lead)
+    
+    def calculate_rsi_multi_period(self, closes, periods=(2, 6, 14, 21, 50)) -> np.ndarray:
+        """
+        Calculate the latest RSI for several periods from one shared delta computation
+        
+        Args:
+            closes: 1-D closing prices, or (n_symbols, n_bars) closes NaN-padded at the start
+            periods: RSI periods to compute
             
-            logger.debug(f"RSI calculated: {rsi:.2f} for {len(prices)} price points")
-            return round(rsi, 2)
+        Returns:
+            np.ndarray: (n_symbols, n_periods) RSI rounded to 2 decimals, or (n_periods,)
+                for 1-D input. NaN where a symbol has fewer than period + 1 bars.
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        squeeze = closes.ndim == 1
+        if squeeze:
+            closes = closes[None, :]
+        
+        aligned, lead = self._left_align(closes)
+        data_points = aligned.shape[-1] - lead
+        last = np.maximum(data_points - 1, 0)[:, None]
+        
+        # One diff and one gain/loss split shared by every period
+        gains, losses = self._gains_and_losses(aligned)
+        
+        result = np.full((closes.shape[0], len(periods)), np.nan)
+        for column, period in enumerate(periods):
+            series = self._rsi_series_from_gains(gains, losses, period)
+            values = np.take_along_axis(series, last, axis=-1)[:, 0]
+            result[:, column] = np.where(data_points >= period + 1, np.round(values, 2), np.nan)
+        
+        return result[0] if squeeze else result
+    
+    def _left_align(self, closes) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Shift every row of a NaN-padded close matrix to start at column 0
+        
+        The tail of short rows repeats the last close (zero deltas), so all rows
+        can share one recursion and the padding is never read.
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Left-aligned closes and the leading NaN count per row
+        """
+        return left_align(closes)
+    
+    def _gains_and_losses(self, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate price changes along the last axis and separate gains and losses"""
+        deltas = np.diff(prices, axis=-1)
+        gains = np.where(deltas > 0, deltas, 0.0)
+        losses = np.where(deltas < 0, -deltas, 0.0)
+        return gains, losses
+    
+    def _rsi_series_from_gains(self, gains: np.ndarray, losses: np.ndarray, period: int) -> np.ndarray:
+        """RSI series aligned with the prices the gains/losses were taken from"""
+        shape = gains.shape[:-1] + (gains.shape[-1] + 1,)
+        rsi = np.full(shape, np.nan)
+        
+        if gains.shape[-1] < period:
+            return rsi
+        
+        avg_gains = self._smoothed_averages(gains, period)
+        avg_losses = self._smoothed_averages(losses, period)
+        
+        rsi[..., period:] = rsi_from_averages(avg_gains, avg_losses)
+        return rsi
+    
+    def _smoothed_averages(self, data: np.ndarray, period: Optional[int] = None) -> np.ndarray:
+        """
+        Smoothed average of gains or losses after each delta, starting at delta `period - 1`
+        
+        Args:
+            data (np.ndarray): Gains or losses along the last axis (length >= period)
+            period (int): Smoothing period (defaults to the calculator period)
             
-        except Exception as e:
-            logger.error(f"Error calculating RSI: {e}")
-            return None
+        Returns:
+            np.ndarray: len(data) - period + 1 averages along the last axis
+        """
+        period = period or self.period
+        seed = np.mean(data[..., :period], axis=-1)
+        
+        if self.smoothing == 'wilder':
+            # Wilder: SMA seed, then avg = (avg * (period - 1) + x) / period
+            tail = recursive_filter(data[..., period:], 1.0 / period, initial=seed)
+        else:
+            # Legacy EMA seeded with the first value; a window of exactly
+            # `period` deltas falls back to the simple mean
+            tail = recursive_filter(data, 2.0 / (period + 1))[..., period:]
+        
+        return np.concatenate((np.asarray(seed)[..., None], tail), axis=-1)
     
     def _exponential_moving_average(self, data: np.ndarray, period: int) -> float:
         """
@@ -77,14 +212,7 @@ class RSICalculator:
         if len(data) <= period:
             return np.mean(data)
         
-        # Calculate EMA
-        alpha = 2.0 / (period + 1)
-        ema = data[0]  # Start with first value
-        
-        for i in range(1, len(data)):
-            ema = alpha * data[i] + (1 - alpha) * ema
-        
-        return ema
+        return recursive_filter(data, 2.0 / (period + 1))[-1]
     
     def get_rsi_signal(self, rsi: float) -> str:
         """
@@ -109,16 +237,130 @@ class RSICalculator:
         else:
             return "Neutral"
     
-    def analyze_market_data(self, ohlcv_data: List[List]) -> Dict:
+    def get_rsi_signal_codes(self, rsi: np.ndarray) -> np.ndarray:
         """
-        Analyze OHLCV data and return RSI analysis
+        Vectorized get_rsi_signal returning indexes into SIGNAL_LABELS
+        
+        Args:
+            rsi (np.ndarray): RSI values (NaN for unknown)
+            
+        Returns:
+            np.ndarray: int8 signal codes
+        """
+        rsi = np.asarray(rsi, dtype=np.float64)
+        codes = np.select(
+            [np.isnan(rsi), rsi >= 70, rsi <= 30, rsi >= 60, rsi <= 40],
+            [SIGNAL_UNKNOWN, SIGNAL_OVERBOUGHT, SIGNAL_OVERSOLD, SIGNAL_BULLISH, SIGNAL_BEARISH],
+            default=SIGNAL_NEUTRAL
+        )
+        return codes.astype(np.int8)
+    
+    def analyze_market_data_batch(self, closes: np.ndarray, volumes: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Analyze a whole universe of symbols in one vectorized pass
+        
+        Args:
+            closes (np.ndarray): (n_symbols, n_bars) closing prices, NaN-padded at the start
+            volumes (np.ndarray): Optional (n_symbols, n_bars) volumes with the same padding
+            
+        Returns:
+            Dict[str, np.ndarray]: Per-symbol 'rsi', 'signal' (codes into SIGNAL_LABELS),
+                'price_change', 'volume_change', 'data_points' and 'last_price'.
+                Values are NaN where analyze_market_data would return None.
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        if closes.ndim != 2:
+            raise ValueError(f"Expected a (n_symbols, n_bars) array, got shape {closes.shape}")
+        
+        n_symbols, n_bars = closes.shape
+        mask = ~np.isnan(closes)
+        data_points = mask.sum(axis=1)
+        sufficient = data_points >= self.period + 1
+        rows = np.arange(n_symbols)
+        first = np.minimum(n_bars - data_points, n_bars - 1)
+        
+        rsi = np.full(n_symbols, np.nan)
+        price_change = np.full(n_symbols, np.nan)
+        volume_change = np.full(n_symbols, np.nan)
+        last_price = np.full(n_symbols, np.nan)
+        
+        if n_bars > 0:
+            rsi = np.round(self.calculate_rsi_series_batch(closes)[:, -1], 2)
+            last_price = np.where(sufficient, closes[:, -1], np.nan)
+            
+            first_close = closes[rows, first]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                price_change = np.round((closes[:, -1] - first_close) / first_close * 100, 2)
+            price_change = np.where(sufficient, price_change, np.nan)
+            
+            if volumes is not None:
+                volumes = np.asarray(volumes, dtype=np.float64)
+                first_volume = volumes[rows, first]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    volume_change = np.round((volumes[:, -1] - first_volume) / first_volume * 100, 2)
+                volume_change = np.where(sufficient & (first_volume != 0), volume_change, np.nan)
+        
+        rsi = np.where(sufficient, rsi, np.nan)
+        
+        return {
+            'rsi': rsi,
+            'signal': self.get_rsi_signal_codes(rsi),
+            'price_change': price_change,
+            'volume_change': volume_change,
+            'data_points': data_points,
+            'last_price': last_price
+        }
+    
+    def batch_row_to_analysis(self, batch: Dict[str, np.ndarray], index: int) -> Dict:
+        """
+        Convert one row of analyze_market_data_batch output to the analyze_market_data format
         
         Args:
-            ohlcv_data (List[List]): OHLCV data from exchange
+            batch (Dict[str, np.ndarray]): Output of analyze_market_data_batch
+            index (int): Symbol row
             
         Returns:
             Dict: Analysis results
         """
+        def _value(key):
+            value = batch[key][index]
+            return None if np.isnan(value) else float(value)
+        
+        return {
+            'rsi': _value('rsi'),
+            'signal': SIGNAL_LABELS[batch['signal'][index]],
+            'price_change': _value('price_change'),
+            'volume_change': _value('volume_change'),
+            'data_points': int(batch['data_points'][index]),
+            'last_price': _value('last_price')
+        }
+    
+    def analyze_market_data(self, ohlcv_data, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> Dict:
+        """
+        Analyze OHLCV data and return RSI analysis
+        
+        Args:
+            ohlcv_data: OHLCV series (or ccxt OHLCV rows) from exchange
+            symbol (str): Optional symbol; with timeframe, enables memoization
+            timeframe (str): Optional candle timeframe; with symbol, enables memoization
+            
+        Returns:
+            Dict: Analysis results. Memoized results are keyed by the last closed
+                candle and computed from closed candles only, so they stay exact
+                until the next candle closes.
+        """
+        if symbol is not None and timeframe is not None and ohlcv_data:
+            ohlcv = OHLCV.coerce(ohlcv_data)
+            last_closed = last_closed_open_time(timeframe, ohlcv.timestamp)
+            
+            if last_closed is not None:
+                closed = ohlcv[:int(np.searchsorted(ohlcv.timestamp, last_closed, side='right'))]
+                key = ('analyze_market_data', symbol, timeframe, self.period, self.smoothing, last_closed)
+                return dict(indicator_cache.get_or_compute(
+                    key, lambda: self.analyze_market_data(closed),
+                    should_cache=lambda analysis: analysis['signal'] != 'Error'
+                ))
+        
         try:
             if not ohlcv_data or len(ohlcv_data) < self.period + 1:
                 return {
@@ -129,37 +371,14 @@ class RSICalculator:
                     'data_points': len(ohlcv_data) if ohlcv_data else 0
                 }
             
-            # Extract closing prices (index 4 in OHLCV)
-            closing_prices = [float(candle[4]) for candle in ohlcv_data]
-            
-            # Calculate RSI
-            rsi = self.calculate_rsi(closing_prices)
-            signal = self.get_rsi_signal(rsi)
-            
-            # Calculate price change
-            if len(closing_prices) >= 2:
-                price_change = ((closing_prices[-1] - closing_prices[0]) / closing_prices[0]) * 100
-            else:
-                price_change = None
+            # A single series is a one-row batch; the column arrays are used as views
+            ohlcv = OHLCV.coerce(ohlcv_data)
+            batch = self.analyze_market_data_batch(ohlcv.close[None, :], ohlcv.volume[None, :])
             
-            # Calculate volume change (index 5 in OHLCV)
-            if len(ohlcv_data) >= 2:
-                volumes = [float(candle[5]) for candle in ohlcv_data]
-                volume_change = ((volumes[-1] - volumes[0]) / volumes[0]) * 100 if volumes[0] != 0 else None
-            else:
-                volume_change = None
-            
-            return {
-                'rsi': rsi,
-                'signal': signal,
-                'price_change': round(price_change, 2) if price_change is not None else None,
-                'volume_change': round(volume_change, 2) if volume_change is not None else None,
-                'data_points': len(ohlcv_data),
-                'last_price': closing_prices[-1] if closing_prices else None
-            }
+            return self.batch_row_to_analysis(batch, 0)
             
         except Exception as e:
-            logger.error(f"Error analyzing market data: {e}")
+            logger.error("Error analyzing market data: %s", e)
             return {
                 'rsi': None,
                 'signal': 'Error',
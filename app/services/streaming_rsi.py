@@ -0,0 +1,290 @@
+import ccxt
+import numpy as np
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from app.services.kernels import recursive_filter
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+from app.services.rsi_calculator import SMOOTHING_METHODS, rsi_from_averages
+
+logger = get_logger(__name__)
+
+
+class IncrementalRSI:
+    """O(1) RSI state for one (symbol, timeframe, period) candle series"""
+
+    def __init__(self, period: int = 14, smoothing: str = 'ema'):
+        """
+        Initialize an empty RSI state
+
+        Args:
+            period (int): RSI calculation period (default: 14)
+            smoothing (str): 'ema' or 'wilder', same meaning as in RSICalculator
+        """
+        if smoothing not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown RSI smoothing '{smoothing}', expected one of {SMOOTHING_METHODS}")
+
+        self.period = period
+        self.smoothing = smoothing
+        self.alpha = 1.0 / period if smoothing == 'wilder' else 2.0 / (period + 1)
+        self.reset()
+
+    def reset(self):
+        """Clear the committed state"""
+        self.count = 0              # number of closed-candle deltas seen
+        self.gain_state = 0.0       # recursive average of gains
+        self.loss_state = 0.0       # recursive average of losses
+        self.gain_sum = 0.0         # sum of the first `period` gains (warm-up)
+        self.loss_sum = 0.0         # sum of the first `period` losses (warm-up)
+        self.last_close = None
+        self.last_open_time = None
+
+    @property
+    def is_ready(self) -> bool:
+        """True once enough closed candles have been seen to produce a value"""
+        return self.count >= self.period
+
+    @property
+    def avg_gain(self) -> Optional[float]:
+        return self._averages(self._state())[0]
+
+    @property
+    def avg_loss(self) -> Optional[float]:
+        return self._averages(self._state())[1]
+
+    def seed(self, closes, last_open_time: Optional[int] = None):
+        """
+        Seed the state from closed-candle history in one vectorized pass
+
+        Args:
+            closes: Closing prices of closed candles, oldest first
+            last_open_time (int): Open time (ms) of the last candle in closes
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        self.reset()
+
+        if len(closes) == 0:
+            return
+
+        deltas = np.diff(closes)
+        gains = np.where(deltas > 0, deltas, 0.0)
+        losses = np.where(deltas < 0, -deltas, 0.0)
+
+        self.count = len(deltas)
+        self.gain_sum = float(gains[:self.period].sum())
+        self.loss_sum = float(losses[:self.period].sum())
+
+        if self.count > 0:
+            if self.smoothing == 'wilder':
+                if self.count >= self.period:
+                    self.gain_state = self.gain_sum / self.period
+                    self.loss_state = self.loss_sum / self.period
+                if self.count > self.period:
+                    self.gain_state = float(recursive_filter(gains[self.period:], self.alpha, initial=self.gain_state)[-1])
+                    self.loss_state = float(recursive_filter(losses[self.period:], self.alpha, initial=self.loss_state)[-1])
+            else:
+                self.gain_state = float(recursive_filter(gains, self.alpha)[-1])
+                self.loss_state = float(recursive_filter(losses, self.alpha)[-1])
+
+        self.last_close = float(closes[-1])
+        self.last_open_time = last_open_time
+
+    def update(self, close: float, open_time: Optional[int] = None) -> Optional[float]:
+        """
+        Commit a closed candle
+
+        Args:
+            close (float): Closing price
+            open_time (int): Candle open time (ms); candles not newer than the last one are ignored
+
+        Returns:
+            Optional[float]: RSI after the candle, or None during warm-up
+        """
+        if open_time is not None and self.last_open_time is not None and open_time <= self.last_open_time:
+            return self.value()
+
+        (self.count, self.gain_state, self.loss_state,
+         self.gain_sum, self.loss_sum, self.last_close) = self._next_state(float(close))
+        if open_time is not None:
+            self.last_open_time = open_time
+
+        return self.value()
+
+    def provisional(self, close: float) -> Optional[float]:
+        """
+        RSI as if the in-progress candle closed at `close`; the committed state is not changed
+
+        Args:
+            close (float): Current price of the in-progress candle
+
+        Returns:
+            Optional[float]: Provisional RSI, or None during warm-up
+        """
+        return self._rsi(self._next_state(float(close)))
+
+    def value(self) -> Optional[float]:
+        """RSI of the committed state"""
+        return self._rsi(self._state())
+
+    def _state(self) -> Tuple:
+        return (self.count, self.gain_state, self.loss_state,
+                self.gain_sum, self.loss_sum, self.last_close)
+
+    def _next_state(self, close: float) -> Tuple:
+        """Return the state after one more closed candle without applying it"""
+        count, gain_state, loss_state, gain_sum, loss_sum, last_close = self._state()
+
+        if last_close is None:
+            return (count, gain_state, loss_state, gain_sum, loss_sum, close)
+
+        delta = close - last_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        count += 1
+
+        if count <= self.period:
+            gain_sum += gain
+            loss_sum += loss
+
+        if self.smoothing == 'wilder':
+            if count > self.period:
+                gain_state += self.alpha * (gain - gain_state)
+                loss_state += self.alpha * (loss - loss_state)
+            elif count == self.period:
+                gain_state = gain_sum / self.period
+                loss_state = loss_sum / self.period
+        elif count == 1:
+            gain_state, loss_state = gain, loss
+        else:
+            gain_state += self.alpha * (gain - gain_state)
+            loss_state += self.alpha * (loss - loss_state)
+
+        return (count, gain_state, loss_state, gain_sum, loss_sum, close)
+
+    def _averages(self, state: Tuple) -> Tuple[Optional[float], Optional[float]]:
+        count, gain_state, loss_state, gain_sum, loss_sum, _ = state
+
+        if count < self.period:
+            return None, None
+
+        # A window of exactly `period` deltas is a simple mean in both modes
+        if count == self.period:
+            return gain_sum / self.period, loss_sum / self.period
+
+        return gain_state, loss_state
+
+    def _rsi(self, state: Tuple) -> Optional[float]:
+        avg_gain, avg_loss = self._averages(state)
+        if avg_gain is None:
+            return None
+        return round(float(rsi_from_averages(avg_gain, avg_loss)), 2)
+
+
+class StreamingRSIService:
+    """
+    Registry of IncrementalRSI states advanced from stored closed candles
+
+    Nothing streams klines into the states: they are seeded from, and then
+    advanced by, the candles OHLCVSync stores, so the committed RSI is that
+    of the last stored closed candle. The in-progress candle is only
+    estimated at read time, by treating a live price (e.g. the 24h ticker's
+    last price) as its close, which makes the returned value provisional.
+    """
+
+    def __init__(self, period: int = 14, smoothing: str = 'ema'):
+        """
+        Initialize the RSI state registry
+
+        Args:
+            period (int): Default RSI period
+            smoothing (str): 'ema' or 'wilder'
+        """
+        self.period = period
+        self.smoothing = smoothing
+        # (symbol, timeframe) -> {period: IncrementalRSI}
+        self.states: Dict[Tuple[str, str], Dict[int, IncrementalRSI]] = {}
+        self.lock = threading.Lock()
+        logger.info("RSI state registry initialized with period %s (%s smoothing)", period, smoothing)
+
+    @staticmethod
+    def _key_symbol(symbol: str) -> str:
+        """Exchange and market-id symbols share one key ('BTC/USDT' -> 'BTCUSDT')"""
+        return symbol.replace('/', '').upper()
+
+    def get_state(self, symbol: str, timeframe: str = '1h', period: Optional[int] = None) -> IncrementalRSI:
+        """Get or create the state for (symbol, timeframe, period)"""
+        period = period or self.period
+        with self.lock:
+            periods = self.states.setdefault((self._key_symbol(symbol), timeframe), {})
+            state = periods.get(period)
+            if state is None:
+                state = IncrementalRSI(period, self.smoothing)
+                periods[period] = state
+            return state
+
+    def last_open_time(self, symbol: str, timeframe: str = '1h', period: Optional[int] = None) -> Optional[int]:
+        """Open time (ms) of the last committed candle, or None if the state was never seeded"""
+        with self.lock:
+            state = self.states.get((self._key_symbol(symbol), timeframe), {}).get(period or self.period)
+            return state.last_open_time if state is not None else None
+
+    @staticmethod
+    def _closed(ohlcv, timeframe: str) -> OHLCV:
+        """The candles of an OHLCV series (or ccxt rows) that have closed"""
+        ohlcv = OHLCV.coerce(ohlcv)
+        timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        now_ms = int(time.time() * 1000)
+        return ohlcv[:int(np.searchsorted(ohlcv.timestamp, now_ms - timeframe_ms, side='right'))]
+
+    def seed_from_ohlcv(self, symbol: str, timeframe: str, ohlcv, period: Optional[int] = None) -> Optional[float]:
+        """Seed a state from an OHLCV series (or ccxt rows), dropping the in-progress candle"""
+        closed = self._closed(ohlcv, timeframe)
+
+        state = self.get_state(symbol, timeframe, period)
+        with self.lock:
+            state.seed(closed.close, int(closed.timestamp[-1]) if len(closed) else None)
+            rsi = state.value()
+
+        logger.info("Seeded RSI for %s %s from %s closed candles: %s", symbol, timeframe, len(closed), rsi)
+        return rsi
+
+    def advance_from_ohlcv(self, symbol: str, timeframe: str, ohlcv, period: Optional[int] = None) -> Optional[float]:
+        """
+        Commit the closed candles of `ohlcv` newer than the state's last one
+
+        Each candle is an O(1) IncrementalRSI.update. The state is reseeded
+        instead when it was never seeded or `ohlcv` does not contain its last
+        candle (the candles in between are unknown).
+
+        Returns:
+            Optional[float]: RSI of the last closed candle, or None during warm-up
+        """
+        closed = self._closed(ohlcv, timeframe)
+        last_open = self.last_open_time(symbol, timeframe, period)
+        if last_open is None or not len(closed) or last_open not in closed.timestamp:
+            return self.seed_from_ohlcv(symbol, timeframe, closed, period)
+
+        state = self.get_state(symbol, timeframe, period)
+        newer = closed[int(np.searchsorted(closed.timestamp, last_open, side='right')):]
+        with self.lock:
+            for open_time, close in zip(newer.timestamp, newer.close):
+                state.update(float(close), int(open_time))
+            return state.value()
+
+    def get_rsi(self, symbol: str, timeframe: str = '1h', period: Optional[int] = None,
+                provisional_close: Optional[float] = None) -> Optional[float]:
+        """Current RSI, optionally including the in-progress candle at `provisional_close`"""
+        with self.lock:
+            state = self.states.get((self._key_symbol(symbol), timeframe), {}).get(period or self.period)
+            if state is None:
+                return None
+            if provisional_close is not None:
+                return state.provisional(provisional_close)
+            return state.value()
+
+
+# Process-wide RSI states; routes create new screener services per request
+streaming_rsi = StreamingRSIService(period=Config.RSI_PERIOD, smoothing=Config.RSI_SMOOTHING)
@@ -1,9 +1,25 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-import logging
+from typing import Dict, List, Optional, Sequence, Tuple
 
-logger = logging.getLogger(__name__)
+from config import Config
+from app.services.indicator_engine import ROC_LOOKBACKS, registry
+from app.services.indicator_matrix import IndicatorMatrix
+from app.services.lazy_logging import get_logger
+from app.services.ohlcv import OHLCV
+from app.services.parallel_indicators import ParallelIndicatorEngine
+from app.services.rolling_correlation import RollingCorrelation
+from app.services.rsi_calculator import RSICalculator
+
+logger = get_logger(__name__)
+
+# Kline oscillators from the indicator engine, read from coin dicts under the same name
+OSCILLATOR_INDICATORS = ('bollinger_pct_b', 'bollinger_bandwidth', 'atr', 'natr',
+                         'macd', 'macd_signal', 'macd_histogram', 'stoch_k', 'stoch_d')
+
+# Indicators where a higher value ranks first
+DESCENDING_INDICATORS = ('rsi', 'returns_vs_btc', 'mansfield_rs', 'roc', 'vwap_distance') + \
+    tuple(f'roc_{lookback}' for lookback in ROC_LOOKBACKS) + OSCILLATOR_INDICATORS
 
 class TechnicalIndicators:
     """Service for calculating various technical indicators"""
@@ -14,87 +30,212 @@ class TechnicalIndicators:
             'rsi': 'Relative Strength Index',
             'returns_vs_btc': '24h Returns vs Bitcoin',
             'mansfield_rs': 'Mansfield Relative Strength',
-            'roc': 'Rate of Change',
-            'vwap': 'Volume Weighted Average Price'
+            'roc': 'Rate of Change (24h)',
+            'vwap': 'Volume Weighted Average Price',
+            'vwap_distance': 'Price vs Session VWAP (%)'
         }
-        logger.info(f"Available indicators: {list(self.indicators.keys())}")
+        self.indicators.update({f'roc_{lookback}': f'{lookback} Rate of Change' for lookback in ROC_LOOKBACKS})
+        self.indicators.update({name: registry.nodes[name].description for name in OSCILLATOR_INDICATORS})
+        self.engine = ParallelIndicatorEngine(workers=Config.INDICATOR_WORKERS,
+                                              min_symbols=Config.INDICATOR_PARALLEL_MIN_SYMBOLS,
+                                              rsi_calculator=RSICalculator(period=Config.RSI_PERIOD,
+                                                                           smoothing=Config.RSI_SMOOTHING),
+                                              timeout=Config.INDICATOR_POOL_TIMEOUT)
+        logger.info("Available indicators: %s", list(self.indicators.keys()))
     
-    def calculate_all_indicators(self, coin_data: Dict, btc_data: Dict) -> Dict:
-        """Calculate all technical indicators for a coin"""
+    def calculate_all_indicators(self, coin_data: Dict, btc_data: Dict,
+                                 selected: Optional[Sequence[str]] = None) -> Dict:
+        """Calculate technical indicators for a coin
+        
+        Kline-based values are read from coin_data, where callers attach them
+        (memoized per closed candle, see EnhancedScreenerService); ticker-based
+        ones are computed from the current coin and BTC data on every call.
+        Pass selected to evaluate only those indicators (all of them by default).
+        """
+        selected = tuple(selected) if selected is not None else None
+        
+        def wanted(name):
+            return selected is None or name in selected
+        
         try:
-            logger.debug(f"Calculating indicators for coin: {coin_data.get('symbol', 'Unknown')}")
-            logger.debug(f"Coin data: {coin_data}")
-            logger.debug(f"BTC data: {btc_data}")
+            logger.debug("Calculating indicators for coin: %s", coin_data.get('symbol', 'Unknown'))
+            logger.debug("Coin data: %s", coin_data)
+            logger.debug("BTC data: %s", btc_data)
             
             indicators = {}
             
             # RSI (14-period)
-            if 'rsi' in coin_data:
+            if wanted('rsi') and 'rsi' in coin_data:
                 indicators['rsi'] = coin_data['rsi']
-                logger.debug(f"RSI: {indicators['rsi']}")
+                logger.debug("RSI: %s", indicators['rsi'])
             
             # 24h Returns vs BTC
-            if 'price_change_24h' in coin_data and 'price_change_24h' in btc_data:
+            if wanted('returns_vs_btc') and 'price_change_24h' in coin_data and 'price_change_24h' in btc_data:
                 coin_change = coin_data['price_change_24h'] or 0
                 btc_change = btc_data['price_change_24h'] or 0
                 indicators['returns_vs_btc'] = coin_change - btc_change
-                logger.debug(f"Returns vs BTC: {indicators['returns_vs_btc']}")
-            
-            # Mansfield Relative Strength
-            if 'price_change_24h' in coin_data and 'price_change_24h' in btc_data:
-                indicators['mansfield_rs'] = self._calculate_mansfield_rs(
-                    coin_data.get('price_change_24h', 0),
-                    btc_data.get('price_change_24h', 0)
-                )
-                logger.debug(f"Mansfield RS: {indicators['mansfield_rs']}")
-            
-            # ROC (Rate of Change)
-            if 'price_change_24h' in coin_data:
+                logger.debug("Returns vs BTC: %s", indicators['returns_vs_btc'])
+            
+            # Mansfield Relative Strength from klines (see calculate_indicators_batch)
+            if wanted('mansfield_rs') and coin_data.get('mansfield_rs') is not None:
+                indicators['mansfield_rs'] = coin_data['mansfield_rs']
+                logger.debug("Mansfield RS: %s", indicators['mansfield_rs'])
+            
+            # ROC over each lookback from klines (see calculate_indicators_batch);
+            # 'roc' is the 24h lookback, or the ticker's 24h change without candles
+            for lookback in ROC_LOOKBACKS:
+                name = f'roc_{lookback}'
+                if coin_data.get(name) is not None:
+                    if wanted(name):
+                        indicators[name] = coin_data[name]
+                    if lookback == '24h' and wanted('roc'):
+                        indicators['roc'] = coin_data[name]
+            if wanted('roc') and 'roc' not in indicators and 'price_change_24h' in coin_data:
                 indicators['roc'] = coin_data['price_change_24h'] or 0
-                logger.debug(f"ROC: {indicators['roc']}")
+            logger.debug("ROC: %s", indicators.get('roc'))
+            
+            # Bollinger, ATR, MACD and Stochastic from klines (see calculate_indicators_batch)
+            for name in OSCILLATOR_INDICATORS:
+                if wanted(name) and coin_data.get(name) is not None:
+                    indicators[name] = coin_data[name]
             
-            # VWAP (simplified - using 24h average price)
-            if 'price' in coin_data and 'volume_24h' in coin_data:
-                indicators['vwap'] = coin_data['price']  # Simplified for now
-                logger.debug(f"VWAP: {indicators['vwap']}")
+            # VWAP from klines (see calculate_indicators_batch); without candles there is no VWAP
+            if coin_data.get('vwap'):
+                if wanted('vwap'):
+                    indicators['vwap'] = coin_data['vwap']
+                if wanted('vwap_distance') and coin_data.get('price'):
+                    indicators['vwap_distance'] = (coin_data['price'] / coin_data['vwap'] - 1) * 100
+                logger.debug("VWAP: %s", coin_data['vwap'])
             
-            logger.debug(f"Calculated indicators: {indicators}")
+            logger.debug("Calculated indicators: %s", indicators)
             return indicators
             
         except Exception as e:
-            logger.error(f"Error calculating indicators: {e}")
+            logger.error("Error calculating indicators: %s", e)
             return {}
     
-    def _calculate_mansfield_rs(self, coin_change: float, btc_change: float) -> float:
-        """Calculate Mansfield Relative Strength"""
-        try:
-            logger.debug(f"Calculating Mansfield RS: coin_change={coin_change}, btc_change={btc_change}")
+    def calculate_indicators_batch(self, ohlcv_batch: List[OHLCV], selected: Sequence[str],
+                                   btc_ohlcv: Optional[OHLCV] = None, **params) -> Dict[str, np.ndarray]:
+        """Calculate kline-based indicators for many symbols through the indicator engine
+        
+        Only the selected indicators and the intermediates they declare are
+        evaluated, each once per batch (see app.services.indicator_engine).
+        Batches of at least Config.INDICATOR_PARALLEL_MIN_SYMBOLS are sharded
+        across Config.INDICATOR_WORKERS processes.
+        
+        Args:
+            ohlcv_batch (List[OHLCV]): Candle history per symbol
+            selected (Sequence[str]): Engine node names, e.g. ['vwap_session', 'mansfield_rs']
+            btc_ohlcv (OHLCV): BTC candles for BTC-relative indicators
+            **params: Engine parameter overrides (roc_period, vwap_window, ...)
             
-            if btc_change == 0:
-                logger.debug("BTC change is 0, returning 0")
-                return 0.0
+        Returns:
+            Dict[str, np.ndarray]: Value per selected node; NaN per symbol if the batch fails
+        """
+        try:
+            return self.engine.compute(ohlcv_batch, selected, btc_ohlcv=btc_ohlcv, **params)
+        except Exception as e:
+            logger.error("Error calculating indicators %s: %s", list(selected), e)
+            return {name: np.full(len(ohlcv_batch), np.nan) for name in selected}
+    
+    def calculate_vwap_batch(self, ohlcv_batch: List[OHLCV], window: int = 24, anchor: str = '1d') -> Dict[str, np.ndarray]:
+        """Calculate session-anchored and rolling VWAP for many symbols from kline volume
+        
+        Typical price x volume and volume are turned into prefix sums once, so
+        every VWAP window is an O(1) difference for the whole universe.
+        
+        Args:
+            ohlcv_batch (List[OHLCV]): Candle history per symbol
+            window (int): Bars in the rolling VWAP
+            anchor (str): Session length for the anchored VWAP ('1d' = UTC day)
             
-            # Mansfield RS = (1 + coin_change) / (1 + btc_change) - 1
-            mansfield_rs = ((1 + coin_change/100) / (1 + btc_change/100)) - 1
-            result = mansfield_rs * 100  # Convert to percentage
+        Returns:
+            Dict[str, np.ndarray]: Latest 'vwap_session', 'vwap_rolling' and 'vwap_distance'
+                (% of last close above the session VWAP) per symbol, NaN without volume
+        """
+        return self.calculate_indicators_batch(
+            ohlcv_batch, ('vwap_session', 'vwap_rolling', 'vwap_distance'),
+            vwap_window=window, vwap_anchor=anchor
+        )
+    
+    def calculate_mansfield_rs_batch(self, ohlcv_batch: List[OHLCV], btc_ohlcv: OHLCV, period: int = 52) -> Dict[str, np.ndarray]:
+        """Calculate Mansfield Relative Strength against BTC for many symbols at once
+        
+        Closes are placed on BTC's time axis, divided by BTC's closes in one
+        broadcast, and the ratio is compared with its own simple moving average:
+        RS = (ratio / SMA(ratio, period) - 1) * 100.
+        
+        Args:
+            ohlcv_batch (List[OHLCV]): Candle history per symbol
+            btc_ohlcv (OHLCV): BTC candles of the same timeframe
+            period (int): Bars in the moving average of the ratio
             
-            logger.debug(f"Mansfield RS calculated: {result}")
-            return result
+        Returns:
+            Dict[str, np.ndarray]: Latest 'mansfield_rs' per symbol (NaN without enough
+                aligned history) and the full (n_symbols, n_bars) 'rs_series'
+        """
+        if btc_ohlcv is None or not len(btc_ohlcv):
+            logger.warning("No BTC candles for Mansfield RS")
+            return {'mansfield_rs': np.full(len(ohlcv_batch), np.nan), 'rs_series': np.empty((len(ohlcv_batch), 0))}
+        
+        result = self.calculate_indicators_batch(
+            ohlcv_batch, ('mansfield_rs', 'mansfield_rs_series'), btc_ohlcv=btc_ohlcv, mansfield_period=period
+        )
+        return {'mansfield_rs': result['mansfield_rs'], 'rs_series': result['mansfield_rs_series']}
+    
+    def build_rolling_correlation(self, symbols: Sequence[str], ohlcv_batch: List[OHLCV], window: int = 168,
+                                  timestamps: Optional[np.ndarray] = None) -> RollingCorrelation:
+        """Seed a streaming pairwise correlation state from stored candles
+        
+        Args:
+            symbols (Sequence[str]): Symbol per series
+            ohlcv_batch (List[OHLCV]): Candle history per symbol
+            window (int): Returns per correlation window
+            timestamps (np.ndarray): Shared time axis (default: the longest series)
             
-        except Exception as e:
-            logger.error(f"Error calculating Mansfield RS: {e}")
-            return 0.0
+        Returns:
+            RollingCorrelation: State ready for correlation(), beta() and update()
+        """
+        if timestamps is None:
+            longest = max((o for o in ohlcv_batch if o is not None), key=len, default=OHLCV.empty())
+            timestamps = longest.timestamp[-(window + 1):]
+        
+        state = RollingCorrelation(symbols, window)
+        state.seed(timestamps, OHLCV.align(ohlcv_batch, timestamps, 'close'))
+        logger.info("Seeded rolling correlation for %s symbols over %s bars", len(symbols), len(timestamps))
+        return state
+    
+    def update_rolling_correlation(self, state: RollingCorrelation, ohlcv_batch: List[OHLCV]) -> int:
+        """Append the candles newer than the state's last bar (ohlcv_batch follows state.labels)
+        
+        Returns:
+            int: Number of bars appended
+        """
+        series = [o.timestamp for o in ohlcv_batch if o is not None and len(o)]
+        if not series:
+            return 0
+        
+        timestamps = np.unique(np.concatenate(series))
+        if state.last_timestamp is not None:
+            timestamps = timestamps[timestamps > state.last_timestamp]
+        
+        closes = OHLCV.align(ohlcv_batch, timestamps, 'close')
+        for column, timestamp in enumerate(timestamps):
+            state.update(int(timestamp), closes[:, column])
+        
+        logger.debug("Appended %s bars to rolling correlation of %s symbols", len(timestamps), len(state.labels))
+        return len(timestamps)
     
     def get_indicator_description(self, indicator: str) -> str:
         """Get description for an indicator"""
         description = self.indicators.get(indicator, 'Unknown indicator')
-        logger.debug(f"Description for {indicator}: {description}")
+        logger.debug("Description for %s: %s", indicator, description)
         return description
     
     def get_indicator_signal(self, indicator: str, value: float) -> str:
         """Get trading signal based on indicator value"""
         try:
-            logger.debug(f"Getting signal for {indicator}={value}")
+            logger.debug("Getting signal for %s=%s", indicator, value)
             
             if indicator == 'rsi':
                 if value >= 70:
@@ -128,7 +269,58 @@ class TechnicalIndicators:
                 else:
                     signal = 'Very Weak'
                 
-            elif indicator == 'roc':
+            elif indicator == 'vwap_distance':
+                if value > 2:
+                    signal = 'Well Above VWAP'
+                elif value > 0:
+                    signal = 'Above VWAP'
+                elif value > -2:
+                    signal = 'Below VWAP'
+                else:
+                    signal = 'Well Below VWAP'
+                
+            elif indicator == 'bollinger_pct_b':
+                if value > 1:
+                    signal = 'Above Upper Band'
+                elif value > 0.8:
+                    signal = 'Near Upper Band'
+                elif value < 0:
+                    signal = 'Below Lower Band'
+                elif value < 0.2:
+                    signal = 'Near Lower Band'
+                else:
+                    signal = 'Inside Bands'
+                
+            elif indicator == 'bollinger_bandwidth':
+                if value > 10:
+                    signal = 'Wide Bands'
+                elif value < 3:
+                    signal = 'Squeeze'
+                else:
+                    signal = 'Normal Width'
+                
+            elif indicator == 'natr':
+                if value > 5:
+                    signal = 'Very Volatile'
+                elif value > 2:
+                    signal = 'Volatile'
+                else:
+                    signal = 'Calm'
+                
+            elif indicator in ('macd', 'macd_signal', 'macd_histogram'):
+                signal = 'Bullish' if value > 0 else 'Bearish'
+                
+            elif indicator in ('stoch_k', 'stoch_d'):
+                if value >= 80:
+                    signal = 'Overbought'
+                elif value <= 20:
+                    signal = 'Oversold'
+                elif value >= 50:
+                    signal = 'Bullish'
+                else:
+                    signal = 'Bearish'
+                
+            elif indicator == 'roc' or indicator.startswith('roc_'):
                 if value > 20:
                     signal = 'Very Strong Momentum'
                 elif value > 10:
@@ -143,51 +335,167 @@ class TechnicalIndicators:
             else:
                 signal = 'Neutral'
             
-            logger.debug(f"Signal for {indicator}={value}: {signal}")
+            logger.debug("Signal for %s=%s: %s", indicator, value, signal)
             return signal
                 
         except Exception as e:
-            logger.error(f"Error getting indicator signal: {e}")
+            logger.error("Error getting indicator signal: %s", e)
             return 'Unknown'
     
     def rank_coins_by_indicator(self, coins_data: List[Dict], indicator: str, btc_data: Dict) -> List[Dict]:
         """Rank coins by a specific indicator"""
         try:
-            logger.info(f"Ranking {len(coins_data)} coins by indicator: {indicator}")
+            logger.info("Ranking %s coins by indicator: %s", len(coins_data), indicator)
             
             ranked_coins = []
             
             for coin in coins_data:
-                logger.debug(f"Processing coin: {coin.get('symbol', 'Unknown')}")
-                indicators = self.calculate_all_indicators(coin, btc_data)
+                logger.debug("Processing coin: %s", coin.get('symbol', 'Unknown'))
+                indicators = self.calculate_all_indicators(coin, btc_data, selected=[indicator])
                 if indicator in indicators:
                     coin_copy = coin.copy()
                     coin_copy['indicator_value'] = indicators[indicator]
                     coin_copy['indicator_signal'] = self.get_indicator_signal(indicator, indicators[indicator])
                     ranked_coins.append(coin_copy)
-                    logger.debug(f"Added {coin.get('symbol', 'Unknown')} with {indicator}={indicators[indicator]}")
+                    logger.debug("Added %s with %s=%s", coin.get('symbol', 'Unknown'), indicator, indicators[indicator])
                 else:
-                    logger.warning(f"Indicator {indicator} not found for {coin.get('symbol', 'Unknown')}")
+                    logger.warning("Indicator %s not found for %s", indicator, coin.get('symbol', 'Unknown'))
             
             # Sort by indicator value (descending for most indicators)
-            if indicator in ['rsi', 'returns_vs_btc', 'mansfield_rs', 'roc']:
+            if indicator in DESCENDING_INDICATORS:
                 ranked_coins.sort(key=lambda x: x['indicator_value'], reverse=True)
-                logger.debug(f"Sorted {len(ranked_coins)} coins by {indicator} (descending)")
+                logger.debug("Sorted %s coins by %s (descending)", len(ranked_coins), indicator)
             else:
                 ranked_coins.sort(key=lambda x: x['indicator_value'])
-                logger.debug(f"Sorted {len(ranked_coins)} coins by {indicator} (ascending)")
+                logger.debug("Sorted %s coins by %s (ascending)", len(ranked_coins), indicator)
             
-            logger.info(f"Ranked {len(ranked_coins)} coins by {indicator}")
+            logger.info("Ranked %s coins by %s", len(ranked_coins), indicator)
             return ranked_coins
             
         except Exception as e:
-            logger.error(f"Error ranking coins by indicator: {e}")
+            logger.error("Error ranking coins by indicator: %s", e)
             return []
     
+    @staticmethod
+    def _coin_column(coins_data: List[Dict], key: str, none_value: float = np.nan) -> np.ndarray:
+        """One coin dict key as a float vector: NaN where missing, none_value where None"""
+        return np.array([none_value if coin.get(key, np.nan) is None else coin.get(key, np.nan)
+                         for coin in coins_data], dtype=np.float64)
+    
+    def build_indicator_matrix(self, coins_data: List[Dict], btc_data: Dict,
+                               selected: Optional[Sequence[str]] = None,
+                               kline_values: Optional[Dict[str, np.ndarray]] = None) -> IndicatorMatrix:
+        """Evaluate indicators for every coin as whole columns and rank each one cross-sectionally
+        
+        Same values as calculate_all_indicators per coin, computed with vector
+        arithmetic over the ticker columns and the kline arrays.
+        
+        Args:
+            coins_data (List[Dict]): Coin dicts as passed to calculate_all_indicators
+            btc_data (Dict): BTC ticker data
+            selected (Sequence[str]): Indicator columns (default: every indicator)
+            kline_values (Dict[str, np.ndarray]): Kline values by coin dict key ('vwap',
+                'mansfield_rs', 'roc_24h', ...) aligned with coins_data; keys not given
+                are read from the coin dicts
+            
+        Returns:
+            IndicatorMatrix: Symbols x indicators values and percentile ranks
+        """
+        columns = list(selected) if selected is not None else list(self.indicators)
+        kline_values = kline_values or {}
+        
+        def column(key: str) -> np.ndarray:
+            if key in kline_values:
+                return np.asarray(kline_values[key], dtype=np.float64)
+            return self._coin_column(coins_data, key)
+        
+        values = np.full((len(coins_data), len(columns)), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for j, name in enumerate(columns):
+                if name == 'returns_vs_btc':
+                    if 'price_change_24h' in btc_data:
+                        values[:, j] = self._coin_column(coins_data, 'price_change_24h', 0.0) - \
+                            (btc_data['price_change_24h'] or 0)
+                elif name == 'roc':
+                    # The 24h kline lookback, else the ticker's 24h change
+                    roc = column('roc_24h')
+                    values[:, j] = np.where(np.isnan(roc), self._coin_column(coins_data, 'price_change_24h', 0.0), roc)
+                elif name in ('vwap', 'vwap_distance'):
+                    # Without candles (or with a zero VWAP) there is no VWAP
+                    vwap = column('vwap')
+                    vwap = np.where(vwap != 0, vwap, np.nan)
+                    if name == 'vwap':
+                        values[:, j] = vwap
+                    else:
+                        price = self._coin_column(coins_data, 'price', 0.0)
+                        values[:, j] = np.where(price != 0, (price / vwap - 1) * 100, np.nan)
+                elif name in self.indicators:
+                    values[:, j] = column(name)
+        
+        matrix = IndicatorMatrix([coin.get('symbol') for coin in coins_data], columns, values,
+                                 descending=DESCENDING_INDICATORS)
+        logger.info("Built %s x %s indicator matrix (%s bytes)", len(matrix), len(columns), matrix.nbytes)
+        return matrix
+    
+    def select_top_percentile(self, matrix: IndicatorMatrix, coins_data: List[Dict], indicator: str,
+                              percentile: float = 95) -> Tuple[List[Dict], int]:
+        """Top percentile of an indicator matrix as coin dicts, built only for the selected rows
+        
+        Args:
+            matrix (IndicatorMatrix): Matrix whose rows follow coins_data
+            coins_data (List[Dict]): Coin dicts copied into the results
+            indicator (str): Indicator to rank by
+            percentile (float): Percentile cut, e.g. 95 keeps the top 5%
+            
+        Returns:
+            Tuple[List[Dict], int]: Selected coins (best first) and the number of coins ranked
+        """
+        try:
+            if indicator not in matrix.indicators:
+                logger.warning("Indicator %s is not in the matrix", indicator)
+                return [], 0
+            
+            total_ranked = int(np.count_nonzero(~np.isnan(matrix.column(indicator))))
+            if not total_ranked:
+                logger.warning("Indicator %s not found for any coin", indicator)
+                return [], 0
+            
+            column = matrix.column(indicator)
+            top_coins = []
+            for i in matrix.top(indicator, percentile):
+                coin = dict(coins_data[i])
+                coin.update({name: float(value) for name, value in zip(matrix.indicators, matrix.values[i])
+                             if not np.isnan(value)})
+                coin['indicator_value'] = float(column[i])
+                coin['indicator_signal'] = self.get_indicator_signal(indicator, coin['indicator_value'])
+                coin['percentile_rank'] = matrix.percentile(matrix.symbols[i], indicator)
+                top_coins.append(coin)
+            
+            logger.info("Selected top %s of %s coins by %s", len(top_coins), total_ranked, indicator)
+            return top_coins, total_ranked
+            
+        except Exception as e:
+            logger.error("Error selecting top percentile coins: %s", e)
+            return [], 0
+    
+    def rank_top_percentile(self, coins_data: List[Dict], indicator: str, btc_data: Dict,
+                            percentile: float = 95) -> Tuple[List[Dict], int]:
+        """Select the top percentile of coins by an indicator without sorting the whole universe
+        
+        Indicator values are kept in one array; argpartition picks the top k and
+        only those k are sorted and copied into result dicts. Ordering and the
+        number selected match rank_coins_by_indicator + get_top_percentile_coins.
+        
+        Returns:
+            Tuple[List[Dict], int]: Selected coins (best first) and the number of coins ranked
+        """
+        matrix = self.build_indicator_matrix(coins_data, btc_data, selected=[indicator])
+        return self.select_top_percentile(matrix, coins_data, indicator, percentile)
+    
     def get_top_percentile_coins(self, ranked_coins: List[Dict], percentile: float = 95) -> List[Dict]:
         """Get top percentile coins based on ranking"""
         try:
-            logger.info(f"Getting top {100-percentile}% coins from {len(ranked_coins)} ranked coins")
+            logger.info("Getting top %s%% coins from %s ranked coins", 100 - percentile, len(ranked_coins))
             
             if not ranked_coins:
                 logger.warning("No ranked coins provided")
@@ -195,13 +503,13 @@ class TechnicalIndicators:
             
             # Calculate how many coins represent the top percentile
             top_count = max(1, int(len(ranked_coins) * (100 - percentile) / 100))
-            logger.info(f"Top {100-percentile}% represents {top_count} coins")
+            logger.info("Top %s%% represents %s coins", 100 - percentile, top_count)
             
             top_coins = ranked_coins[:top_count]
-            logger.info(f"Selected top {len(top_coins)} coins: {[c.get('symbol', 'Unknown') for c in top_coins]}")
+            logger.info("Selected top %s coins: %s", len(top_coins), [c.get('symbol', 'Unknown') for c in top_coins])
             
             return top_coins
             
         except Exception as e:
-            logger.error(f"Error getting top percentile coins: {e}")
+            logger.error("Error getting top percentile coins: %s", e)
             return ranked_coins[:10]  # Fallback to top 10
@@ -0,0 +1,181 @@
+import asyncio
+import bisect
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import Config
+from app.services.exchange_registry import exchange_registry
+from app.services.lazy_logging import get_logger
+from app.services.market_cache import market_cache
+from app.services.rate_limiter import TICKER_SYMBOLS_WEIGHT, ticker_weight
+
+logger = get_logger(__name__)
+
+# Symbols per ticker/24hr request in the cheapest weight tier
+TICKER_BATCH_SIZE = TICKER_SYMBOLS_WEIGHT[0][0]
+
+
+class SymbolIndex:
+    """Active spot symbols grouped by quote asset, built once per market snapshot"""
+
+    def __init__(self, markets: Dict):
+        by_quote = defaultdict(list)
+        for symbol, market in markets.items():
+            if market.get('spot') and market.get('active') is not False:
+                by_quote[market['quote']].append(symbol)
+        self.by_quote = {quote: sorted(symbols) for quote, symbols in by_quote.items()}
+
+    def symbols(self, quote: str) -> List[str]:
+        """Symbols quoted in an asset, e.g. every */USDT pair"""
+        return self.by_quote.get(quote, [])
+
+
+def plan_ticker_batches(symbols: Sequence[str]) -> List[Optional[List[str]]]:
+    """
+    Split symbols into ticker/24hr requests of least total weight
+
+    Batches of TICKER_BATCH_SIZE cost the minimum weight each; when they would
+    add up to more than one full snapshot, a single unfiltered request
+    (None) is cheaper.
+    """
+    symbols = list(symbols)
+    batches = [symbols[i:i + TICKER_BATCH_SIZE] for i in range(0, len(symbols), TICKER_BATCH_SIZE)]
+    if len(batches) * ticker_weight(TICKER_BATCH_SIZE) >= ticker_weight(None):
+        return [None]
+    return batches
+
+
+class TickerSnapshot:
+    """
+    24h tickers of every indexed symbol of one quote asset, with a maintained volume ranking
+
+    A refresh fetches tickers only for the indexed symbols, in weight-aware
+    batches over the pooled asyncio client. The ranking is a list of
+    (-quote volume, symbol) kept sorted as tickers change, so top(n) is a
+    slice rather than a filter and sort of every ticker.
+    """
+
+    def __init__(self, quote: str = 'USDT', max_age: float = 30.0):
+        """
+        Initialize an empty snapshot
+
+        Args:
+            quote (str): Quote asset of the indexed symbols
+            max_age (float): Seconds before top() refreshes the tickers
+        """
+        self.quote = quote
+        self.max_age = max_age
+        self.tickers: Dict[str, Dict] = {}
+        self.ranking: List[Tuple[float, str]] = []
+        self.updated_at = 0.0
+        self.index = None
+        self.indexed_at = None
+        self.refreshes = 0
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+
+    def symbol_index(self) -> SymbolIndex:
+        """Index of the current market snapshot, rebuilt only when the snapshot changes"""
+        if market_cache.markets is None:
+            market_cache.load(exchange_registry.get('binance', 'spot'),
+                              lambda: exchange_registry.create('binance', 'spot'))
+        if self.index is None or self.indexed_at != market_cache.fetched_at:
+            self.index = SymbolIndex(market_cache.markets)
+            self.indexed_at = market_cache.fetched_at
+            logger.info("Indexed %s %s symbols", len(self.index.symbols(self.quote)), self.quote)
+        return self.index
+
+    def _rank_key(self, symbol: str) -> Tuple[float, str]:
+        return -self.tickers[symbol]['volume'], symbol
+
+    def _remove(self, symbol: str):
+        key = self._rank_key(symbol)
+        position = bisect.bisect_left(self.ranking, key)
+        if position < len(self.ranking) and self.ranking[position] == key:
+            del self.ranking[position]
+        del self.tickers[symbol]
+
+    def _update(self, symbol: str, ticker: Dict):
+        """Replace one symbol's ticker and move it within the ranking"""
+        if not ticker.get('quoteVolume'):
+            if symbol in self.tickers:
+                self._remove(symbol)
+            return
+        if symbol in self.tickers:
+            self._remove(symbol)
+        self.tickers[symbol] = {
+            'symbol': symbol,
+            'volume': ticker['quoteVolume'],
+            'price': ticker['last'],
+            'change': ticker.get('percentage', 0)
+        }
+        bisect.insort(self.ranking, self._rank_key(symbol))
+
+    @staticmethod
+    async def _fetch_batches(batches: List[Optional[List[str]]]) -> List:
+        exchange = exchange_registry.get_async('binance', 'spot')
+        return await asyncio.gather(*(exchange.fetch_tickers(batch) for batch in batches), return_exceptions=True)
+
+    def refresh(self, force: bool = False):
+        """Fetch tickers for the indexed symbols; concurrent callers share one refresh"""
+        with self.refresh_lock:
+            if not force and time.time() - self.updated_at < self.max_age:
+                return
+
+            symbols = self.symbol_index().symbols(self.quote)
+            batches = plan_ticker_batches(symbols)
+            results = exchange_registry.run(self._fetch_batches(batches))
+
+            failures = [result for result in results if isinstance(result, Exception)]
+            for failure in failures:
+                logger.error("Failed to fetch ticker batch: %s", failure)
+            if len(failures) == len(results):
+                return
+
+            wanted = set(symbols)
+            with self.lock:
+                for result in results:
+                    if isinstance(result, Exception):
+                        continue
+                    for symbol, ticker in result.items():
+                        if symbol in wanted:
+                            self._update(symbol, ticker)
+                for symbol in [s for s in self.tickers if s not in wanted]:
+                    self._remove(symbol)
+                self.updated_at = time.time()
+                self.refreshes += 1
+
+            weight = sum(ticker_weight(len(batch) if batch is not None else None) for batch in batches)
+            logger.info("Refreshed %s %s tickers in %s requests (weight %s)",
+                        len(self.tickers), self.quote, len(batches), weight)
+
+    def top(self, n: int) -> List[Dict]:
+        """Top n symbols by 24h quote volume, refreshing stale tickers first"""
+        self.refresh()
+        with self.lock:
+            return [dict(self.tickers[symbol]) for _, symbol in self.ranking[:n]]
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Current ticker of one indexed symbol, refreshing stale tickers first"""
+        self.refresh()
+        with self.lock:
+            ticker = self.tickers.get(symbol)
+            return dict(ticker) if ticker is not None else None
+
+    def stats(self) -> Dict:
+        """Snapshot statistics"""
+        with self.lock:
+            return {
+                'quote': self.quote,
+                'indexed_symbols': len(self.index.symbols(self.quote)) if self.index is not None else 0,
+                'tickers': len(self.tickers),
+                'age_seconds': round(time.time() - self.updated_at) if self.updated_at else None,
+                'max_age_seconds': self.max_age,
+                'refreshes': self.refreshes
+            }
+
+
+# Process-wide USDT ticker snapshot shared by every BinanceService
+usdt_tickers = TickerSnapshot('USDT', max_age=Config.TICKER_SNAPSHOT_MAX_AGE)
@@ -1,12 +1,13 @@
 import json
-import logging
 import time
 from typing import Dict, List, Optional, Callable
 from websocket import create_connection, WebSocketConnectionClosedException
 import threading
 from collections import defaultdict
 
-logger = logging.getLogger(__name__)
+from app.services.lazy_logging import get_logger
+
+logger = get_logger(__name__)
 
 class BinanceWebSocketService:
     """WebSocket service for real-time Binance data without rate limiting"""
@@ -23,11 +24,11 @@ class BinanceWebSocketService:
         
         # WebSocket URLs - Use the correct Binance WebSocket endpoint
         self.ws_url = "wss://stream.binance.com:9443/ws"
-        logger.info(f"WebSocket URL: {self.ws_url}")
+        logger.info("WebSocket URL: %s", self.ws_url)
         
         # Rate limiting (WebSocket is much more generous)
         self.max_subscriptions = 200  # Binance allows up to 200 streams
-        logger.info(f"Max subscriptions: {self.max_subscriptions}")
+        logger.info("Max subscriptions: %s", self.max_subscriptions)
         
         logger.info("Binance WebSocket Service initialized successfully")
     
@@ -41,7 +42,7 @@ class BinanceWebSocketService:
             logger.info("✅ WebSocket connected successfully")
             return True
         except Exception as e:
-            logger.error(f"❌ WebSocket connection failed: {e}")
+            logger.error("❌ WebSocket connection failed: %s", e)
             self.is_connected = False
             return False
     
@@ -54,13 +55,13 @@ class BinanceWebSocketService:
                 self.is_connected = False
                 logger.info("WebSocket disconnected")
             except Exception as e:
-                logger.error(f"Error disconnecting: {e}")
+                logger.error("Error disconnecting: %s", e)
         else:
             logger.debug("WebSocket already disconnected")
     
     def subscribe_to_ticker(self, symbols: List[str], callback: Callable = None):
         """Subscribe to ticker streams for multiple symbols"""
-        logger.info(f"Subscribing to {len(symbols)} ticker streams: {symbols}")
+        logger.info("Subscribing to %s ticker streams: %s", len(symbols), symbols)
         
         if not self.is_connected:
             logger.info("WebSocket not connected, attempting to connect...")
@@ -71,7 +72,7 @@ class BinanceWebSocketService:
         try:
             # Format symbols for WebSocket (lowercase, no separator)
             ws_symbols = [symbol.lower().replace('/', '') for symbol in symbols]
-            logger.debug(f"Formatted symbols for WebSocket: {ws_symbols}")
+            logger.debug("Formatted symbols for WebSocket: %s", ws_symbols)
             
             # Create subscription message - Use the correct format
             subscription = {
@@ -80,11 +81,11 @@ class BinanceWebSocketService:
                 "id": int(time.time() * 1000)
             }
             
-            logger.info(f"Sending subscription: {json.dumps(subscription)}")
+            logger.debug("Sending subscription: %s", subscription)
             
             # Send subscription
             self.ws.send(json.dumps(subscription))
-            logger.info(f"Subscribed to {len(symbols)} ticker streams")
+            logger.info("Subscribed to %s ticker streams", len(symbols))
             
             # Store callback for data processing
             for symbol in symbols:
@@ -93,12 +94,12 @@ class BinanceWebSocketService:
             return True
             
         except Exception as e:
-            logger.error(f"Subscription failed: {e}")
+            logger.error("Subscription failed: %s", e)
             return False
     
     def subscribe_to_klines(self, symbol: str, interval: str = '1h', callback: Callable = None):
         """Subscribe to kline/candlestick data for RSI calculation"""
-        logger.info(f"Subscribing to kline data for {symbol} with interval {interval}")
+        logger.info("Subscribing to kline data for %s with interval %s", symbol, interval)
         
         if not self.is_connected:
             logger.info("WebSocket not connected, attempting to connect...")
@@ -109,7 +110,7 @@ class BinanceWebSocketService:
         try:
             # Format symbol for WebSocket
             ws_symbol = symbol.lower().replace('/', '')
-            logger.debug(f"Formatted symbol for WebSocket: {ws_symbol}")
+            logger.debug("Formatted symbol for WebSocket: %s", ws_symbol)
             
             # Create subscription message
             subscription = {
@@ -118,11 +119,11 @@ class BinanceWebSocketService:
                 "id": int(time.time() * 1000)
             }
             
-            logger.info(f"Sending kline subscription: {json.dumps(subscription)}")
+            logger.debug("Sending kline subscription: %s", subscription)
             
             # Send subscription
             self.ws.send(json.dumps(subscription))
-            logger.info(f"Subscribed to kline data for {symbol}")
+            logger.info("Subscribed to kline data for %s", symbol)
             
             # Store callback for data processing
             self.callbacks[symbol] = callback
@@ -130,7 +131,7 @@ class BinanceWebSocketService:
             return True
             
         except Exception as e:
-            logger.error(f"Kline subscription failed: {e}")
+            logger.error("Kline subscription failed: %s", e)
             return False
     
     def start_listening(self):
@@ -148,7 +149,7 @@ class BinanceWebSocketService:
                     logger.warning("WebSocket connection closed, attempting reconnect...")
                     self._reconnect()
                 except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+                    logger.error("Error processing message: %s", e)
                     time.sleep(1)
             
             logger.debug("WebSocket listener thread stopped")
@@ -161,23 +162,23 @@ class BinanceWebSocketService:
     def _process_message(self, data: Dict):
         """Process incoming WebSocket messages"""
         try:
-            logger.debug(f"Processing message: {data}")
+            logger.debug("Processing message: %s", data, every=100)
             
             # Handle subscription confirmation messages
             if 'result' in data and 'id' in data:
-                logger.info(f"Subscription confirmed: {data}")
+                logger.info("Subscription confirmed: %s", data)
                 return
             
             # Handle error messages
             if 'error' in data:
-                logger.error(f"WebSocket error: {data}")
+                logger.error("WebSocket error: %s", data)
                 return
             
             # Handle actual data messages
             if 'stream' in data:
                 stream_data = data['data']
                 stream_type = data['stream']
-                logger.debug(f"Processing stream data: {stream_type}")
+                logger.debug("Processing stream data: %s", stream_type, every=100)
                 
                 if 'ticker' in stream_type:
                     self._process_ticker_data(stream_data)
@@ -192,10 +193,10 @@ class BinanceWebSocketService:
                     logger.debug("Processing direct kline data")
                     self._process_kline_data(data)
                 else:
-                    logger.debug(f"Unknown message format: {data}")
+                    logger.debug("Unknown message format: %s", data)
                     
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e, per_second=1)
     
     def _process_ticker_data(self, data: Dict):
         """Process ticker data and update cache"""
@@ -211,10 +212,10 @@ class BinanceWebSocketService:
             }
             
             self.data_cache[symbol] = ticker_info
-            logger.debug(f"Updated ticker for {symbol}: ${ticker_info['price']}")
+            logger.debug("Updated ticker for %s: $%s", symbol, ticker_info['price'], every=100)
             
         except Exception as e:
-            logger.error(f"Error processing ticker data: {e}")
+            logger.error("Error processing ticker data: %s", e, per_second=1)
     
     def _process_kline_data(self, data: Dict):
         """Process kline data for technical analysis"""
@@ -244,15 +245,15 @@ class BinanceWebSocketService:
             if len(self.data_cache[cache_key]) > 100:
                 self.data_cache[cache_key] = self.data_cache[cache_key][-100:]
             
-            logger.debug(f"Updated kline for {symbol}: {kline_data['close']}")
+            logger.debug("Updated kline for %s: %s", symbol, kline_data['close'], every=100)
             
         except Exception as e:
-            logger.error(f"Error processing kline data: {e}")
+            logger.error("Error processing kline data: %s", e, per_second=1)
     
     def _reconnect(self):
         """Attempt to reconnect with exponential backoff"""
         try:
-            logger.info(f"Attempting to reconnect (attempt {self.reconnect_attempts + 1}/{self.max_reconnect_attempts})")
+            logger.info("Attempting to reconnect (attempt %s/%s)", self.reconnect_attempts + 1, self.max_reconnect_attempts)
             
             if self.reconnect_attempts >= self.max_reconnect_attempts:
                 logger.error("Max reconnection attempts reached")
@@ -263,7 +264,7 @@ class BinanceWebSocketService:
             
             # Wait before reconnecting
             wait_time = 2 ** self.reconnect_attempts
-            logger.info(f"Waiting {wait_time} seconds before reconnecting...")
+            logger.info("Waiting %s seconds before reconnecting...", wait_time)
             
             self.disconnect()
             time.sleep(wait_time)
@@ -278,16 +279,16 @@ class BinanceWebSocketService:
             return success
             
         except Exception as e:
-            logger.error(f"Reconnection failed: {e}")
+            logger.error("Reconnection failed: %s", e)
             return False
     
     def get_ticker_data(self, symbol: str) -> Optional[Dict]:
         """Get current ticker data from cache"""
         data = self.data_cache.get(symbol)
         if data:
-            logger.debug(f"Retrieved ticker data for {symbol}: {data}")
+            logger.debug("Retrieved ticker data for %s: %s", symbol, data)
         else:
-            logger.debug(f"No ticker data found for {symbol}")
+            logger.debug("No ticker data found for %s", symbol)
         return data
     
     def get_kline_data(self, symbol: str) -> Optional[List[Dict]]:
@@ -295,16 +296,16 @@ class BinanceWebSocketService:
         cache_key = f"{symbol}_klines"
         data = self.data_cache.get(cache_key, [])
         if data:
-            logger.debug(f"Retrieved {len(data)} klines for {symbol}")
+            logger.debug("Retrieved %s klines for %s", len(data), symbol)
         else:
-            logger.debug(f"No kline data found for {symbol}")
+            logger.debug("No kline data found for %s", symbol)
         return data
     
     def get_top_coins_by_volume(self, limit: int = 50) -> List[Dict]:
         """Get top coins by volume from cached ticker data"""
         try:
-            logger.debug(f"Getting top {limit} coins by volume from WebSocket cache")
-            logger.debug(f"Cache contains {len(self.data_cache)} symbols")
+            logger.debug("Getting top %s coins by volume from WebSocket cache", limit)
+            logger.debug("Cache contains %s symbols", len(self.data_cache))
             
             # Filter USDT pairs and sort by volume
             usdt_tickers = []
@@ -317,17 +318,17 @@ class BinanceWebSocketService:
                         'change': ticker['price_change']
                     })
             
-            logger.debug(f"Found {len(usdt_tickers)} USDT pairs with volume data")
+            logger.debug("Found %s USDT pairs with volume data", len(usdt_tickers))
             
             # Sort by volume and return top coins
             usdt_tickers.sort(key=lambda x: x['volume'], reverse=True)
             top_coins = usdt_tickers[:limit]
             
-            logger.debug(f"Returning top {len(top_coins)} coins by volume")
+            logger.debug("Returning top %s coins by volume", len(top_coins))
             return top_coins
             
         except Exception as e:
-            logger.error(f"Failed to get top coins by volume: {e}")
+            logger.error("Failed to get top coins by volume: %s", e)
             return []
     
     def test_connection(self) -> Dict:
@@ -345,7 +346,7 @@ class BinanceWebSocketService:
             
             # Test basic subscription
             test_symbols = ['BTCUSDT', 'ETHUSDT']
-            logger.info(f"Testing subscription to {test_symbols}")
+            logger.info("Testing subscription to %s", test_symbols)
             
             if self.subscribe_to_ticker(test_symbols):
                 # Start listening for messages
@@ -355,7 +356,7 @@ class BinanceWebSocketService:
                 # Wait for data with timeout
                 timeout = 10  # seconds
                 start_time = time.time()
-                logger.info(f"Waiting up to {timeout} seconds for data...")
+                logger.info("Waiting up to %s seconds for data...", timeout)
                 
                 while time.time() - start_time < timeout:
                     # Check if we received data
@@ -392,7 +393,7 @@ class BinanceWebSocketService:
                 }
                 
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return {
                 'success': False,
                 'message': f'Connection test failed: {str(e)}',
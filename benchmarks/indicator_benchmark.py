@@ -0,0 +1,189 @@
+"""
+Reproducible throughput benchmark for the indicator engine.
+
+Usage:
+    python -m benchmarks.indicator_benchmark --output benchmark.json
+    python -m benchmarks.indicator_benchmark --symbols 50 --bars 100 1000
+
+Candles come from a seeded random walk, so two runs with the same arguments
+time exactly the same inputs. Results are written as JSON with ops/sec (best of
+--repeat runs) and peak traced memory per benchmark and grid cell.
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.services.ohlcv import OHLCV
+from app.services.rsi_calculator import RSICalculator
+from app.services.technical_indicators import TechnicalIndicators
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYMBOLS = (50, 500, 5000)
+DEFAULT_BARS = (100, 1000, 10000)
+HOUR_MS = 60 * 60 * 1000
+
+# Distinct series generated per grid cell; symbols cycle through them so a
+# 5,000 x 10,000 cell does not need gigabytes of candles. Per-call cost is the same.
+MAX_UNIQUE_SERIES = 64
+
+
+def generate_ohlcv(n_bars: int, rng: np.random.Generator, start_price: float = 100.0,
+                   timeframe_ms: int = HOUR_MS, start_time: int = 1_700_000_000_000) -> OHLCV:
+    """Geometric random walk candles with plausible highs, lows and volumes"""
+    closes = start_price * np.exp(np.cumsum(rng.normal(0.0, 0.01, n_bars)))
+    opens = np.r_[start_price, closes[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.005, n_bars))
+    highs = np.maximum(opens, closes) * (1 + spread)
+    lows = np.minimum(opens, closes) * (1 - spread)
+    volumes = rng.lognormal(10.0, 1.0, n_bars)
+    timestamps = start_time + np.arange(n_bars, dtype=np.int64) * timeframe_ms
+    return OHLCV(timestamps, opens, highs, lows, closes, volumes)
+
+
+def generate_universe(n_symbols: int, n_bars: int, seed: int) -> List[OHLCV]:
+    """Seeded synthetic universe; symbol i uses series i % MAX_UNIQUE_SERIES"""
+    rng = np.random.default_rng([seed, n_bars])
+    pool = [generate_ohlcv(n_bars, rng, start_price=float(rng.uniform(0.01, 50000)))
+            for _ in range(min(n_symbols, MAX_UNIQUE_SERIES))]
+    return [pool[i % len(pool)] for i in range(n_symbols)]
+
+
+def generate_coins(universe: List[OHLCV], calculator: RSICalculator) -> List[Dict]:
+    """Screener-style coin dicts built from the synthetic candles"""
+    coins = []
+    for i, ohlcv in enumerate(universe):
+        analysis = calculator.analyze_market_data(ohlcv)
+        coins.append({
+            'symbol': f"SYN{i}USDT",
+            'price': float(ohlcv.close[-1]),
+            'volume_24h': float(ohlcv.volume[-24:].sum() * ohlcv.close[-1]),
+            'price_change_24h': float((ohlcv.close[-1] / ohlcv.close[-min(24, len(ohlcv))] - 1) * 100),
+            'rsi': analysis['rsi'] or 50.0
+        })
+    return coins
+
+
+def measure(run: Callable[[], None], calls: int, repeat: int) -> Dict:
+    """Best-of-`repeat` wall time for `run`, plus peak traced memory of one extra run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'calls': calls,
+        'best_seconds': round(best, 6),
+        'mean_seconds': round(sum(timings) / len(timings), 6),
+        'ops_per_sec': round(calls / best, 2) if best > 0 else None,
+        'peak_memory_bytes': peak
+    }
+
+
+def run_benchmarks(symbols=DEFAULT_SYMBOLS, bars=DEFAULT_BARS, repeat: int = 3, seed: int = 42,
+                   benchmarks=None) -> Dict:
+    """Run the benchmark grid and return the JSON-serializable report"""
+    calculator = RSICalculator(period=14)
+    indicators = TechnicalIndicators()
+    selected = set(benchmarks or ('calculate_rsi', 'analyze_market_data',
+                                  'calculate_all_indicators', 'rank_coins_by_indicator',
+                                  'rank_top_percentile'))
+    results = []
+
+    for n_bars in bars:
+        for n_symbols in symbols:
+            universe = generate_universe(n_symbols, n_bars, seed)
+            cell = {'n_symbols': n_symbols, 'n_bars': n_bars}
+
+            if 'calculate_rsi' in selected:
+                closes = [ohlcv.close for ohlcv in universe]
+                stats = measure(lambda: [calculator.calculate_rsi(c) for c in closes], n_symbols, repeat)
+                results.append({'benchmark': 'calculate_rsi', **cell, **stats})
+
+            if 'analyze_market_data' in selected:
+                stats = measure(lambda: [calculator.analyze_market_data(o) for o in universe], n_symbols, repeat)
+                results.append({'benchmark': 'analyze_market_data', **cell, **stats})
+
+            logger.info(f"Finished {n_symbols} symbols x {n_bars} bars")
+
+    # The ticker-based indicators do not depend on bar count; run them once per universe size
+    for n_symbols in symbols:
+        if not selected & {'calculate_all_indicators', 'rank_coins_by_indicator', 'rank_top_percentile'}:
+            break
+
+        coins = generate_coins(generate_universe(n_symbols, min(bars), seed), calculator)
+        btc_data = dict(coins[0])
+        cell = {'n_symbols': n_symbols, 'n_bars': None}
+
+        if 'calculate_all_indicators' in selected:
+            stats = measure(lambda: [indicators.calculate_all_indicators(c, btc_data) for c in coins], n_symbols, repeat)
+            results.append({'benchmark': 'calculate_all_indicators', **cell, **stats})
+
+        if 'rank_coins_by_indicator' in selected:
+            stats = measure(lambda: indicators.rank_coins_by_indicator(coins, 'rsi', btc_data), 1, repeat)
+            results.append({'benchmark': 'rank_coins_by_indicator', **cell, **stats})
+
+        if 'rank_top_percentile' in selected:
+            stats = measure(lambda: indicators.rank_top_percentile(coins, 'rsi', btc_data), 1, repeat)
+            results.append({'benchmark': 'rank_top_percentile', **cell, **stats})
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'seed': seed,
+            'repeat': repeat,
+            'symbols': list(symbols),
+            'bars': list(bars),
+            'max_unique_series': MAX_UNIQUE_SERIES,
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RSICalculator and TechnicalIndicators throughput")
+    parser.add_argument('--symbols', type=int, nargs='+', default=list(DEFAULT_SYMBOLS))
+    parser.add_argument('--bars', type=int, nargs='+', default=list(DEFAULT_BARS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--benchmarks', nargs='+', default=None,
+                        help="Subset of calculate_rsi, analyze_market_data, calculate_all_indicators, "
+                             "rank_coins_by_indicator, rank_top_percentile")
+    parser.add_argument('--output', default=None, help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Keep per-call service logging out of the measurements' output
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    report = run_benchmarks(args.symbols, args.bars, args.repeat, args.seed, args.benchmarks)
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"Wrote {len(report['results'])} results to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,20 +9,47 @@ class Config:
     
     # RSI Configuration
     RSI_PERIOD = int(os.environ.get('RSI_PERIOD', 14))
+    RSI_SMOOTHING = os.environ.get('RSI_SMOOTHING', 'ema')  # 'ema' or 'wilder'
     TOP_COINS_LIMIT = int(os.environ.get('TOP_COINS_LIMIT', 10))
     REFRESH_INTERVAL_MINUTES = int(os.environ.get('REFRESH_INTERVAL_MINUTES', 15))
     
     # API Configuration
     BINANCE_RATE_LIMIT = True
+    # Binance REST request weight per minute and the share of it requests may use
+    BINANCE_WEIGHT_LIMIT = int(os.environ.get('BINANCE_WEIGHT_LIMIT', 6000))
+    BINANCE_WEIGHT_HEADROOM = float(os.environ.get('BINANCE_WEIGHT_HEADROOM', 0.9))
     OHLCV_LIMIT = int(os.environ.get('OHLCV_LIMIT', 100))
     SCREENING_COINS_LIMIT = int(os.environ.get('SCREENING_COINS_LIMIT', 50))
     
+    # Keep-alive connections per shared exchange client; keep at least OHLCV_FETCH_CONCURRENCY
+    EXCHANGE_POOL_SIZE = int(os.environ.get('EXCHANGE_POOL_SIZE', 20))
+    
+    # Market metadata snapshot shared by every exchange client, refreshed in the background when stale
+    MARKET_CACHE_PATH = os.environ.get('MARKET_CACHE_PATH', 'market_cache.json.gz')
+    MARKET_CACHE_TTL_MINUTES = int(os.environ.get('MARKET_CACHE_TTL_MINUTES', 60))
+    
+    # Seconds the shared USDT ticker snapshot is served before it is refreshed
+    TICKER_SNAPSHOT_MAX_AGE = int(os.environ.get('TICKER_SNAPSHOT_MAX_AGE', 30))
+    
+    # Concurrent OHLCV downloads: requests in flight and seconds allowed per symbol
+    OHLCV_FETCH_CONCURRENCY = int(os.environ.get('OHLCV_FETCH_CONCURRENCY', 10))
+    OHLCV_FETCH_TIMEOUT = float(os.environ.get('OHLCV_FETCH_TIMEOUT', 10))
+    
+    # Indicator pipeline: worker processes (1 = in-process, 0 = one per core), the
+    # smallest symbol batch worth sharding across them, and seconds a sharded batch
+    # may take before it is rerun in-process
+    INDICATOR_WORKERS = int(os.environ.get('INDICATOR_WORKERS', 1))
+    INDICATOR_PARALLEL_MIN_SYMBOLS = int(os.environ.get('INDICATOR_PARALLEL_MIN_SYMBOLS', 200))
+    INDICATOR_POOL_TIMEOUT = float(os.environ.get('INDICATOR_POOL_TIMEOUT', 30))
+    
     # Cache Configuration
     CACHE_DURATION = timedelta(minutes=REFRESH_INTERVAL_MINUTES)
     
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    # Records per second allowed from any one DEBUG/INFO call site (0 = no cap)
+    LOG_MAX_PER_SECOND = float(os.environ.get('LOG_MAX_PER_SECOND', 20))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -34,10 +61,8 @@ class ProductionConfig(Config):
     DEBUG = False
     LOG_LEVEL = 'WARNING'
     
-    # Production overrides
+    # Production overrides; get_config() refuses to return this without a key
     SECRET_KEY = os.environ.get('SECRET_KEY')
-    if not SECRET_KEY:
-        raise ValueError("SECRET_KEY environment variable must be set in production")
 
 class TestingConfig(Config):
     """Testing configuration"""
@@ -55,4 +80,7 @@ config = {
 def get_config():
     """Get configuration based on environment"""
     config_name = os.environ.get('FLASK_ENV', 'default')
-    return config.get(config_name, config['default'])
+    selected = config.get(config_name, config['default'])
+    if selected is ProductionConfig and not selected.SECRET_KEY:
+        raise ValueError("SECRET_KEY environment variable must be set in production")
+    return selected
@@ -0,0 +1,38 @@
+import numpy as np
+
+from app.services.indicator_engine import IndicatorEngine
+from app.services.ohlcv import OHLCV
+
+
+def random_ohlcv(n_bars: int, seed: int) -> OHLCV:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    opens = np.r_[100.0, closes[:-1]]
+    highs = np.maximum(opens, closes) * (1 + np.abs(rng.normal(0, 0.005, n_bars)))
+    lows = np.minimum(opens, closes) * (1 - np.abs(rng.normal(0, 0.005, n_bars)))
+    return OHLCV(np.arange(n_bars, dtype=np.int64) * 3600 * 1000, opens, highs, lows, closes, np.ones(n_bars))
+
+
+def reference_atr(ohlcv: OHLCV, period: int):
+    """Wilder's ATR: mean of the first `period` true ranges, then (atr * (period - 1) + tr) / period"""
+    high, low, close = list(ohlcv.high), list(ohlcv.low), list(ohlcv.close)
+    true_ranges = [high[0] - low[0]] + [max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+                                        for i in range(1, len(close))]
+    if len(true_ranges) < period:
+        return None
+    atr = sum(true_ranges[:period]) / period
+    for true_range in true_ranges[period:]:
+        atr = (atr * (period - 1) + true_range) / period
+    return atr
+
+
+def test_atr_uses_wilder_seeding():
+    batch = [random_ohlcv(200, 1), random_ohlcv(60, 2), random_ohlcv(14, 3), random_ohlcv(10, 4), None]
+    atr = IndicatorEngine().compute(batch, ['atr'], atr_period=14)['atr']
+
+    for ohlcv, value in zip(batch, atr):
+        expected = reference_atr(ohlcv, 14) if ohlcv is not None else None
+        if expected is None:
+            assert np.isnan(value)
+        else:
+            assert np.isclose(value, expected, rtol=1e-10)
@@ -0,0 +1,55 @@
+import numpy as np
+
+from app.services.indicator_matrix import IndicatorMatrix
+from app.services.technical_indicators import DESCENDING_INDICATORS, TechnicalIndicators
+
+
+def make_coins(n: int = 300, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    coins = []
+    for i in range(n):
+        coin = {'symbol': f'C{i}USDT', 'price': float(rng.uniform(0.1, 100)), 'volume_24h': 1e6,
+                'price_change_24h': float(rng.normal(0, 5)), 'rsi': float(rng.uniform(0, 100))}
+        if i % 5:
+            coin.update({'vwap': coin['price'] * float(rng.uniform(0.9, 1.1)), 'mansfield_rs': float(rng.normal()),
+                         'roc_24h': float(rng.normal(0, 5)), 'roc_7d': float(rng.normal(0, 10)),
+                         'atr': float(rng.uniform(0, 2))})
+        # Edge cases: no ticker change, None change, zero price, zero VWAP
+        if i % 11 == 0:
+            del coin['price_change_24h']
+        if i % 13 == 0:
+            coin['price_change_24h'] = None
+        if i % 17 == 0:
+            coin['price'] = 0
+        if i % 19 == 0 and 'vwap' in coin:
+            coin['vwap'] = 0.0
+        coins.append(coin)
+    return coins
+
+
+def test_matrix_matches_per_coin_indicators():
+    indicators = TechnicalIndicators()
+    coins = make_coins()
+    btc_data = {'price_change_24h': 1.5}
+    columns = list(indicators.indicators)
+
+    rows = [dict(indicators.calculate_all_indicators(coin, btc_data, selected=columns), symbol=coin['symbol'])
+            for coin in coins]
+    expected = IndicatorMatrix.from_rows(rows, columns, descending=DESCENDING_INDICATORS)
+    matrix = indicators.build_indicator_matrix(coins, btc_data, selected=columns)
+
+    assert matrix.symbols == expected.symbols
+    np.testing.assert_allclose(matrix.values, expected.values, equal_nan=True)
+    np.testing.assert_allclose(matrix.ranks, expected.ranks, equal_nan=True)
+
+
+def test_kline_arrays_replace_coin_keys():
+    indicators = TechnicalIndicators()
+    coins = make_coins(50)
+    kline_keys = ('vwap', 'mansfield_rs', 'roc_24h', 'roc_7d', 'atr')
+    kline_values = {key: TechnicalIndicators._coin_column(coins, key) for key in kline_keys}
+    ticker_only = [{k: v for k, v in coin.items() if k not in kline_keys} for coin in coins]
+
+    expected = indicators.build_indicator_matrix(coins, {'price_change_24h': 0.5})
+    matrix = indicators.build_indicator_matrix(ticker_only, {'price_change_24h': 0.5}, kline_values=kline_values)
+    np.testing.assert_allclose(matrix.values, expected.values, equal_nan=True)
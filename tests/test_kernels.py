@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.kernels import (ema, left_align, prefix_sum, recursive_filter, right_align, rolling_max,
+                                  rolling_mean, rolling_min, rolling_std, rolling_sum, wilder)
+from app.services.rsi_calculator import RSICalculator
+
+PERIOD = 14
+
+
+def padded_rows(seed: int = 11):
+    """Right-aligned rows of different lengths, NaN-padded at the start, plus an all-NaN row"""
+    rng = np.random.default_rng(seed)
+    lengths = (300, 120, 40, 15, 14, 3, 1, 0)
+    out = np.full((len(lengths), 300), np.nan)
+    for i, length in enumerate(lengths):
+        if length:
+            out[i, -length:] = 100 + np.cumsum(rng.normal(0, 1, length))
+    return out
+
+
+def unpadded(row):
+    return [float(v) for v in row if not math.isnan(v)]
+
+
+def py_filter(values, alpha, initial=None):
+    previous = values[0] if initial is None else initial
+    out = []
+    for value in values:
+        previous = (1 - alpha) * previous + alpha * value
+        out.append(previous)
+    return out
+
+
+def py_wilder(values, period):
+    if len(values) < period:
+        return [math.nan] * len(values)
+    average = sum(values[:period]) / period
+    out = [math.nan] * (period - 1) + [average]
+    for value in values[period:]:
+        average = (average * (period - 1) + value) / period
+        out.append(average)
+    return out
+
+
+def py_rsi(closes, period, smoothing):
+    """Last RSI of a close list, None with fewer than period + 1 closes"""
+    if len(closes) < period + 1:
+        return None
+    deltas = [b - a for a, b in zip(closes, closes[1:])]
+    gains = [max(d, 0.0) for d in deltas]
+    losses = [max(-d, 0.0) for d in deltas]
+    if len(deltas) == period:
+        avg_gain, avg_loss = sum(gains) / period, sum(losses) / period
+    elif smoothing == 'wilder':
+        avg_gain, avg_loss = py_wilder(gains, period)[-1], py_wilder(losses, period)[-1]
+    else:
+        alpha = 2.0 / (period + 1)
+        avg_gain, avg_loss = py_filter(gains, alpha)[-1], py_filter(losses, alpha)[-1]
+    if avg_loss == 0:
+        return 50.0 if avg_gain == 0 else 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def assert_rows(actual, expected_rows):
+    for row, expected in zip(actual, expected_rows):
+        np.testing.assert_allclose(row, np.asarray(expected, dtype=np.float64), rtol=1e-9, equal_nan=True)
+
+
+def test_recursive_filter_matches_python_loop():
+    data = np.random.default_rng(1).normal(0, 1, (3, 2000))
+    assert_rows(recursive_filter(data, 0.1), [py_filter(list(row), 0.1) for row in data])
+    assert_rows(recursive_filter(data, 1 / 14, initial=[1.0, 2.0, 3.0]),
+                [py_filter(list(row), 1 / 14, initial) for row, initial in zip(data, (1.0, 2.0, 3.0))])
+    # Slow decay: many rescaling blocks
+    assert_rows(recursive_filter(data[:1], 0.001), [py_filter(list(data[0]), 0.001)])
+
+
+def test_left_align_round_trip():
+    data = padded_rows()
+    aligned, lead = left_align(data)
+    assert list(lead) == [0, 180, 260, 285, 286, 297, 299, 300]
+    for row, n in zip(aligned, 300 - lead):
+        if n:
+            assert not np.isnan(row).any()
+    np.testing.assert_array_equal(right_align(aligned, lead), data)
+
+
+def test_left_align_only_strips_leading_nan():
+    data = np.array([[np.nan, 1.0, np.nan, 3.0, 4.0]])
+    aligned, lead = left_align(data)
+    assert list(lead) == [1]
+    np.testing.assert_array_equal(aligned[0, :4], [1.0, np.nan, 3.0, 4.0])
+    np.testing.assert_array_equal(right_align(aligned, lead), data)
+
+
+def test_ema_and_wilder_on_padded_rows():
+    data = padded_rows()
+    n_pad = [int(np.isnan(row).sum()) for row in data]
+
+    expected_ema = [[math.nan] * pad + (py_filter(unpadded(row), 0.2) if pad < 300 else [])
+                    for row, pad in zip(data, n_pad)]
+    assert_rows(ema(data, 0.2), expected_ema)
+
+    expected_wilder = [[math.nan] * pad + py_wilder(unpadded(row), PERIOD) for row, pad in zip(data, n_pad)]
+    assert_rows(wilder(data, PERIOD), expected_wilder)
+
+
+@pytest.mark.parametrize('window', [1, 5, 24])
+def test_rolling_kernels_match_pandas(window):
+    data = padded_rows()
+    frame = pd.DataFrame(data.T)
+
+    assert_rows(rolling_mean(data, window), frame.rolling(window).mean().T.values)
+    assert_rows(rolling_max(data, window), frame.rolling(window).max().T.values)
+    assert_rows(rolling_min(data, window), frame.rolling(window).min().T.values)
+    assert_rows(rolling_std(data, window), frame.rolling(window).std(ddof=0).T.values)
+    if window > 1:
+        assert_rows(rolling_std(data, window, ddof=1), frame.rolling(window).std(ddof=1).T.values)
+    # Partial windows sum what is available and NaN counts as 0
+    assert_rows(rolling_sum(data, window), frame.fillna(0).rolling(window, min_periods=1).sum().T.values)
+    assert_rows(prefix_sum(data)[:, 1:], frame.fillna(0).cumsum().T.values)
+
+
+@pytest.mark.parametrize('smoothing', ['ema', 'wilder'])
+def test_rsi_matches_python_reference(smoothing):
+    calculator = RSICalculator(period=PERIOD, smoothing=smoothing)
+    data = padded_rows()
+
+    batch = calculator.calculate_rsi_series_batch(data)
+    for row, rsi_row in zip(data, batch):
+        closes = unpadded(row)
+        pad = 300 - len(closes)
+        expected = [math.nan] * pad + [py_rsi(closes[:i + 1], PERIOD, smoothing) or math.nan
+                                       for i in range(len(closes))]
+        np.testing.assert_allclose(rsi_row, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+    multi = calculator.calculate_rsi_multi_period(data, periods=(2, PERIOD, 50))
+    for row, values in zip(data, multi):
+        for period, value in zip((2, PERIOD, 50), values):
+            expected = py_rsi(unpadded(row), period, smoothing)
+            if expected is None:
+                assert np.isnan(value)
+            else:
+                assert value == pytest.approx(round(expected, 2), abs=0.011)
+
+    closes = unpadded(data[0])
+    assert calculator.calculate_rsi(closes) == pytest.approx(round(py_rsi(closes, PERIOD, smoothing), 2), abs=0.011)
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from app.services.ohlcv import OHLCV
+from app.services.ohlcv_sync import OHLCVSync
+
+H = 3600 * 1000
+
+
+def candles(end: int, count: int, listed: int = 0):
+    """`count` hourly ccxt rows ending at open time `end`, none before `listed`"""
+    return [[t, 1.0 + t / H % 7, 2.0, 0.5, 1.5, 10.0] for t in range(end - (count - 1) * H, end + H, H) if t >= listed]
+
+
+class FakeFetcher:
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+    def fetch(self, symbols, timeframe='1h', limit=100, on_result=None, since=None):
+        since = since or {}
+        return {symbol: OHLCV.from_ccxt(self.exchange.fetch_ohlcv(symbol, timeframe, since=since.get(symbol), limit=limit))
+                for symbol in symbols}
+
+
+class FakeExchange:
+    def __init__(self, listed: int = 0):
+        self.listed = listed
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        self.calls.append((symbol, since, limit))
+        now = int(time.time() * 1000) // H * H
+        if since is not None:
+            return candles(now, (now - since) // H + 1, self.listed)[:limit]
+        return candles(now, limit, self.listed)
+
+
+class FakeService:
+    def __init__(self, listed: int = 0):
+        self.exchange = FakeExchange(listed)
+        self.ohlcv_fetcher = FakeFetcher(self.exchange)
+
+    def get_ohlcv_history(self, symbol, timeframe='1h', limit=1000, since=None):
+        return OHLCV.from_ccxt(self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'ohlcv.db')
+
+
+def test_larger_limit_backfills_a_short_window(db_path):
+    sync, service = OHLCVSync(db_path), FakeService()
+
+    assert len(sync.sync_many(service, ['BTC/USDT'], '1h', limit=100)['BTC/USDT']) == 100
+    assert len(sync.sync_many(service, ['BTC/USDT'], '1h', limit=721)['BTC/USDT']) == 721
+    assert service.exchange.calls[-1] == ('BTC/USDT', None, 721)
+
+
+def test_full_window_then_syncs_incrementally(db_path):
+    sync, service = OHLCVSync(db_path), FakeService()
+    sync.sync_many(service, ['BTC/USDT'], '1h', limit=721)
+
+    ohlcv = sync.sync_many(service, ['BTC/USDT'], '1h', limit=721)['BTC/USDT']
+    assert len(ohlcv) == 721
+    assert service.exchange.calls[-1][1] == int(ohlcv.timestamp[-1])
+
+    # A smaller window of a fully stored series is incremental too
+    sync.sync_many(service, ['BTC/USDT'], '1h', limit=100)
+    assert service.exchange.calls[-1][1] is not None
+
+
+def test_short_window_in_storage_is_backfilled_after_restart(db_path):
+    OHLCVSync(db_path).sync_many(FakeService(), ['ETH/USDT'], '1h', limit=100)
+
+    sync, service = OHLCVSync(db_path), FakeService()
+    assert len(sync.sync(service, 'ETH/USDT', '1h', limit=721)) == 721
+    assert service.exchange.calls == [('ETH/USDT', None, 721)]
+
+
+def test_new_listing_is_not_refetched_in_full(db_path):
+    now = int(time.time() * 1000) // H * H
+    sync, service = OHLCVSync(db_path), FakeService(listed=now - 49 * H)
+
+    assert len(sync.sync_many(service, ['NEW/USDT'], '1h', limit=721)['NEW/USDT']) == 50
+    sync.sync_many(service, ['NEW/USDT'], '1h', limit=721)
+    assert service.exchange.calls[-1][1] == now
+
+
+def test_failed_download_serves_stored_window(db_path):
+    sync, service = OHLCVSync(db_path), FakeService()
+    sync.sync_many(service, ['BTC/USDT'], '1h', limit=100)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('offline')
+    service.exchange.fetch_ohlcv = fail
+
+    assert len(sync.sync(service, 'BTC/USDT', '1h', limit=100)) == 100
+
+
+def test_async_download_pages_past_the_request_maximum():
+    import asyncio
+    from app.services.async_ohlcv_fetcher import MAX_OHLCV_PER_REQUEST, AsyncOHLCVFetcher
+
+    class AsyncExchange(FakeExchange):
+        parse_timeframe = staticmethod(lambda timeframe: H // 1000)
+        milliseconds = staticmethod(lambda: int(time.time() * 1000))
+
+        async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+            self.calls.append((symbol, since, limit))
+            now = int(time.time() * 1000) // H * H
+            start = since if since is not None else now - (limit - 1) * H
+            return [row for row in candles(now, (now - start) // H + 1)][:min(limit, MAX_OHLCV_PER_REQUEST)]
+
+    exchange = AsyncExchange()
+    rows = asyncio.run(AsyncOHLCVFetcher._download(exchange, 'BTC/USDT', '1h', 2500, None))
+    assert len(rows) == 2500
+    assert all(b[0] - a[0] == H for a, b in zip(rows, rows[1:]))
+    assert len(exchange.calls) == 3
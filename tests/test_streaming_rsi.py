@@ -0,0 +1,41 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.services.ohlcv import OHLCV
+from app.services.streaming_rsi import StreamingRSIService
+
+H = 3600 * 1000
+
+
+def hourly(count: int) -> OHLCV:
+    """`count` hourly candles ending with the in-progress one"""
+    now = int(time.time() * 1000) // H * H
+    timestamps = np.arange(now - (count - 1) * H, now + H, H, dtype=np.int64)
+    closes = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, count))
+    return OHLCV(timestamps, closes, closes + 1, closes - 1, closes, np.ones(count))
+
+
+@pytest.mark.parametrize('smoothing', ['ema', 'wilder'])
+def test_advance_matches_a_full_seed(smoothing):
+    ohlcv = hourly(200)
+    advanced, seeded = StreamingRSIService(smoothing=smoothing), StreamingRSIService(smoothing=smoothing)
+
+    advanced.seed_from_ohlcv('BTC/USDT', '1h', ohlcv[:150])
+    rsi = advanced.advance_from_ohlcv('BTCUSDT', '1h', ohlcv[100:])
+
+    assert rsi == seeded.seed_from_ohlcv('BTCUSDT', '1h', ohlcv)
+    assert advanced.last_open_time('BTCUSDT', '1h') == int(ohlcv.timestamp[-2])
+    assert advanced.get_rsi('BTCUSDT', '1h', provisional_close=120.0) == \
+        seeded.get_rsi('BTCUSDT', '1h', provisional_close=120.0)
+
+
+def test_advance_reseeds_across_a_gap():
+    ohlcv = hourly(200)
+    service = StreamingRSIService()
+    service.seed_from_ohlcv('BTCUSDT', '1h', ohlcv[:50])
+
+    # The window no longer contains the last committed candle
+    assert service.advance_from_ohlcv('BTCUSDT', '1h', ohlcv[100:]) == \
+        StreamingRSIService().seed_from_ohlcv('BTCUSDT', '1h', ohlcv[100:])